@@ -0,0 +1,232 @@
+"""Packed yearly archive of cold rank history.
+
+History older than ``settings.RANK_HISTORY_HOT_DAYS`` is moved out of the
+partitioned ``rank_history`` table into one :class:`RankHistoryArchive` row
+per boardgame and year, holding the values as packed little-endian arrays.
+This replaces roughly 80 bytes of tuple overhead per day with 14 bytes of
+payload. :func:`api.history.daily_history` merges both tiers on read.
+"""
+
+import datetime
+import logging
+import math
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min, Sum
+from django.db.models.functions import Length
+
+from . import models, partitions
+
+logger = logging.getLogger(__name__)
+
+# Boardgames archived together, bounding the rows held in memory
+CHUNK_SIZE = 1000
+
+_DAYS = np.dtype("<u2")
+_RANKS = np.dtype("<i4")
+_RATINGS = np.dtype("<f4")
+
+
+def pack(entries: list[dict]) -> dict[str, bytes]:
+    """Encode the entries of one year as the archive's binary columns.
+
+    Args:
+        entries (list[dict]): Entries with keys ``date``, ``bgg_rank``,
+            ``bgg_geek_rating`` and ``bgg_average_rating``, ordered by date.
+
+    """
+    nan = float("nan")
+    return {
+        "days": np.array(
+            [entry["date"].timetuple().tm_yday - 1 for entry in entries], _DAYS
+        ).tobytes(),
+        "ranks": np.array(
+            [entry["bgg_rank"] or 0 for entry in entries], _RANKS
+        ).tobytes(),
+        "geek_ratings": np.array(
+            [
+                nan if entry["bgg_geek_rating"] is None else entry["bgg_geek_rating"]
+                for entry in entries
+            ],
+            _RATINGS,
+        ).tobytes(),
+        "average_ratings": np.array(
+            [
+                nan
+                if entry["bgg_average_rating"] is None
+                else entry["bgg_average_rating"]
+                for entry in entries
+            ],
+            _RATINGS,
+        ).tobytes(),
+    }
+
+
+def unpack(archive: models.RankHistoryArchive) -> list[dict]:
+    """Decode an archive row into rank history entries ordered by date."""
+    first_day = datetime.date(archive.year, 1, 1)
+    days = np.frombuffer(bytes(archive.days), _DAYS).tolist()
+    ranks = np.frombuffer(bytes(archive.ranks), _RANKS).tolist()
+    geek_ratings = np.frombuffer(bytes(archive.geek_ratings), _RATINGS).tolist()
+    average_ratings = np.frombuffer(bytes(archive.average_ratings), _RATINGS).tolist()
+    return [
+        {
+            "id": None,
+            "date": first_day + datetime.timedelta(days=day),
+            "bgg_rank": rank or None,
+            "bgg_geek_rating": None if math.isnan(geek) else geek,
+            "bgg_average_rating": None if math.isnan(average) else average,
+        }
+        for day, rank, geek, average in zip(
+            days, ranks, geek_ratings, average_ratings, strict=True
+        )
+    ]
+
+
+def archived_history(
+    boardgame: models.Boardgame,
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+) -> list[dict]:
+    """Return the archived entries of ``boardgame`` between two dates."""
+    return archived_histories([boardgame.pk], start_date, end_date).get(
+        boardgame.pk, []
+    )
+
+
+def archived_histories(
+    boardgame_ids: list[int],
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+) -> dict[int, list[dict]]:
+    """Return the archived entries of several boardgames in one query.
+
+    Returns:
+        dict[int, list[dict]]: Entries by boardgame id, ordered by date.
+            Games without archived entries are left out.
+
+    """
+    archives = models.RankHistoryArchive.objects.filter(boardgame_id__in=boardgame_ids)
+    if start_date is not None:
+        archives = archives.filter(year__gte=start_date.year)
+    if end_date is not None:
+        archives = archives.filter(year__lte=end_date.year)
+    histories: dict[int, list[dict]] = {}
+    for archive in archives.order_by("boardgame_id", "year"):
+        histories.setdefault(archive.boardgame_id, []).extend(
+            entry
+            for entry in unpack(archive)
+            if (start_date is None or entry["date"] >= start_date)
+            and (end_date is None or entry["date"] <= end_date)
+        )
+    return histories
+
+
+def archived_lengths() -> dict[int, int]:
+    """Return the number of archived days of every boardgame by id."""
+    sizes = (
+        models.RankHistoryArchive.objects.values("boardgame_id")
+        .annotate(size=Sum(Length("days")))
+        .values_list("boardgame_id", "size")
+    )
+    return {pk: size // _DAYS.itemsize for pk, size in sizes}
+
+
+def hot_history_start() -> datetime.date | None:
+    """Return the first day still in ``rank_history``.
+
+    Earlier days are only in the archive, which has to be read per game.
+    None when nothing was archived yet.
+    """
+    if not models.RankHistoryArchive.objects.exists():
+        return None
+    return models.RankHistory.objects.aggregate(first=Min("date"))["first"]
+
+
+def _archive_year(year: int, end: datetime.date, boardgame_ids: list[int]) -> None:
+    start = datetime.date(year, 1, 1)
+    rows = models.RankHistory.objects.filter(
+        boardgame_id__in=boardgame_ids, date__gte=start, date__lt=end
+    ).order_by("boardgame_id", "date")
+    fields = (
+        "boardgame_id",
+        "date",
+        "bgg_rank",
+        "bgg_geek_rating",
+        "bgg_average_rating",
+    )
+
+    entries: dict[int, list[dict]] = {}
+    for row in rows.values(*fields):
+        entries.setdefault(row["boardgame_id"], []).append(row)
+    if not entries:
+        return
+
+    existing = {
+        archive.boardgame_id: archive
+        for archive in models.RankHistoryArchive.objects.filter(
+            boardgame_id__in=entries.keys(), year=year
+        )
+    }
+    archives = []
+    for boardgame_id, game_entries in entries.items():
+        if boardgame_id in existing:
+            # Earlier months of the year were archived by a previous run.
+            game_entries = unpack(existing[boardgame_id]) + game_entries
+        archives.append(
+            models.RankHistoryArchive(
+                boardgame_id=boardgame_id, year=year, **pack(game_entries)
+            )
+        )
+    models.RankHistoryArchive.objects.bulk_create(
+        archives,
+        update_conflicts=True,
+        unique_fields=["boardgame", "year"],
+        update_fields=[
+            "days",
+            "ranks",
+            "geek_ratings",
+            "average_ratings",
+            "updated_at",
+        ],
+    )
+
+
+def archive_history(before: datetime.date | None = None) -> list[str]:
+    """Move the rank history of whole months before ``before`` to the archive.
+
+    The archived months' partitions are dropped afterwards, so no rows are
+    deleted one by one.
+
+    Args:
+        before (date | None): Archive the months before the month of this
+            day. Defaults to ``settings.RANK_HISTORY_HOT_DAYS`` ago.
+
+    Returns:
+        list[str]: Names of the dropped partitions.
+
+    """
+    if before is None:
+        before = datetime.date.today() - datetime.timedelta(
+            days=settings.RANK_HISTORY_HOT_DAYS
+        )
+    cutoff = before.replace(day=1)
+    months = [month for month in partitions.list_partitions() if month < cutoff]
+    if not months:
+        return []
+
+    boardgame_ids = list(
+        models.Boardgame.objects.order_by("pk").values_list("pk", flat=True)
+    )
+    with transaction.atomic():
+        for year in range(months[0].year, cutoff.year + 1):
+            end = min(datetime.date(year + 1, 1, 1), cutoff)
+            logger.info("Archiving rank history of %s before %s.", year, end)
+            for start in range(0, len(boardgame_ids), CHUNK_SIZE):
+                _archive_year(year, end, boardgame_ids[start : start + CHUNK_SIZE])
+        dropped = partitions.detach_partitions(cutoff, drop=True)
+
+    logger.info("Archived rank history partitions %s.", dropped)
+    return dropped
@@ -0,0 +1,243 @@
+"""In-process autocomplete index over boardgame and taxonomy names.
+
+The index is built from a compact snapshot on disk, so a worker can answer
+search-as-you-type requests without touching the database. The ingest
+pipeline rewrites the snapshot (see :func:`write_snapshot`) and every worker
+swaps in a freshly built index once it notices the new file.
+"""
+
+import array
+import bisect
+import gzip
+import heapq
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Min
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+ENTITY_TYPES = ("boardgame", "category", "designer", "family", "mechanic")
+TAXONOMY_MODELS = (
+    ("category", models.Category),
+    ("designer", models.Designer),
+    ("family", models.Family),
+    ("mechanic", models.Mechanic),
+)
+
+# Entries without a rank sort behind every ranked entry.
+UNRANKED_WEIGHT = 2**31 - 1
+# Prefixes up to this length get a precomputed list of their best entries, as
+# their token ranges are too large to rank on every keystroke.
+SHORT_PREFIX_LENGTH = 3
+MAX_RESULTS = 50
+# Seconds between checks whether the snapshot on disk has been replaced.
+RELOAD_INTERVAL = 30
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize(text: str) -> list[str]:
+    """Split ``text`` into lower-case tokens without diacritics."""
+    if text.isascii():
+        return _TOKEN_RE.findall(text.lower())
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _TOKEN_RE.findall(stripped)
+
+
+class AutocompleteIndex:
+    """Prefix index over the words of every entity name.
+
+    Entries are stored column-wise in arrays; the word index is a sorted list
+    of interned tokens with a parallel array of entry positions, so a prefix
+    lookup is a binary search followed by a slice.
+    """
+
+    def __init__(
+        self,
+        types: list[int],
+        bgg_ids: list[int],
+        names: list[str],
+        weights: list[int],
+    ) -> None:
+        self.types = array.array("B", types)
+        self.bgg_ids = array.array("i", bgg_ids)
+        self.names = [sys.intern(name) for name in names]
+        self.weights = array.array("i", weights)
+
+        entry_tokens = [
+            {sys.intern(token) for token in normalize(name)} for name in self.names
+        ]
+        postings = sorted(
+            (token, entry)
+            for entry, tokens in enumerate(entry_tokens)
+            for token in tokens
+        )
+        self.tokens = [token for token, _ in postings]
+        self.token_entries = array.array("i", (entry for _, entry in postings))
+
+        # Visiting entries best first fills each prefix list in rank order.
+        best: dict[str, list[int]] = {}
+        for entry in sorted(range(len(self.names)), key=self.weights.__getitem__):
+            prefixes = {
+                token[:length]
+                for token in entry_tokens[entry]
+                for length in range(1, min(len(token), SHORT_PREFIX_LENGTH) + 1)
+            }
+            for prefix in prefixes:
+                top = best.setdefault(prefix, [])
+                if len(top) < MAX_RESULTS:
+                    top.append(entry)
+        self.short_prefixes = {
+            sys.intern(prefix): array.array("i", top) for prefix, top in best.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.bgg_ids)
+
+    def _entries(self, prefix: str) -> set[int]:
+        """Every entry with a word starting with ``prefix``."""
+        start = bisect.bisect_left(self.tokens, prefix)
+        end = bisect.bisect_left(self.tokens, prefix + "\U0010ffff", lo=start)
+        return set(self.token_entries[start:end])
+
+    def _candidates(self, terms: list[str], limit: int) -> list[int]:
+        """The best ranked ``limit`` entries matching every term."""
+        if len(terms) == 1 and len(terms[0]) <= SHORT_PREFIX_LENGTH:
+            return list(self.short_prefixes.get(terms[0], ()))[:limit]
+        # The precomputed lists of short prefixes are cut off, so several
+        # terms intersect their full postings, smallest first.
+        postings = sorted((self._entries(term) for term in set(terms)), key=len)
+        entries = postings[0].intersection(*postings[1:])
+        return heapq.nsmallest(limit, entries, key=lambda e: (self.weights[e], e))
+
+    def search(self, query: str, limit: int = 10) -> list[dict]:
+        """Return the best ranked entries whose words start with the query words."""
+        terms = normalize(query)
+        if not terms:
+            return []
+
+        results = []
+        for entry in self._candidates(terms, limit):
+            weight = self.weights[entry]
+            results.append(
+                {
+                    "type": ENTITY_TYPES[self.types[entry]],
+                    "bgg_id": self.bgg_ids[entry],
+                    "name": self.names[entry],
+                    "bgg_rank": None if weight == UNRANKED_WEIGHT else weight,
+                }
+            )
+        return results
+
+
+def build_snapshot() -> dict[str, list]:
+    """Read the names and ranks of all entities from the database.
+
+    Taxonomy entries are weighted by the best rank among their boardgames.
+    """
+    snapshot: dict[str, list] = {"types": [], "bgg_ids": [], "names": [], "weights": []}
+
+    def add(type_: str, rows) -> None:
+        for bgg_id, name, rank in rows:
+            snapshot["types"].append(ENTITY_TYPES.index(type_))
+            snapshot["bgg_ids"].append(bgg_id)
+            snapshot["names"].append(name)
+            snapshot["weights"].append(UNRANKED_WEIGHT if rank is None else rank)
+
+    add(
+        "boardgame",
+        models.Boardgame.objects.values_list("bgg_id", "name", "bgg_rank").iterator(),
+    )
+    for type_, model in TAXONOMY_MODELS:
+        rows = (
+            model.objects.annotate(best_rank=Min("boardgames__bgg_rank"))
+            .values_list("bgg_id", "name", "best_rank")
+            .iterator()
+        )
+        add(type_, rows)
+
+    return snapshot
+
+
+def write_snapshot(path: Path | None = None) -> Path:
+    """Write a fresh snapshot, replacing the previous one atomically."""
+    path = Path(path or settings.AUTOCOMPLETE_SNAPSHOT)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    snapshot = build_snapshot()
+
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    tmp_path.replace(path)
+
+    logger.info("Wrote autocomplete snapshot with %s entries.", len(snapshot["names"]))
+    return path
+
+
+def load_snapshot(path: Path) -> AutocompleteIndex:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        snapshot = json.load(f)
+    return AutocompleteIndex(**snapshot)
+
+
+_index: AutocompleteIndex | None = None
+_index_mtime: float = 0.0
+_next_check: float = 0.0
+_lock = threading.Lock()
+
+
+def get_index() -> AutocompleteIndex:
+    """Return the current index, reloading it when the snapshot changed.
+
+    Until a snapshot has been written by :func:`warm_up` or the ingest, the
+    index is empty; requests never read the database.
+    """
+    global _index, _index_mtime, _next_check
+
+    now = time.monotonic()
+    if _index is not None and now < _next_check:
+        return _index
+
+    with _lock:
+        if _index is not None and now < _next_check:
+            return _index
+
+        _next_check = now + RELOAD_INTERVAL
+        path = Path(settings.AUTOCOMPLETE_SNAPSHOT)
+        if not path.exists():
+            if _index is None:
+                logger.warning("No autocomplete snapshot at %s yet.", path)
+                _index = AutocompleteIndex([], [], [], [])
+            return _index
+        mtime = path.stat().st_mtime
+        if mtime != _index_mtime:
+            index = load_snapshot(path)
+            logger.info("Loaded autocomplete index with %s entries.", len(index))
+            # Rebinding the global is atomic, requests in flight keep the old one.
+            _index, _index_mtime = index, mtime
+        return _index
+
+
+def warm_up() -> None:
+    """Build the index at worker startup, writing a snapshot if there is none."""
+    path = Path(settings.AUTOCOMPLETE_SNAPSHOT)
+    if not path.exists():
+        try:
+            write_snapshot(path)
+        except DatabaseError:
+            logger.exception("Could not write the autocomplete snapshot.")
+            return
+    get_index()
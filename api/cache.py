@@ -0,0 +1,187 @@
+"""Response cache keyed on the ingest data version.
+
+All read endpoints only change when the ingest pipeline runs, so rendered
+responses are cached per data version and revalidated with strong ETags.
+:func:`bump_data_version` is the invalidation hook called at the end of an
+ingest; it makes every previously cached entry unreachable at once.
+Compressed variants of a body are stored in its entry the first time an
+encoding is requested, see :mod:`api.compression`.
+
+Only data renderings are shared. Browsable API pages embed the visitor's
+CSRF token and login state, so they are rendered for every request.
+"""
+
+import hashlib
+import threading
+import time
+from typing import ClassVar
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.renderers import BrowsableAPIRenderer
+
+from . import compression, models
+
+RESPONSE_CACHE = "responses"
+# Seconds a worker trusts its copy of the data version before reading it again.
+DATA_VERSION_TTL = 5
+# Headers that are rebuilt for every cached response.
+_SKIPPED_HEADERS = {"content-length", "etag", "last-modified", "cache-control"}
+
+_version: tuple[int, float] | None = None
+_version_expires: float = 0.0
+_version_lock = threading.Lock()
+
+
+def get_data_version() -> tuple[int, float]:
+    """Return the current data version and the time it was set."""
+    global _version, _version_expires
+
+    now = time.monotonic()
+    if _version is not None and now < _version_expires:
+        return _version
+
+    with _version_lock:
+        row = models.DataVersion.objects.filter(pk=1).first()
+        if row is None:
+            _version = (0, 0.0)
+        else:
+            _version = (row.version, row.updated_at.timestamp())
+        _version_expires = now + DATA_VERSION_TTL
+        return _version
+
+
+def bump_data_version() -> int:
+    """Invalidate all cached responses by starting a new data version."""
+    global _version_expires
+
+    with transaction.atomic():
+        row, _ = models.DataVersion.objects.select_for_update().get_or_create(pk=1)
+        row.version = F("version") + 1
+        row.save()
+        row.refresh_from_db()
+
+    _version_expires = 0.0
+    return row.version
+
+
+def _cache_key(request, version: int) -> str:
+    query = sorted(request.GET.lists())
+    parts = [
+        str(version),
+        request.method,
+        request.path,
+        repr(query),
+        request.headers.get("Accept", ""),
+    ]
+    digest = hashlib.blake2b("\n".join(parts).encode(), digest_size=16).hexdigest()
+    return f"response:{version}:{digest}"
+
+
+def _is_cacheable(response) -> bool:
+    if response.status_code != 200 or response.streaming:
+        return False
+    if "no-store" in response.get("Cache-Control", ""):
+        return False
+    if isinstance(getattr(response, "accepted_renderer", None), BrowsableAPIRenderer):
+        return False
+    return not response.get("Content-Type", "").startswith("text/html")
+
+
+def _is_authenticated(request) -> bool:
+    user = getattr(request, "user", None)
+    return "Authorization" in request.headers or bool(
+        user is not None and user.is_authenticated
+    )
+
+
+def _build_response(
+    request, entry: dict, last_modified: float, encoding: str | None
+) -> HttpResponse:
+    etag = entry["etag"]
+    if encoding is not None:
+        # Each encoding is a representation with its own strong ETag.
+        etag = f'{etag[:-1]}-{encoding}"'
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified)
+    )
+    if not_modified is not None:
+        response = not_modified
+    else:
+        content = entry["content"] if encoding is None else entry["encoded"][encoding]
+        response = HttpResponse(content, status=entry["status"])
+        for header, value in entry["headers"].items():
+            response[header] = value
+        if encoding is not None:
+            response["Content-Encoding"] = encoding
+    if compression.is_compressible(entry["headers"].get("Content-Type", "")):
+        patch_vary_headers(response, ("Accept-Encoding",))
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    # Shared caches must not store responses to authenticated requests.
+    if _is_authenticated(request):
+        response["Cache-Control"] = "private, no-cache"
+    else:
+        response["Cache-Control"] = "public, no-cache"
+    return response
+
+
+def cached_response(request, render) -> HttpResponse:
+    """Serve ``request`` from the cache, calling ``render`` on a miss.
+
+    Only successful data renderings are stored; everything else, including
+    HTML and responses marked ``no-store``, is passed through.
+    """
+    version, last_modified = get_data_version()
+    cache = caches[RESPONSE_CACHE]
+    key = _cache_key(request, version)
+
+    entry = cache.get(key)
+    if entry is None:
+        response = render()
+        if hasattr(response, "render"):
+            response.render()
+        if not _is_cacheable(response):
+            return response
+        content = response.content
+        entry = {
+            "status": response.status_code,
+            "content": content,
+            "headers": {
+                header: value
+                for header, value in response.items()
+                if header.lower() not in _SKIPPED_HEADERS
+            },
+            "etag": f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"',
+            "encoded": {},
+        }
+        cache.set(key, entry)
+
+    encoding = compression.response_encoding(
+        request, entry["headers"].get("Content-Type", ""), len(entry["content"])
+    )
+    encoded = entry.setdefault("encoded", {})
+    if encoding is not None and encoding not in encoded:
+        encoded[encoding] = compression.compress(entry["content"], encoding)
+        cache.set(key, entry)
+    return _build_response(request, entry, last_modified, encoding)
+
+
+class DataVersionCacheMixin:
+    """Cache safe requests of an API view per data version.
+
+    Viewset actions listed in ``uncached_actions`` always run the view.
+    """
+
+    uncached_actions: ClassVar[set[str]] = set()
+
+    def dispatch(self, request, *args, **kwargs):
+        dispatch = super().dispatch
+        action = getattr(self, "action_map", {}).get(request.method.lower())
+        if request.method not in ("GET", "HEAD") or action in self.uncached_actions:
+            return dispatch(request, *args, **kwargs)
+        return cached_response(request, lambda: dispatch(request, *args, **kwargs))
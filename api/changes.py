@@ -0,0 +1,118 @@
+"""Change feed of the rows created, modified or deleted since a cursor.
+
+Every feed is walked in ``(updated_at, id)`` order over its
+:func:`api.models.change_feed_index`. The cursor records the last row sent
+of each feed, encoded as an opaque token, so a client that stores the token
+of its last page only downloads what changed since. Rows updated within the
+last ``SETTLE_SECONDS`` are held back, so a row whose transaction commits
+after a page was read is not skipped by that page's cursor.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+
+from django.db.models import Q
+from django.utils import timezone
+
+from . import models, serializers
+
+SETTLE_SECONDS = 60
+MAX_LIMIT = 1000
+
+# Feeds in the order they are sent: taxonomy entries before the games
+# referencing them and the games before their rank history.
+FEEDS = [
+    ("categories", models.Category, serializers.CategoryListSerializer),
+    ("designers", models.Designer, serializers.DesignerListSerializer),
+    ("families", models.Family, serializers.FamilyListSerializer),
+    ("mechanics", models.Mechanic, serializers.MechanicListSerializer),
+    ("boardgames", models.Boardgame, serializers.BoardgameChangeSerializer),
+    ("rank_history", models.RankHistory, serializers.RankHistoryChangeSerializer),
+    ("deleted", models.Tombstone, serializers.TombstoneSerializer),
+]
+
+
+class InvalidTokenError(ValueError):
+    pass
+
+
+def encode_token(cursor: dict[str, tuple[datetime.datetime, int]]) -> str:
+    payload = {name: [ts.isoformat(), pk] for name, (ts, pk) in cursor.items()}
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_token(token: str) -> dict[str, tuple[datetime.datetime, int]]:
+    try:
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(data)
+        return {
+            name: (datetime.datetime.fromisoformat(ts), int(pk))
+            for name, (ts, pk) in payload.items()
+        }
+    except (binascii.Error, ValueError, TypeError, AttributeError) as e:
+        raise InvalidTokenError("Invalid since token.") from e
+
+
+def _queryset(model):
+    queryset = model.objects.all()
+    if model is models.Boardgame:
+        queryset = queryset.prefetch_related(
+            "categories", "designers", "families", "mechanics"
+        )
+    elif model is models.RankHistory:
+        queryset = queryset.select_related("boardgame").only(
+            "id",
+            "updated_at",
+            "date",
+            "bgg_rank",
+            "bgg_geek_rating",
+            "bgg_average_rating",
+            "boardgame__bgg_id",
+        )
+    return queryset
+
+
+def changes_since(token: str | None, limit: int) -> dict:
+    """Return up to ``limit`` changed rows after the cursor in ``token``.
+
+    Args:
+        token (str | None): Token of the previous page, or None to start from
+            the first row of every feed.
+        limit (int): Maximum number of rows across all feeds.
+
+    Returns:
+        dict: The serialized rows of each feed, the ``next`` token and
+        whether ``has_more`` rows are waiting.
+
+    Raises:
+        InvalidTokenError: If ``token`` was not issued by this feed.
+
+    """
+    cursor = decode_token(token) if token else {}
+    until = timezone.now() - datetime.timedelta(seconds=SETTLE_SECONDS)
+    remaining = limit
+    changes = {}
+    for name, model, serializer_class in FEEDS:
+        rows = []
+        if remaining:
+            queryset = _queryset(model).filter(updated_at__lte=until)
+            if name in cursor:
+                updated_at, pk = cursor[name]
+                queryset = queryset.filter(
+                    Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, pk__gt=pk)
+                )
+            rows = list(queryset.order_by("updated_at", "pk")[:remaining])
+        if rows:
+            cursor[name] = (rows[-1].updated_at, rows[-1].pk)
+            remaining -= len(rows)
+        changes[name] = serializer_class(rows, many=True).data
+
+    return {
+        "changes": changes,
+        "next": encode_token(cursor),
+        # A full page may have stopped in the middle of a feed.
+        "has_more": remaining == 0,
+    }
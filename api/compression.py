@@ -0,0 +1,136 @@
+"""Brotli, zstd and gzip compression negotiated from ``Accept-Encoding``.
+
+Responses cached per data version keep their compressed bytes next to the
+body (see :func:`api.cache.cached_response`), so every payload is
+compressed once per ingest and encoding. :class:`CompressionMiddleware`
+compresses everything else, including streamed exports, on the fly at a
+faster level.
+
+HTML is left uncompressed, as the browsable API embeds CSRF tokens.
+"""
+
+import re
+import zlib
+from collections.abc import Iterable, Iterator
+
+import brotli
+import zstandard
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+# Supported encodings, preferred first when a client accepts several
+ENCODINGS = ("br", "zstd", "gzip")
+# Bodies smaller than this are not worth a Content-Encoding
+MIN_SIZE = 1024
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/msgpack",
+    "application/vnd.oai.openapi",
+    "application/x-ndjson",
+    "text/csv",
+)
+# Levels for bodies stored compressed, and for responses compressed per request
+STORED_LEVELS = {"br": 9, "zstd": 12, "gzip": 9}
+STREAM_LEVELS = {"br": 4, "zstd": 3, "gzip": 6}
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """Return the preferred encoding of ``ENCODINGS`` the client accepts."""
+    qualities = {}
+    for part in accept_encoding.split(","):
+        name, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in ENCODINGS:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.split(";")[0].strip() in COMPRESSIBLE_TYPES
+
+
+def response_encoding(request, content_type: str, size: int) -> str | None:
+    """Return the encoding to send a body of ``content_type`` and ``size`` in."""
+    if size < MIN_SIZE or not is_compressible(content_type):
+        return None
+    return negotiate(request.headers.get("Accept-Encoding", ""))
+
+
+def compress(content: bytes, encoding: str, levels: dict = STORED_LEVELS) -> bytes:
+    level = levels[encoding]
+    if encoding == "br":
+        return brotli.compress(content, quality=level)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(content)
+    return zlib.compress(content, level, wbits=31)
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Compress a streamed body chunk by chunk."""
+    level = STREAM_LEVELS[encoding]
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        compress_chunk, finish = compressor.process, compressor.finish
+    elif encoding == "zstd":
+        compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        compress_chunk, finish = compressor.compress, compressor.flush
+    else:
+        compressor = zlib.compressobj(level, wbits=31)
+        compress_chunk, finish = compressor.compress, compressor.flush
+
+    for chunk in chunks:
+        if data := compress_chunk(chunk):
+            yield data
+    yield finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress responses that were not served precompressed from the cache."""
+
+    def process_response(self, request, response):
+        content_type = response.get("Content-Type", "")
+        if (
+            response.has_header("Content-Encoding")
+            or response.status_code == 304
+            or not is_compressible(content_type)
+        ):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if response.streaming:
+            if response.is_async:
+                return response
+            encoding = negotiate(request.headers.get("Accept-Encoding", ""))
+            if encoding is None:
+                return response
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding
+            )
+            del response["Content-Length"]
+        else:
+            encoding = response_encoding(request, content_type, len(response.content))
+            if encoding is None:
+                return response
+            compressed = compress(response.content, encoding, STREAM_LEVELS)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        # The compressed body is a different representation.
+        if etag := response.get("ETag"):
+            response["ETag"] = re.sub(r'^"', 'W/"', etag)
+        response["Content-Encoding"] = encoding
+        return response
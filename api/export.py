@@ -0,0 +1,308 @@
+"""Bulk export of the catalog and rank history as NDJSON, CSV or Parquet.
+
+Rows are read with server-side cursors and encoded chunk by chunk, so memory
+stays flat however large the export. Every export is written to disk once per
+data version while it is streamed; later requests stream the file.
+"""
+
+import csv
+import datetime
+import io
+import json
+import logging
+import uuid
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from django.conf import settings
+
+from . import archive, cache, models
+
+logger = logging.getLogger(__name__)
+
+DATASETS = ("boardgames", "rank-history")
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+BOARDGAME_COLUMNS = (
+    "bgg_id",
+    "name",
+    "bgg_rank",
+    "bgg_geek_rating",
+    "bgg_average_rating",
+    "year_published",
+    "minplayers",
+    "maxplayers",
+    "playingtime",
+    "minplaytime",
+    "maxplaytime",
+    "categories",
+    "designers",
+    "families",
+    "mechanics",
+)
+RANK_HISTORY_COLUMNS = (
+    "bgg_id",
+    "date",
+    "bgg_rank",
+    "bgg_geek_rating",
+    "bgg_average_rating",
+)
+TAXONOMIES = ("categories", "designers", "families", "mechanics")
+# Rows fetched per round trip of a server-side cursor and per encoded chunk
+CHUNK_SIZE = 5000
+# Archive rows hold a year of history each
+ARCHIVE_CHUNK_SIZE = 100
+
+# Column types of Parquet exports
+_PARQUET_TYPES = {
+    "bgg_id": "int64",
+    "name": "string",
+    "date": "date32",
+    "bgg_rank": "int64",
+    "bgg_geek_rating": "float64",
+    "bgg_average_rating": "float64",
+    "year_published": "int64",
+    "minplayers": "int64",
+    "maxplayers": "int64",
+    "playingtime": "int64",
+    "minplaytime": "int64",
+    "maxplaytime": "int64",
+    "categories": "list<string>",
+    "designers": "list<string>",
+    "families": "list<string>",
+    "mechanics": "list<string>",
+}
+
+
+class ExportError(Exception):
+    pass
+
+
+def boardgame_rows() -> Iterator[dict]:
+    """Yield every boardgame with the names of its taxonomy entries."""
+    scalar_columns = [c for c in BOARDGAME_COLUMNS if c not in TAXONOMIES]
+    queryset = (
+        models.Boardgame.objects.order_by("pk")
+        .only(*scalar_columns)
+        .prefetch_related(*TAXONOMIES)
+    )
+    # Prefetches run once per chunk of the server-side cursor.
+    for game in queryset.iterator(chunk_size=CHUNK_SIZE):
+        row = {column: getattr(game, column) for column in scalar_columns}
+        for taxonomy in TAXONOMIES:
+            row[taxonomy] = [entry.name for entry in getattr(game, taxonomy).all()]
+        yield row
+
+
+def rank_history_rows(
+    start_date: datetime.date, end_date: datetime.date
+) -> Iterator[dict]:
+    """Yield the rank history of all games between two dates.
+
+    Archived entries come first, followed by the rows of ``rank_history``
+    ordered by date.
+    """
+    archives = (
+        models.RankHistoryArchive.objects.filter(
+            year__gte=start_date.year, year__lte=end_date.year
+        )
+        .select_related("boardgame")
+        .only(
+            "boardgame__bgg_id",
+            "year",
+            "days",
+            "ranks",
+            "geek_ratings",
+            "average_ratings",
+        )
+        .order_by("year", "boardgame_id")
+    )
+    for row in archives.iterator(chunk_size=ARCHIVE_CHUNK_SIZE):
+        for entry in archive.unpack(row):
+            if start_date <= entry["date"] <= end_date:
+                yield {"bgg_id": row.boardgame.bgg_id, **entry}
+
+    rows = (
+        models.RankHistory.objects.filter(date__range=(start_date, end_date))
+        .order_by("date", "boardgame_id")
+        .values_list("boardgame__bgg_id", *RANK_HISTORY_COLUMNS[1:])
+    )
+    for values in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield dict(zip(RANK_HISTORY_COLUMNS, values, strict=True))
+
+
+def _chunks(rows: Iterable[dict]) -> Iterator[list[dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _encode_ndjson(rows: Iterable[dict], columns: tuple[str, ...]) -> Iterator[bytes]:
+    for chunk in _chunks(rows):
+        yield "".join(
+            json.dumps({column: row[column] for column in columns}, default=str) + "\n"
+            for row in chunk
+        ).encode()
+
+
+def _encode_csv(rows: Iterable[dict], columns: tuple[str, ...]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for chunk in _chunks(rows):
+        for row in chunk:
+            writer.writerow(
+                "|".join(value) if isinstance(value, list) else value
+                for value in (row[column] for column in columns)
+            )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _write_parquet(rows: Iterable[dict], columns: tuple[str, ...], path: Path) -> None:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ExportError("Parquet export requires pyarrow.") from e
+
+    types = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "string": pa.string(),
+        "date32": pa.date32(),
+        "list<string>": pa.list_(pa.string()),
+    }
+    schema = pa.schema([(column, types[_PARQUET_TYPES[column]]) for column in columns])
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        # One row group per chunk, so only one chunk is held in memory.
+        for chunk in _chunks(rows):
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+
+
+def _dataset(
+    dataset: str, start_date: datetime.date | None, end_date: datetime.date | None
+) -> tuple[Iterable[dict], tuple[str, ...], str]:
+    if dataset == "boardgames":
+        return boardgame_rows(), BOARDGAME_COLUMNS, dataset
+    if dataset == "rank-history":
+        return (
+            rank_history_rows(start_date, end_date),
+            RANK_HISTORY_COLUMNS,
+            f"{dataset}-{start_date}-{end_date}",
+        )
+    raise ExportError(f"Unknown dataset {dataset}.")
+
+
+def export_name(
+    dataset: str,
+    file_format: str,
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+) -> str:
+    """Return the file name of an export, without the data version."""
+    _, _, name = _dataset(dataset, start_date, end_date)
+    return f"{name}.{file_format}"
+
+
+def _cache_path(name: str) -> Path:
+    version, _ = cache.get_data_version()
+    directory = Path(settings.CACHE_ROOT) / "exports"
+    directory.mkdir(parents=True, exist_ok=True)
+    # Exports of earlier data versions will not be read again.
+    for stale in directory.glob("v*"):
+        if stale.suffix != ".tmp" and not stale.name.startswith(f"v{version}-"):
+            stale.unlink(missing_ok=True)
+    return directory / f"v{version}-{name}"
+
+
+def _read_file(path: Path) -> Iterator[bytes]:
+    with path.open("rb") as f:
+        while chunk := f.read(64 * 1024):
+            yield chunk
+
+
+def _tee(chunks: Iterable[bytes], path: Path) -> Iterator[bytes]:
+    """Yield ``chunks`` while writing them to ``path``.
+
+    The file only appears under its final name once the export is complete.
+    """
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    with tmp_path.open("wb") as f:
+        try:
+            for chunk in chunks:
+                f.write(chunk)
+                yield chunk
+        except BaseException:
+            f.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+    tmp_path.replace(path)
+
+
+def stream_export(
+    dataset: str,
+    file_format: str,
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+) -> Iterator[bytes]:
+    """Stream an export, from disk if it was generated for this data version.
+
+    Raises:
+        ExportError: For unknown datasets or formats, or Parquet without
+            pyarrow.
+
+    """
+    if file_format not in FORMATS:
+        raise ExportError(f"Unknown format {file_format}.")
+    rows, columns, name = _dataset(dataset, start_date, end_date)
+    path = _cache_path(f"{name}.{file_format}")
+    if path.exists():
+        return _read_file(path)
+
+    logger.info("Generating export %s.", path.name)
+    if file_format == "parquet":
+        # The Parquet footer is written last, so the file has to be complete
+        # before it can be served.
+        write_export(dataset, file_format, path, start_date, end_date)
+        return _read_file(path)
+    encode = _encode_ndjson if file_format == "ndjson" else _encode_csv
+    return _tee(encode(rows, columns), path)
+
+
+def write_export(
+    dataset: str,
+    file_format: str,
+    path: Path,
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+) -> None:
+    """Write an export to ``path``."""
+    if file_format not in FORMATS:
+        raise ExportError(f"Unknown format {file_format}.")
+    rows, columns, _ = _dataset(dataset, start_date, end_date)
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        if file_format == "parquet":
+            _write_parquet(rows, columns, tmp_path)
+        else:
+            encode = _encode_ndjson if file_format == "ndjson" else _encode_csv
+            with tmp_path.open("wb") as f:
+                for chunk in encode(rows, columns):
+                    f.write(chunk)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    tmp_path.replace(path)
@@ -0,0 +1,125 @@
+"""Sparse fieldsets selected with ``?fields=`` and ``?exclude=``.
+
+Both take comma separated names of top-level fields. Serializers with
+:class:`SparseFieldsSerializerMixin` drop the fields that were not
+requested, and :func:`sparse_queryset` narrows the query to match, so
+unrequested columns are not loaded and unrequested relations are not
+prefetched. Unknown names are ignored.
+"""
+
+from collections.abc import Sequence
+
+from django.core.exceptions import FieldDoesNotExist
+from drf_spectacular.openapi import AutoSchema
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+
+PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        str,
+        description="Comma separated fields to return, all by default.",
+    ),
+    OpenApiParameter(
+        "exclude",
+        str,
+        description="Comma separated fields to leave out.",
+    ),
+]
+
+
+def _names(value: str | None) -> set[str]:
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+
+def requested_fields(query_params) -> dict:
+    """Return the serializer context entries of a request's fieldset."""
+    return {
+        "fields": _names(query_params.get("fields")) or None,
+        "exclude": _names(query_params.get("exclude")),
+    }
+
+
+def sparse_queryset(
+    queryset, serializer: serializers.BaseSerializer, select_related: Sequence[str] = ()
+):
+    """Load only what the fields of ``serializer`` read from ``queryset``.
+
+    Columns of the model are restricted with ``only()`` and to-many
+    relations are prefetched when a field serializes them. Method fields are
+    left to the view, which can join what they read with ``select_related``.
+    Querysets of other models than the serializer's are returned unchanged.
+    """
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    meta = getattr(serializer, "Meta", None)
+    if getattr(meta, "model", None) is not queryset.model:
+        return queryset
+    opts = queryset.model._meta  # noqa: SLF001
+    columns = list(select_related)
+    prefetches = []
+    for field in serializer.fields.values():
+        if isinstance(field, serializers.SerializerMethodField) or field.source == "*":
+            continue
+        try:
+            model_field = opts.get_field(field.source.split(".")[0])
+        except FieldDoesNotExist:
+            # Annotations of the view's queryset
+            continue
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetches.append(model_field.name)
+        elif model_field.concrete:
+            columns.append(model_field.name)
+    return queryset.only(*columns).prefetch_related(*prefetches)
+
+
+class SparseFieldsSerializerMixin:
+    """Drop the fields not selected by the ``fields`` and ``exclude`` context."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get("fields")
+        exclude = self.context.get("exclude", ())
+        for name in list(self.fields):
+            if (fields is not None and name not in fields) or name in exclude:
+                self.fields.pop(name)
+
+
+class SparseFieldsSchema(AutoSchema):
+    """Document ``fields`` and ``exclude`` on reads with a sparse serializer."""
+
+    def get_override_parameters(self):
+        parameters = super().get_override_parameters()
+        serializer = self.get_response_serializers()
+        if self.method == "GET" and isinstance(
+            getattr(serializer, "child", serializer), SparseFieldsSerializerMixin
+        ):
+            return [*parameters, *PARAMETERS]
+        return parameters
+
+
+class SparseFieldsViewMixin:
+    """Pass the requested fieldset to the serializers of a generic view.
+
+    Views build their querysets with :meth:`sparse_queryset`.
+    """
+
+    schema = SparseFieldsSchema()
+
+    def get_serializer_context(self):
+        return {
+            **super().get_serializer_context(),
+            **requested_fields(self.request.query_params),
+        }
+
+    def get_queryset(self):
+        return self.sparse_queryset(super().get_queryset())
+
+    def get_select_related(self) -> list[str]:
+        """Relations read by method fields, joined into the queryset."""
+        return []
+
+    def sparse_queryset(self, queryset):
+        return sparse_queryset(
+            queryset, self.get_serializer(), self.get_select_related()
+        )
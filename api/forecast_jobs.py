@@ -0,0 +1,157 @@
+"""Forecast jobs that fit models outside the web workers.
+
+With the ``local`` backend jobs are fitted in a process pool owned by the
+web process, which only records the results. With the ``database`` backend
+web workers just create the job rows and the ``run_forecast_jobs`` command
+works through them.
+"""
+
+import datetime
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import forecasts, models
+from .statistics import forecast_game_ranking
+
+logger = logging.getLogger(__name__)
+
+# Jobs still pending or running after this long are assumed to be lost, e.g.
+# because the process that ran them was restarted, and are submitted again.
+# Failed jobs are retried once they are this old.
+JOB_TIMEOUT = datetime.timedelta(minutes=10)
+
+Status = models.ForecastJob.Status
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            # Spawned workers only import the statistics package, they never
+            # inherit the parent's database connections.
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.FORECAST_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _claim(job: models.ForecastJob) -> bool:
+    """Mark ``job`` as running unless another process got to it first."""
+    claimed = models.ForecastJob.objects.filter(
+        pk=job.pk, status=job.status, updated_at=job.updated_at
+    ).update(status=Status.RUNNING, updated_at=timezone.now())
+    return claimed == 1
+
+
+def _finish(job_id, predictions: list[dict] | None, error: str = "") -> None:
+    job = models.ForecastJob.objects.get(pk=job_id)
+    if predictions is None:
+        job.status = Status.FAILED
+        job.error = error
+    elif not predictions:
+        # Nothing to store, the job must not look like it produced a forecast.
+        job.status = Status.FAILED
+        job.error = "The model returned no forecast for this history."
+    else:
+        forecasts.store_forecasts(
+            {job.boardgame_id: (predictions, job.history_date)}, model=job.model
+        )
+        job.status = Status.DONE
+    job.save()
+
+
+def _on_done(job_id, future: Future) -> None:
+    # Runs in a thread of the web process, which owns its own connection.
+    try:
+        try:
+            predictions = future.result()
+        except Exception as e:
+            logger.exception("Forecast job %s failed.", job_id)
+            _finish(job_id, None, error=str(e))
+        else:
+            _finish(job_id, predictions)
+    finally:
+        connection.close()
+
+
+def _submit(job: models.ForecastJob, history: list[dict]) -> None:
+    if not _claim(job):
+        return
+    future = _get_executor().submit(forecast_game_ranking, history, job.model)
+    future.add_done_callback(lambda f: _on_done(job.pk, f))
+
+
+def enqueue_forecast(
+    boardgame: models.Boardgame, model: str, history: list[dict]
+) -> models.ForecastJob:
+    """Return the job fitting ``model`` on ``history``, creating it if needed.
+
+    Duplicate requests for the same game, model and history get the job that
+    already exists. Lost jobs are submitted again and failed ones are retried
+    after ``JOB_TIMEOUT``.
+    """
+    job, created = models.ForecastJob.objects.get_or_create(
+        boardgame=boardgame, model=model, history_date=history[-1]["date"]
+    )
+    expired = job.updated_at < timezone.now() - JOB_TIMEOUT
+    lost = job.status in (Status.PENDING, Status.RUNNING) and expired
+    retry = job.status == Status.FAILED and expired
+    if retry:
+        job.status = Status.PENDING
+        job.error = ""
+        job.save()
+    if settings.FORECAST_JOB_BACKEND == "local" and (created or lost or retry):
+        # Submit only once the job row is visible to the callback's connection.
+        transaction.on_commit(lambda: _submit(job, history))
+    return job
+
+
+def run_pending_jobs() -> int:
+    """Fit all pending jobs in this process, for the ``database`` backend.
+
+    Returns:
+        int: Number of jobs processed.
+
+    """
+    processed = 0
+    while True:
+        close_old_connections()
+        with transaction.atomic():
+            job = (
+                models.ForecastJob.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=Status.PENDING)
+                    | Q(
+                        status=Status.RUNNING,
+                        updated_at__lt=timezone.now() - JOB_TIMEOUT,
+                    )
+                )
+                .order_by("created_at")
+                .first()
+            )
+            if job is None:
+                return processed
+            job.status = Status.RUNNING
+            job.save()
+
+        history = forecasts.load_history(job.boardgame, until=job.history_date)
+        try:
+            predictions = forecast_game_ranking(history, model=job.model)
+        except Exception as e:
+            logger.exception("Forecast job %s failed.", job.pk)
+            _finish(job.pk, None, error=str(e))
+        else:
+            _finish(job.pk, predictions)
+        processed += 1
@@ -0,0 +1,203 @@
+"""Storage of precomputed boardgame forecasts.
+
+Forecasts are fitted in batch after every ingest and read back by the
+forecast endpoint. Games without a stored forecast yet are fitted by forecast
+jobs, see :mod:`api.forecast_jobs`.
+"""
+
+import datetime
+import logging
+
+from django.db import transaction
+from django.db.models import Max
+
+from . import history, models
+from .statistics import DEFAULT_MODEL, forecast_catalog_rankings
+
+logger = logging.getLogger(__name__)
+
+# Days of rank history the models are fitted on
+HISTORY_DAYS = 365
+# Games forecast together by the batch job, bounding its memory use
+CHUNK_SIZE = 2000
+
+HISTORY_FIELDS = ("date", "bgg_rank", "bgg_geek_rating", "bgg_average_rating")
+
+
+def load_history(
+    boardgame: models.Boardgame, until: datetime.date | None = None
+) -> list[dict]:
+    """Return the rank history window the forecast models are fitted on.
+
+    The window ends with the latest history entry, or at ``until``.
+    """
+    latest = until or boardgame.bgg_rank_history.aggregate(latest=Max("date"))["latest"]
+    if latest is None:
+        return []
+    start = latest - datetime.timedelta(days=HISTORY_DAYS - 1)
+    return [
+        {field: entry[field] for field in HISTORY_FIELDS}
+        for entry in history.daily_history(boardgame, start, latest)
+    ]
+
+
+def _to_rows(
+    boardgame_id: int,
+    model: str,
+    predictions: list[dict],
+    history_date: datetime.date,
+) -> list[models.Forecast]:
+    return [
+        models.Forecast(
+            boardgame_id=boardgame_id,
+            model=model,
+            date=prediction["date"].date(),
+            history_date=history_date,
+            bgg_rank=prediction["bgg_rank"],
+            bgg_rank_lower=prediction["bgg_rank_confidence_interval"][0],
+            bgg_rank_upper=prediction["bgg_rank_confidence_interval"][1],
+            bgg_average_rating=prediction["bgg_average_rating"],
+            bgg_average_rating_lower=prediction[
+                "bgg_average_rating_confidence_interval"
+            ][0],
+            bgg_average_rating_upper=prediction[
+                "bgg_average_rating_confidence_interval"
+            ][1],
+            bgg_geek_rating=prediction["bgg_geek_rating"],
+            bgg_geek_rating_lower=prediction["bgg_geek_rating_confidence_interval"][0],
+            bgg_geek_rating_upper=prediction["bgg_geek_rating_confidence_interval"][1],
+        )
+        for prediction in predictions
+    ]
+
+
+def store_forecasts(
+    forecasts: dict[int, tuple[list[dict], datetime.date]], model: str = DEFAULT_MODEL
+) -> None:
+    """Replace the stored forecasts of the given boardgames for one model.
+
+    Args:
+        forecasts (dict[int, tuple[list[dict], date]]): Predictions as returned
+            by :func:`forecast_game_ranking` and the last history date they
+            were fitted on, keyed by boardgame primary key.
+        model (str): Model the predictions were made with.
+
+    """
+    rows = [
+        row
+        for boardgame_id, (predictions, history_date) in forecasts.items()
+        for row in _to_rows(boardgame_id, model, predictions, history_date)
+    ]
+    with transaction.atomic():
+        models.Forecast.objects.filter(
+            boardgame_id__in=forecasts.keys(), model=model
+        ).delete()
+        models.Forecast.objects.bulk_create(rows, batch_size=5000)
+
+
+def _history_chunks(boardgame_ids: list[int], since: datetime.date):
+    """Yield the history rows of ``CHUNK_SIZE`` boardgames at a time."""
+    for start in range(0, len(boardgame_ids), CHUNK_SIZE):
+        chunk = boardgame_ids[start : start + CHUNK_SIZE]
+        yield models.RankHistory.objects.filter(
+            boardgame_id__in=chunk, date__gt=since
+        ).values_list(
+            "boardgame_id",
+            "date",
+            "bgg_rank",
+            "bgg_average_rating",
+            "bgg_geek_rating",
+        )
+
+
+def refresh_forecasts(model: str = DEFAULT_MODEL, n_jobs: int = -1) -> int:
+    """Recompute the stored forecasts of all ranked boardgames with ``model``.
+
+    The catalog is forecast in chunks of games, fitting all series of a
+    chunk in parallel.
+
+    Returns:
+        int: Number of boardgames with a fresh forecast.
+
+    """
+    logger.info("Refreshing stored %s forecasts.", model)
+    latest = models.RankHistory.objects.aggregate(latest=Max("date"))["latest"]
+    if latest is None:
+        return 0
+
+    boardgame_ids = list(
+        models.Boardgame.objects.filter(bgg_rank__isnull=False)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    since = latest - datetime.timedelta(days=HISTORY_DAYS)
+    history_dates = dict(
+        models.RankHistory.objects.filter(date__gt=since)
+        .values("boardgame_id")
+        .annotate(latest=Max("date"))
+        .values_list("boardgame_id", "latest")
+    )
+
+    refreshed = 0
+    for predictions in forecast_catalog_rankings(
+        _history_chunks(boardgame_ids, since), n_jobs=n_jobs, model=model
+    ):
+        store_forecasts(
+            {
+                boardgame_id: (game_predictions, history_dates[boardgame_id])
+                for boardgame_id, game_predictions in predictions.items()
+            },
+            model=model,
+        )
+        refreshed += len(predictions)
+
+    logger.info("Refreshed forecasts of %s boardgames.", refreshed)
+    return refreshed
+
+
+def refreshed_after_ingest(boardgame: models.Boardgame, model: str) -> bool:
+    """Whether :func:`refresh_forecasts` refits ``model`` for ``boardgame``."""
+    return model == DEFAULT_MODEL and boardgame.bgg_rank is not None
+
+
+def get_stored_forecast(
+    boardgame: models.Boardgame, model: str = DEFAULT_MODEL
+) -> dict | None:
+    """Return the stored forecast of ``boardgame`` with a staleness marker.
+
+    A forecast is stale when rank history newer than the data it was fitted
+    on has been ingested since.
+    """
+    rows = list(boardgame.forecasts.filter(model=model).order_by("date"))
+    if not rows:
+        return None
+
+    latest = boardgame.bgg_rank_history.aggregate(latest=Max("date"))["latest"]
+    history_date = rows[0].history_date
+    return {
+        "model": model,
+        "generated_at": rows[0].updated_at,
+        "history_date": history_date,
+        "stale": latest is not None and latest > history_date,
+        "predictions": [
+            {
+                "date": datetime.datetime.combine(row.date, datetime.time.min),
+                "bgg_rank": row.bgg_rank,
+                "bgg_rank_confidence_interval": (
+                    row.bgg_rank_lower,
+                    row.bgg_rank_upper,
+                ),
+                "bgg_average_rating": row.bgg_average_rating,
+                "bgg_average_rating_confidence_interval": (
+                    row.bgg_average_rating_lower,
+                    row.bgg_average_rating_upper,
+                ),
+                "bgg_geek_rating": row.bgg_geek_rating,
+                "bgg_geek_rating_confidence_interval": (
+                    row.bgg_geek_rating_lower,
+                    row.bgg_geek_rating_upper,
+                ),
+            }
+            for row in rows
+        ],
+    }
@@ -0,0 +1,216 @@
+"""Rank history of a boardgame as served to charts."""
+
+import datetime
+
+import pandas as pd
+from django.db.models import DateField, F
+from django.db.models.functions import Trunc
+
+from . import archive, models
+from .statistics import lttb
+
+CHART_FIELDS = ("id", "date", "bgg_rank", "bgg_geek_rating", "bgg_average_rating")
+MODES = ("daily", "weekly", "monthly", "yearly")
+# Calendar period kept once per entry by each chart mode
+PERIODS = {"weekly": "week", "monthly": "month", "yearly": "year"}
+METRICS = ("bgg_rank", "bgg_geek_rating", "bgg_average_rating")
+
+# Rollup columns read as chart entries, the last value of every period
+_ROLLUP_VALUES = {
+    "date": F("last_date"),
+    "bgg_rank": F("bgg_rank_last"),
+    "bgg_geek_rating": F("bgg_geek_rating_last"),
+    "bgg_average_rating": F("bgg_average_rating_last"),
+}
+
+
+def daily_history(
+    boardgame: models.Boardgame,
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+) -> list[dict]:
+    """Return every rank history entry between two dates, ordered by date.
+
+    Entries moved to the archive come first, followed by the rows still in
+    ``rank_history``. Archived entries have no ``id``.
+    """
+    return daily_histories([boardgame.pk], start_date, end_date)[boardgame.pk]
+
+
+def daily_histories(
+    boardgame_ids: list[int],
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+) -> dict[int, list[dict]]:
+    """Return the :func:`daily_history` of several boardgames by id.
+
+    Reads the archive and ``rank_history`` once each, whatever the number of
+    games.
+    """
+    histories = {pk: [] for pk in boardgame_ids}
+    for pk, entries in archive.archived_histories(
+        boardgame_ids, start_date, end_date
+    ).items():
+        histories[pk].extend(entries)
+
+    queryset = models.RankHistory.objects.filter(boardgame_id__in=boardgame_ids)
+    if start_date is not None:
+        queryset = queryset.filter(date__gte=start_date)
+    if end_date is not None:
+        queryset = queryset.filter(date__lte=end_date)
+    for entry in queryset.order_by("boardgame_id", "date").values(
+        "boardgame_id", *CHART_FIELDS
+    ):
+        histories[entry.pop("boardgame_id")].append(entry)
+    return histories
+
+
+def _distinct_period_history(
+    boardgame: models.Boardgame,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    mode: str,
+) -> list[dict]:
+    """Latest ``rank_history`` row of every period, for games without rollups."""
+    queryset = (
+        models.RankHistory.objects.filter(
+            boardgame=boardgame, date__range=(start_date, end_date)
+        )
+        .values(*CHART_FIELDS)
+        .annotate(period=Trunc("date", PERIODS[mode], output_field=DateField()))
+        # DISTINCT ON keeps the first row of each period, i.e. its latest day.
+        .order_by("period", "-date")
+        .distinct("period")
+    )
+    return [{field: entry[field] for field in CHART_FIELDS} for entry in queryset]
+
+
+def _period_history(
+    boardgame: models.Boardgame,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    mode: str,
+) -> list[dict]:
+    if mode == "weekly":
+        model = models.RankHistoryWeekly
+        first_period = start_date - datetime.timedelta(days=start_date.weekday())
+    else:
+        model = models.RankHistoryMonthly
+        first_period = start_date.replace(day=1)
+
+    queryset = (
+        model.objects.filter(
+            boardgame=boardgame,
+            period__range=(first_period, end_date),
+            # The partial first and last periods can end outside the range.
+            last_date__range=(start_date, end_date),
+        )
+        .values(**_ROLLUP_VALUES)
+        .order_by("period")
+    )
+    if mode == "yearly":
+        # DISTINCT ON keeps the first row of each year, i.e. its latest month.
+        queryset = (
+            queryset.annotate(year=Trunc("period", "year", output_field=DateField()))
+            .order_by("year", "-period")
+            .distinct("year")
+        )
+    # Rollups are not rank history rows, so their entries have no id.
+    history = [
+        {"id": None, **{field: entry[field] for field in CHART_FIELDS[1:]}}
+        for entry in queryset
+    ]
+    if not history and not model.objects.filter(boardgame=boardgame).exists():
+        # Not rolled up yet, e.g. before the first ingest or backfill.
+        return _distinct_period_history(boardgame, start_date, end_date, mode)
+    return history
+
+
+def chart_history(
+    boardgame: models.Boardgame,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    mode: str = "daily",
+    max_points: int | None = None,
+) -> list[dict]:
+    """Return the rank history between two dates, downsampled for a chart.
+
+    Args:
+        boardgame (Boardgame): Game to load the history of.
+        start_date (date): First day of the range.
+        end_date (date): Last day of the range.
+        mode (str): ``daily`` returns every entry including archived ones,
+            the other :data:`MODES`
+            the last entry of every week, month or year. These are read from
+            the rollup tables, see :mod:`api.rollups`, and have no ``id``.
+            Games without rollups yet fall back to ``rank_history``.
+        max_points (int | None): Further reduce the entries with LTTB to at
+            most this many points.
+
+    Returns:
+        list[dict]: Entries with the keys of :data:`CHART_FIELDS`, ordered
+            by date.
+
+    """
+    if mode in MODES[1:]:
+        history = _period_history(boardgame, start_date, end_date, mode)
+    else:
+        history = daily_history(boardgame, start_date, end_date)
+
+    if max_points is not None:
+        history = lttb(history, max_points)
+    return history
+
+
+def aligned_history(
+    boardgames: list[models.Boardgame],
+    metric: str,
+    start_date: datetime.date,
+    end_date: datetime.date,
+) -> dict:
+    """Return one metric of several games as columns aligned on date.
+
+    The history is read with one query per storage tier and pivoted in
+    pandas, instead of loading and aligning every game separately.
+
+    Args:
+        boardgames (list[Boardgame]): Games to compare, in column order.
+        metric (str): One of :data:`METRICS`.
+        start_date (date): First day of the range.
+        end_date (date): Last day of the range.
+
+    Returns:
+        dict: ``dates`` with every day any game has history for, and
+        ``series`` with a list of values per ``bgg_id`` aligned on ``dates``.
+        Days without history of a game are None.
+
+    """
+    pks = [game.pk for game in boardgames]
+    rows = [
+        (pk, entry["date"], entry[metric])
+        for pk, entries in archive.archived_histories(pks, start_date, end_date).items()
+        for entry in entries
+    ]
+    rows.extend(
+        models.RankHistory.objects.filter(
+            boardgame_id__in=pks, date__range=(start_date, end_date)
+        )
+        .order_by("id")
+        .values_list("boardgame_id", "date", metric)
+    )
+    df = pd.DataFrame(rows, columns=["boardgame_id", "date", metric])
+    # Nothing keeps a game from having two rows on one day, the latest wins.
+    df = df.drop_duplicates(["date", "boardgame_id"], keep="last")
+    if metric == "bgg_rank":
+        df[metric] = df[metric].astype("Int64")
+    matrix = (
+        df.pivot(index="date", columns="boardgame_id", values=metric)
+        .sort_index()
+        .reindex(columns=pks)
+        .astype(object)
+    )
+    matrix = matrix.where(matrix.notna(), None)
+    return {
+        "dates": list(matrix.index),
+        "series": {str(game.bgg_id): matrix[game.pk].tolist() for game in boardgames},
+    }
@@ -0,0 +1,44 @@
+"""Steps that refresh derived data after new rank data was ingested."""
+
+import logging
+
+from . import (
+    autocomplete,
+    cache,
+    forecasts,
+    leaderboards,
+    movers,
+    partitions,
+    rollups,
+    sparklines,
+    taxonomies,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def after_ingest() -> None:
+    """Refresh everything that is derived from the boardgame tables.
+
+    Called by the update scripts once all games and their rank history for
+    the day have been written.
+    """
+    logger.info("Refreshing data derived from the ingest.")
+    partitions.ensure_partitions()
+    autocomplete.write_snapshot()
+    rollups.refresh_rollups()
+    movers.refresh_movers()
+    sparklines.refresh_sparklines()
+    taxonomies.refresh_taxonomy_stats()
+    leaderboards.refresh_leaderboards()
+    # Cached responses are invalidated once everything derived from the new
+    # data is in place, except forecasts: fitting the whole catalog takes
+    # long, and the new data must not wait for it or fail with it.
+    cache.bump_data_version()
+    try:
+        forecasts.refresh_forecasts()
+    except Exception:
+        logger.exception("Refreshing the stored forecasts failed.")
+    else:
+        # Serve the refreshed forecasts instead of cached stale ones.
+        cache.bump_data_version()
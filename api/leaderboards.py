@@ -0,0 +1,159 @@
+"""Precomputed leaderboards of the games rising and falling the most in rank.
+
+:func:`refresh_leaderboards` ranks every game by its rank change over each
+of ``Leaderboard.WINDOWS`` days before the latest ingest, in percent of its
+past rank like ``bgg_rank_trend``, so a move from 20 to 10 outranks one from
+2010 to 2000. The best ``MAX_SIZE`` games of every direction, window and
+scope (all games, or those of one category, mechanic or designer) are
+stored as one :class:`api.models.Leaderboard` row, so reading a leaderboard
+is a lookup of one row and of its games by primary key. Each window
+compares against the latest ingest on or before its first day, so a missed
+ingest does not empty it.
+
+Boardgame ids are packed as little-endian int32 and scores as float32.
+"""
+
+import datetime
+import logging
+from collections.abc import Iterator
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+from django.db.models import F, FloatField, Max
+from django.db.models.functions import Cast
+
+from . import models, movers
+
+logger = logging.getLogger(__name__)
+
+MAX_SIZE = 100
+DEFAULT_SIZE = 5
+DEFAULT_DAYS = 30
+# Boards written per INSERT
+CHUNK_SIZE = 1000
+# Boardgame relations by leaderboard scope
+SCOPE_RELATIONS = {
+    "category": "categories",
+    "mechanic": "mechanics",
+    "designer": "designers",
+}
+
+_IDS = np.dtype("<i4")
+_SCORES = np.dtype("<f4")
+
+
+def decode(leaderboard: models.Leaderboard) -> list[tuple[int, float]]:
+    """Return the boardgame ids and scores of a board, best first."""
+    ids = np.frombuffer(bytes(leaderboard.boardgames), _IDS).tolist()
+    scores = np.frombuffer(bytes(leaderboard.scores), _SCORES).tolist()
+    # Rounded, so float32 noise does not show in responses
+    return [(pk, round(score, 3)) for pk, score in zip(ids, scores, strict=True)]
+
+
+def get_leaderboard(
+    direction: str, days: int, scope: str = "overall", scope_id: int = 0
+) -> list[tuple[int, float]] | None:
+    """Return the stored board, empty when the scope has no moving games.
+
+    None means no leaderboard was computed yet, e.g. right after deploying
+    or in a seeded database.
+    """
+    leaderboard = models.Leaderboard.objects.filter(
+        direction=direction, days=days, scope=scope, scope_id=scope_id
+    ).first()
+    if leaderboard is None:
+        return [] if models.Leaderboard.objects.exists() else None
+    return decode(leaderboard)
+
+
+def _compare_date(latest: datetime.date, days: int) -> datetime.date | None:
+    """Latest date with history on or before ``days`` before ``latest``."""
+    return models.RankHistory.objects.filter(
+        date__lte=latest - datetime.timedelta(days=days)
+    ).aggregate(date=Max("date"))["date"]
+
+
+def _scores(compare_to: datetime.date) -> pd.DataFrame:
+    """Rank change of every game ranked now and on ``compare_to``."""
+    rows = (
+        models.RankHistory.objects.filter(
+            date=compare_to,
+            bgg_rank__isnull=False,
+            boardgame__bgg_rank__isnull=False,
+        )
+        .annotate(
+            score=Cast(F("bgg_rank") - F("boardgame__bgg_rank"), FloatField())
+            * 100
+            / F("bgg_rank")
+        )
+        .values_list("boardgame_id", "score")
+    )
+    return pd.DataFrame(list(rows), columns=["boardgame_id", "score"])
+
+
+def _scoped(scores: pd.DataFrame) -> pd.DataFrame:
+    """Scores of all games once per scope they belong to."""
+    frames = [scores.assign(scope="overall", scope_id=0)]
+    boardgame_meta = models.Boardgame._meta  # noqa: SLF001
+    for scope, relation in SCOPE_RELATIONS.items():
+        field = boardgame_meta.get_field(relation)
+        taxonomy = field.related_model._meta.model_name  # noqa: SLF001
+        links = pd.DataFrame(
+            list(
+                field.remote_field.through.objects.values_list(
+                    f"{taxonomy}__bgg_id", "boardgame_id"
+                )
+            ),
+            columns=["scope_id", "boardgame_id"],
+        )
+        frames.append(links.merge(scores, on="boardgame_id").assign(scope=scope))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _boards(
+    scoped: pd.DataFrame, direction: str, days: int, compare_to: datetime.date
+) -> Iterator[models.Leaderboard]:
+    """Build the boards of one direction and window from scoped scores."""
+    ascending = direction == "declining"
+    moved = scoped[scoped["score"] < 0] if ascending else scoped[scoped["score"] > 0]
+    top = (
+        moved.sort_values(
+            ["scope", "scope_id", "score", "boardgame_id"],
+            ascending=[True, True, ascending, True],
+        )
+        .groupby(["scope", "scope_id"], sort=False)
+        .head(MAX_SIZE)
+    )
+    for (scope, scope_id), board in top.groupby(["scope", "scope_id"], sort=False):
+        yield models.Leaderboard(
+            direction=direction,
+            days=days,
+            scope=scope,
+            scope_id=scope_id,
+            compare_to=compare_to,
+            boardgames=board["boardgame_id"].to_numpy(_IDS).tobytes(),
+            scores=board["score"].to_numpy(_SCORES).tobytes(),
+        )
+
+
+def refresh_leaderboards() -> None:
+    """Rebuild every leaderboard from the latest ingest."""
+    latest = movers.latest_history_date()
+    if latest is None:
+        return
+
+    with transaction.atomic():
+        models.Leaderboard.objects.all().delete()
+        for days in models.Leaderboard.WINDOWS:
+            compare_to = _compare_date(latest, days)
+            if compare_to is None:
+                logger.info("No history to compare %s days against.", days)
+                continue
+            scoped = _scoped(_scores(compare_to))
+            count = 0
+            for direction in models.Leaderboard.DIRECTIONS:
+                boards = list(_boards(scoped, direction, days, compare_to))
+                models.Leaderboard.objects.bulk_create(boards, batch_size=CHUNK_SIZE)
+                count += len(boards)
+            logger.info("Stored %s leaderboards over %s days.", count, days)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+import datetime
+
+from api.archive import archive_history
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves whole months of old rank history into the packed yearly archive "
+        "and drops their partitions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            help=(
+                "Archive the months before this date (YYYY-MM-DD), "
+                "RANK_HISTORY_HOT_DAYS ago by default."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        before = None
+        if options["before"]:
+            try:
+                before = datetime.date.fromisoformat(options["before"])
+            except ValueError as e:
+                raise CommandError("Use YYYY-MM-DD for --before.") from e
+        for name in archive_history(before):
+            self.stdout.write(f"Archived {name}.")
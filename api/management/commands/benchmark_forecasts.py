@@ -0,0 +1,124 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.utils import timezone
+import importlib.metadata
+import json
+import logging
+import platform
+import random
+
+from api import archive, history, models
+from api.forecasts import HISTORY_FIELDS
+from api.statistics import FORECAST_MODELS
+from api.statistics.backtest import backtest_game, summarize_backtests
+from api.statistics.predict import HORIZON
+
+logger = logging.getLogger(__name__)
+
+REPORT_VERSION = 1
+
+
+def _csv(cast):
+    return lambda value: [cast(item) for item in value.split(",") if item]
+
+
+class Command(BaseCommand):
+    help = (
+        "Backtests the forecast models on stored rank history and writes a "
+        "JSON report of accuracy, latency and memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--models",
+            type=_csv(str),
+            default=list(FORECAST_MODELS),
+            help="Comma separated models, all by default.",
+        )
+        parser.add_argument(
+            "--windows",
+            type=_csv(int),
+            default=[30, 90, 180, 365],
+            help="Comma separated history lengths the models are fitted on.",
+        )
+        parser.add_argument("--games", type=int, default=20)
+        parser.add_argument("--origins", type=int, default=4)
+        parser.add_argument(
+            "--step", type=int, default=HORIZON, help="Days between origins."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Report path, stdout by default.")
+
+    def handle(self, *args, **options):
+        unknown = set(options["models"]) - set(FORECAST_MODELS)
+        if unknown:
+            raise CommandError(f"Unknown models: {', '.join(sorted(unknown))}")
+
+        # Archived days count too, rank_history only keeps the recent ones.
+        lengths = archive.archived_lengths()
+        ranked = (
+            models.Boardgame.objects.filter(bgg_rank__isnull=False)
+            .annotate(entries=Count("bgg_rank_history"))
+            .order_by("pk")
+            .values_list("pk", "entries")
+        )
+        candidates = [
+            pk for pk, entries in ranked if entries + lengths.get(pk, 0) > 2 * HORIZON
+        ]
+        sample = random.Random(options["seed"]).sample(
+            candidates, min(options["games"], len(candidates))
+        )
+        # The full history including the archive, as long windows reach back
+        # further than the rows kept in rank_history.
+        daily = history.daily_histories(sample)
+        histories = [
+            [{field: entry[field] for field in HISTORY_FIELDS} for entry in daily[pk]]
+            for pk in sample
+        ]
+        logger.info("Backtesting on %s boardgames.", len(histories))
+
+        results = []
+        for model in options["models"]:
+            for window in options["windows"]:
+                logger.info("Backtesting %s on %s days of history.", model, window)
+                backtests = [
+                    backtest_game(
+                        game_history,
+                        model,
+                        window,
+                        origins=options["origins"],
+                        step=options["step"],
+                    )
+                    for game_history in histories
+                ]
+                results.append(
+                    {"model": model, "window": window, **summarize_backtests(backtests)}
+                )
+
+        report = {
+            "report_version": REPORT_VERSION,
+            "generated_at": timezone.now().isoformat(),
+            "environment": {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                **{
+                    package: importlib.metadata.version(package)
+                    for package in ("statsforecast", "numpy", "pandas")
+                },
+            },
+            "parameters": {
+                "games": len(histories),
+                "seed": options["seed"],
+                "origins": options["origins"],
+                "step": options["step"],
+                "horizon": HORIZON,
+            },
+            "results": results,
+        }
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        else:
+            self.stdout.write(output)
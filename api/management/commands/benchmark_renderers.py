@@ -0,0 +1,126 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+import datetime
+import importlib.metadata
+import json
+import logging
+import platform
+import statistics
+import time
+
+from api import history, models, renderers, serializers
+
+logger = logging.getLogger(__name__)
+
+REPORT_VERSION = 1
+
+
+def _payloads(games: int, days: int) -> dict:
+    """Build the data of a list page and of daily chart histories."""
+    boardgames = list(
+        models.Boardgame.objects.order_by("bgg_rank").prefetch_related(
+            "categories", "designers", "families", "mechanics"
+        )[:games]
+    )
+    end_date = timezone.now().date()
+    start_date = end_date - datetime.timedelta(days=days)
+    histories = history.daily_histories(
+        [game.pk for game in boardgames], start_date, end_date
+    )
+    return {
+        "boardgame_list": serializers.BoardgameListSerializer(
+            boardgames, many=True
+        ).data,
+        "rank_history": [
+            {
+                "bgg_id": game.bgg_id,
+                "bgg_rank_history": serializers.RankHistorySerializer(
+                    histories[game.pk], many=True
+                ).data,
+            }
+            for game in boardgames
+        ],
+    }
+
+
+def _time(renderer, data, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        content = renderer.render(data, renderer.media_type, {})
+        timings.append(time.perf_counter() - start)
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "bytes": len(content),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Times DRF's JSON renderer against the orjson and MessagePack renderers "
+        "on list and rank history payloads and writes a JSON report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", type=int, default=100, help="Games per payload.")
+        parser.add_argument(
+            "--days", type=int, default=365, help="Days of rank history per game."
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--output", help="Report path, stdout by default.")
+
+    def handle(self, *args, **options):
+        candidates = {
+            "drf_json": JSONRenderer(),
+            "orjson": renderers.ORJSONRenderer(),
+            "msgpack": renderers.MessagePackRenderer(),
+        }
+
+        payloads = _payloads(options["games"], options["days"])
+        results = []
+        for payload, data in payloads.items():
+            baseline = None
+            for name, renderer in candidates.items():
+                logger.info("Rendering %s with %s.", payload, name)
+                result = _time(renderer, data, options["repeat"])
+                if baseline is None:
+                    baseline = result["median_ms"]
+                results.append(
+                    {
+                        "payload": payload,
+                        "renderer": name,
+                        **result,
+                        "speedup": baseline / result["median_ms"],
+                    }
+                )
+
+        report = {
+            "report_version": REPORT_VERSION,
+            "generated_at": timezone.now().isoformat(),
+            "environment": {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "djangorestframework": importlib.metadata.version(
+                    "djangorestframework"
+                ),
+                **{
+                    package: importlib.metadata.version(package)
+                    for package in ("orjson", "msgpack")
+                },
+            },
+            "parameters": {
+                "games": options["games"],
+                "days": options["days"],
+                "repeat": options["repeat"],
+            },
+            "results": results,
+        }
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+import datetime
+
+from api import export
+
+
+class Command(BaseCommand):
+    help = "Writes a bulk export of the boardgames or their rank history to a file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=export.DATASETS)
+        parser.add_argument(
+            "--file-format", choices=list(export.FORMATS), default="ndjson"
+        )
+        parser.add_argument(
+            "--output",
+            help="File to write, named after the export by default.",
+        )
+        parser.add_argument(
+            "--start-date",
+            help="First day of rank history (YYYY-MM-DD), 30 days before the end.",
+        )
+        parser.add_argument(
+            "--end-date", help="Last day of rank history (YYYY-MM-DD), today."
+        )
+
+    def handle(self, *args, **options):
+        start_date = end_date = None
+        if options["dataset"] == "rank-history":
+            try:
+                end_date = (
+                    datetime.date.fromisoformat(options["end_date"])
+                    if options["end_date"]
+                    else datetime.date.today()
+                )
+                start_date = (
+                    datetime.date.fromisoformat(options["start_date"])
+                    if options["start_date"]
+                    else end_date - datetime.timedelta(days=30)
+                )
+            except ValueError as e:
+                raise CommandError("Use YYYY-MM-DD for dates.") from e
+
+        file_format = options["file_format"]
+        output = options["output"] or export.export_name(
+            options["dataset"], file_format, start_date, end_date
+        )
+        try:
+            export.write_export(
+                options["dataset"], file_format, output, start_date, end_date
+            )
+        except export.ExportError as e:
+            raise CommandError(str(e)) from e
+        self.stdout.write(f"Wrote {output}.")
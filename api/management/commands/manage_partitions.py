@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+import datetime
+
+from api import partitions
+
+
+class Command(BaseCommand):
+    help = "Creates upcoming monthly rank history partitions and detaches old ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=partitions.MONTHS_AHEAD,
+            help="Months to create after the current one.",
+        )
+        parser.add_argument(
+            "--detach-before",
+            help="Detach the partitions of all months before this date (YYYY-MM-DD).",
+        )
+
+    def handle(self, *args, **options):
+        partitions.ensure_partitions(ahead=options["ahead"])
+
+        if options["detach_before"]:
+            try:
+                before = datetime.date.fromisoformat(options["detach_before"])
+            except ValueError as e:
+                raise CommandError("Use YYYY-MM-DD for --detach-before.") from e
+            for name in partitions.detach_partitions(before):
+                self.stdout.write(f"Detached {name}.")
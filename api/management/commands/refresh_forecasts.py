@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+import logging
+
+from api.forecasts import refresh_forecasts
+from api.statistics import DEFAULT_MODEL, FORECAST_MODELS
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Recomputes the stored forecasts of all ranked boardgames."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model", choices=sorted(FORECAST_MODELS), default=DEFAULT_MODEL
+        )
+        parser.add_argument(
+            "--jobs", type=int, default=-1, help="Processes to fit in, -1 for all."
+        )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_forecasts(model=options["model"], n_jobs=options["jobs"])
+        logger.info("Stored forecasts for %s boardgames.", refreshed)
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from api.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Refreshes the weekly and monthly rank history rollups."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild all periods, e.g. after backfilling rank history.",
+        )
+
+    def handle(self, *args, **options):
+        refresh_rollups(full=options["full"])
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+import logging
+import time
+
+from api.forecast_jobs import run_pending_jobs
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Fits forecast jobs queued through the API (database job backend)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true", help="Exit when the queue is empty."
+        )
+        parser.add_argument(
+            "--interval", type=float, default=2.0, help="Seconds between polls."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_pending_jobs()
+            if processed:
+                logger.info("Processed %s forecast jobs.", processed)
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 import logging
 
+from api.ingest import after_ingest
 from api.scraper._update import download_zip, insert_games
 
 logger = logging.getLogger(__name__)
@@ -17,3 +18,5 @@ class Command(BaseCommand):
 
         logger.info("Inserted %s new boardgames.", len(new_games))
         logger.info("Updated %s existing boardgames.", updated_games)
+
+        after_ingest()
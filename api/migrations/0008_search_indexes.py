@@ -0,0 +1,89 @@
+# Generated by Django 6.0.9 on 2026-10-19 03:01
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0007_remove_boardgame_image_url_and_more"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="boardgame",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="ix_boardgame_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="boardgame",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector("name", config="simple"),
+                name="ix_boardgame_name_tsv",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="ix_category_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector("name", config="simple"),
+                name="ix_category_name_tsv",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="designer",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="ix_designer_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="designer",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector("name", config="simple"),
+                name="ix_designer_name_tsv",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="family",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="ix_family_name_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="family",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector("name", config="simple"),
+                name="ix_family_name_tsv",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mechanic",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="ix_mechanic_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mechanic",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector("name", config="simple"),
+                name="ix_mechanic_name_tsv",
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 6.0.9 on 2026-10-19 03:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0009_data_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Forecast",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("date", models.DateField()),
+                ("history_date", models.DateField()),
+                ("bgg_rank", models.IntegerField()),
+                ("bgg_rank_lower", models.FloatField()),
+                ("bgg_rank_upper", models.FloatField()),
+                ("bgg_average_rating", models.FloatField()),
+                ("bgg_average_rating_lower", models.FloatField()),
+                ("bgg_average_rating_upper", models.FloatField()),
+                ("bgg_geek_rating", models.FloatField()),
+                ("bgg_geek_rating_lower", models.FloatField()),
+                ("bgg_geek_rating_upper", models.FloatField()),
+                (
+                    "boardgame",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="forecasts",
+                        to="api.boardgame",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "forecasts",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("boardgame", "date"), name="uq_forecast_boardgame_date"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.9 on 2026-10-19 03:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0010_forecast"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="forecast",
+            name="uq_forecast_boardgame_date",
+        ),
+        migrations.AddField(
+            model_name="forecast",
+            name="model",
+            field=models.CharField(default="auto_arima", max_length=32),
+        ),
+        migrations.AddConstraint(
+            model_name="forecast",
+            constraint=models.UniqueConstraint(
+                fields=("boardgame", "model", "date"),
+                name="uq_forecast_boardgame_model_date",
+            ),
+        ),
+    ]
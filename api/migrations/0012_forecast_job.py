@@ -0,0 +1,64 @@
+# Generated by Django 6.0.9 on 2026-10-19 03:12
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0011_forecast_model"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ForecastJob",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("model", models.CharField(max_length=32)),
+                ("history_date", models.DateField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        max_length=16,
+                    ),
+                ),
+                ("error", models.TextField(blank=True, default="")),
+                (
+                    "boardgame",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="forecast_jobs",
+                        to="api.boardgame",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "forecast_jobs",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("boardgame", "model", "history_date"),
+                        name="uq_forecastjob_boardgame_model_history",
+                    )
+                ],
+            },
+        ),
+    ]
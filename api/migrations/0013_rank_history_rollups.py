@@ -0,0 +1,109 @@
+# Generated by Django 6.0.9 on 2026-10-19 03:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0012_forecast_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RankHistoryMonthly",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("period", models.DateField()),
+                ("last_date", models.DateField()),
+                ("entries", models.PositiveIntegerField()),
+                ("bgg_rank_min", models.IntegerField(blank=True, null=True)),
+                ("bgg_rank_max", models.IntegerField(blank=True, null=True)),
+                ("bgg_rank_mean", models.FloatField(blank=True, null=True)),
+                ("bgg_rank_last", models.IntegerField(blank=True, null=True)),
+                ("bgg_geek_rating_min", models.FloatField(blank=True, null=True)),
+                ("bgg_geek_rating_max", models.FloatField(blank=True, null=True)),
+                ("bgg_geek_rating_mean", models.FloatField(blank=True, null=True)),
+                ("bgg_geek_rating_last", models.FloatField(blank=True, null=True)),
+                ("bgg_average_rating_min", models.FloatField(blank=True, null=True)),
+                ("bgg_average_rating_max", models.FloatField(blank=True, null=True)),
+                ("bgg_average_rating_mean", models.FloatField(blank=True, null=True)),
+                ("bgg_average_rating_last", models.FloatField(blank=True, null=True)),
+                (
+                    "boardgame",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="api.boardgame",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "rank_history_monthly",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("boardgame", "period"),
+                        name="uq_rankhistorymonthly_period",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="RankHistoryWeekly",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("period", models.DateField()),
+                ("last_date", models.DateField()),
+                ("entries", models.PositiveIntegerField()),
+                ("bgg_rank_min", models.IntegerField(blank=True, null=True)),
+                ("bgg_rank_max", models.IntegerField(blank=True, null=True)),
+                ("bgg_rank_mean", models.FloatField(blank=True, null=True)),
+                ("bgg_rank_last", models.IntegerField(blank=True, null=True)),
+                ("bgg_geek_rating_min", models.FloatField(blank=True, null=True)),
+                ("bgg_geek_rating_max", models.FloatField(blank=True, null=True)),
+                ("bgg_geek_rating_mean", models.FloatField(blank=True, null=True)),
+                ("bgg_geek_rating_last", models.FloatField(blank=True, null=True)),
+                ("bgg_average_rating_min", models.FloatField(blank=True, null=True)),
+                ("bgg_average_rating_max", models.FloatField(blank=True, null=True)),
+                ("bgg_average_rating_mean", models.FloatField(blank=True, null=True)),
+                ("bgg_average_rating_last", models.FloatField(blank=True, null=True)),
+                (
+                    "boardgame",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="api.boardgame",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "rank_history_weekly",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("boardgame", "period"),
+                        name="uq_rankhistoryweekly_period",
+                    )
+                ],
+            },
+        ),
+    ]
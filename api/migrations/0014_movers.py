@@ -0,0 +1,82 @@
+# Generated by Django 6.0.9 on 2026-10-19 03:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0013_rank_history_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Mover",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("days", models.PositiveSmallIntegerField()),
+                ("compare_to", models.DateField()),
+                ("past_rank", models.IntegerField(blank=True, null=True)),
+                ("past_geek_rating", models.FloatField(blank=True, null=True)),
+                ("past_avg_rating", models.FloatField(blank=True, null=True)),
+                ("bgg_rank_change", models.IntegerField(blank=True, null=True)),
+                ("bgg_geek_rating_change", models.FloatField(blank=True, null=True)),
+                ("bgg_average_rating_change", models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "movers",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="rankhistory",
+            index=models.Index(
+                fields=["date", "boardgame"],
+                include=("bgg_rank", "bgg_geek_rating", "bgg_average_rating"),
+                name="ix_rankhistory_date_boardgame",
+            ),
+        ),
+        migrations.AddField(
+            model_name="mover",
+            name="boardgame",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="movers",
+                to="api.boardgame",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mover",
+            index=models.Index(
+                fields=["days", "bgg_rank_change"], name="ix_mover_days_rank"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mover",
+            index=models.Index(
+                fields=["days", "bgg_geek_rating_change"], name="ix_mover_days_geek"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mover",
+            index=models.Index(
+                fields=["days", "bgg_average_rating_change"],
+                name="ix_mover_days_average",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="mover",
+            constraint=models.UniqueConstraint(
+                fields=("days", "boardgame"), name="uq_mover_days_boardgame"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.9 on 2026-10-19 03:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0014_movers"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="rankhistory",
+            index=models.Index(
+                fields=["date", "bgg_rank"], name="ix_rankhistory_date_rank"
+            ),
+        ),
+    ]
@@ -0,0 +1,149 @@
+"""Store rank_history in monthly range partitions on ``date``.
+
+Postgres requires the partition key in the primary key, so the table's key
+becomes ``(id, date)``. Django keeps treating ``id`` as the primary key, it
+stays unique through the table's sequence. Later partitions are created by
+``api.partitions``.
+"""
+
+import datetime
+
+from django.db import migrations
+
+TABLE = "rank_history"
+COLUMNS = (
+    "id, created_at, updated_at, date, bgg_rank, bgg_geek_rating, "
+    "bgg_average_rating, boardgame_id"
+)
+MONTHS_AHEAD = 3
+
+
+def _next_month(month: datetime.date) -> datetime.date:
+    return (month + datetime.timedelta(days=32)).replace(day=1)
+
+
+def _secondary_objects(cursor) -> tuple[list, list]:
+    """Return names and definitions of the indexes and foreign keys of TABLE."""
+    cursor.execute(
+        """
+        SELECT indexname, indexdef FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = %s
+        AND indexname NOT IN (
+            SELECT conname FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = 'p'
+        )
+        """,
+        [TABLE, TABLE],
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype = 'f'
+        """,
+        [TABLE],
+    )
+    return indexes, cursor.fetchall()
+
+
+def _rebuild(schema_editor, create_sql: str, partitioned: bool) -> None:
+    """Move TABLE's rows into a new table created by ``create_sql``."""
+    with schema_editor.connection.cursor() as cursor:
+        indexes, foreign_keys = _secondary_objects(cursor)
+
+        # Free the names of the old table's constraints and indexes.
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {TABLE}_old")
+        cursor.execute(
+            f"ALTER TABLE {TABLE}_old RENAME CONSTRAINT {TABLE}_pkey TO {TABLE}_old_pkey"
+        )
+        for name, _ in foreign_keys:
+            cursor.execute(f'ALTER TABLE {TABLE}_old DROP CONSTRAINT "{name}"')
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX "{name}"')
+
+        cursor.execute(create_sql)
+        if partitioned:
+            cursor.execute(f"SELECT min(date) FROM {TABLE}_old")
+            first = cursor.fetchone()[0] or datetime.date.today()
+            month = first.replace(day=1)
+            last = datetime.date.today().replace(day=1)
+            for _ in range(MONTHS_AHEAD):
+                last = _next_month(last)
+            while month <= last:
+                cursor.execute(
+                    f"CREATE TABLE {TABLE}_{month:%Y_%m} PARTITION OF {TABLE} "
+                    f"FOR VALUES FROM ('{month}') TO ('{_next_month(month)}')"
+                )
+                month = _next_month(month)
+
+        cursor.execute(
+            f"INSERT INTO {TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {TABLE}_old"
+        )
+        # Drops the old table's sequence along with it.
+        cursor.execute(f"DROP TABLE {TABLE}_old")
+
+        if partitioned:
+            cursor.execute(f"CREATE SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+            cursor.execute(
+                f"ALTER TABLE {TABLE} ALTER COLUMN id "
+                f"SET DEFAULT nextval('{TABLE}_id_seq')"
+            )
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), "
+            f"coalesce(max(id), 0) + 1, false) FROM {TABLE}"
+        )
+
+        for _, definition in indexes:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT "{name}" {definition}')
+
+
+def partition(apps, schema_editor):
+    _rebuild(
+        schema_editor,
+        f"""
+        CREATE TABLE {TABLE} (
+            id bigint NOT NULL,
+            created_at timestamp with time zone NOT NULL,
+            updated_at timestamp with time zone NOT NULL,
+            date date NOT NULL,
+            bgg_rank integer NULL,
+            bgg_geek_rating double precision NULL,
+            bgg_average_rating double precision NULL,
+            boardgame_id bigint NOT NULL,
+            CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, date)
+        ) PARTITION BY RANGE (date)
+        """,
+        partitioned=True,
+    )
+
+
+def unpartition(apps, schema_editor):
+    _rebuild(
+        schema_editor,
+        f"""
+        CREATE TABLE {TABLE} (
+            id bigint GENERATED BY DEFAULT AS IDENTITY,
+            created_at timestamp with time zone NOT NULL,
+            updated_at timestamp with time zone NOT NULL,
+            date date NOT NULL,
+            bgg_rank integer NULL,
+            bgg_geek_rating double precision NULL,
+            bgg_average_rating double precision NULL,
+            boardgame_id bigint NOT NULL,
+            CONSTRAINT {TABLE}_pkey PRIMARY KEY (id)
+        )
+        """,
+        partitioned=False,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0015_rank_history_date_rank"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition, elidable=False),
+    ]
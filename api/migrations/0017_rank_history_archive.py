@@ -0,0 +1,50 @@
+# Generated by Django 6.0.9 on 2026-10-19 03:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0016_partition_rank_history"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RankHistoryArchive",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("year", models.PositiveSmallIntegerField()),
+                ("days", models.BinaryField()),
+                ("ranks", models.BinaryField()),
+                ("geek_ratings", models.BinaryField()),
+                ("average_ratings", models.BinaryField()),
+                (
+                    "boardgame",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rank_history_archive",
+                        to="api.boardgame",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "rank_history_archive",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("boardgame", "year"), name="uq_rankhistoryarchive_year"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 6.0.9 on 2026-10-19 03:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0017_rank_history_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("kind", models.CharField(max_length=16)),
+                ("object_id", models.BigIntegerField()),
+                ("bgg_id", models.IntegerField()),
+            ],
+            options={
+                "db_table": "tombstones",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="boardgame",
+            index=models.Index(
+                fields=["updated_at", "id"], name="ix_boardgame_updated"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(fields=["updated_at", "id"], name="ix_category_updated"),
+        ),
+        migrations.AddIndex(
+            model_name="designer",
+            index=models.Index(fields=["updated_at", "id"], name="ix_designer_updated"),
+        ),
+        migrations.AddIndex(
+            model_name="family",
+            index=models.Index(fields=["updated_at", "id"], name="ix_family_updated"),
+        ),
+        migrations.AddIndex(
+            model_name="mechanic",
+            index=models.Index(fields=["updated_at", "id"], name="ix_mechanic_updated"),
+        ),
+        migrations.AddIndex(
+            model_name="rankhistory",
+            index=models.Index(
+                fields=["updated_at", "id"], name="ix_rankhistory_updated"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(
+                fields=["updated_at", "id"], name="ix_tombstone_updated"
+            ),
+        ),
+    ]
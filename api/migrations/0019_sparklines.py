@@ -0,0 +1,42 @@
+# Generated by Django 6.0.9 on 2026-10-19 03:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0018_change_feed"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Sparkline",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("end_date", models.DateField()),
+                ("ranks", models.BinaryField()),
+                (
+                    "boardgame",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sparkline",
+                        to="api.boardgame",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "sparklines",
+            },
+        ),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 6.0.9 on 2026-10-19 03:44
+
+from django.db import migrations, models
+
+# The link tables of the taxonomy relations are created by Django, so their
+# indexes by taxonomy are added here instead of in Meta.indexes. They cover
+# the probe of whether a game belongs to a taxonomy while games are walked in
+# rank order.
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0019_sparklines"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="best_rank",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="game_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="mean_average_rating",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="mean_geek_rating",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="designer",
+            name="best_rank",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="designer",
+            name="game_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="designer",
+            name="mean_average_rating",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="designer",
+            name="mean_geek_rating",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="family",
+            name="best_rank",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="family",
+            name="game_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="family",
+            name="mean_average_rating",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="family",
+            name="mean_geek_rating",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="mechanic",
+            name="best_rank",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="mechanic",
+            name="game_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="mechanic",
+            name="mean_average_rating",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="mechanic",
+            name="mean_geek_rating",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunSQL(
+            "CREATE INDEX ix_boardgames_categories_category_boardgame "
+            "ON boardgames_categories (category_id, boardgame_id)",
+            "DROP INDEX ix_boardgames_categories_category_boardgame",
+        ),
+        migrations.RunSQL(
+            "CREATE INDEX ix_boardgames_designers_designer_boardgame "
+            "ON boardgames_designers (designer_id, boardgame_id)",
+            "DROP INDEX ix_boardgames_designers_designer_boardgame",
+        ),
+        migrations.RunSQL(
+            "CREATE INDEX ix_boardgames_families_family_boardgame "
+            "ON boardgames_families (family_id, boardgame_id)",
+            "DROP INDEX ix_boardgames_families_family_boardgame",
+        ),
+        migrations.RunSQL(
+            "CREATE INDEX ix_boardgames_mechanics_mechanic_boardgame "
+            "ON boardgames_mechanics (mechanic_id, boardgame_id)",
+            "DROP INDEX ix_boardgames_mechanics_mechanic_boardgame",
+        ),
+    ]
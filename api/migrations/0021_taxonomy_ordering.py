@@ -0,0 +1,152 @@
+# Generated by Django 6.0.9 on 2026-10-19 03:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0020_taxonomy_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="mean_trend",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="designer",
+            name="mean_trend",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="family",
+            name="mean_trend",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="mechanic",
+            name="mean_trend",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("game_count"), descending=True, nulls_last=True
+                ),
+                models.F("id"),
+                name="ix_category_game_count",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("mean_geek_rating"), descending=True, nulls_last=True
+                ),
+                models.F("id"),
+                name="ix_category_mean_geek_rating",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("mean_trend"), descending=True, nulls_last=True
+                ),
+                models.F("id"),
+                name="ix_category_mean_trend",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="designer",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("game_count"), descending=True, nulls_last=True
+                ),
+                models.F("id"),
+                name="ix_designer_game_count",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="designer",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("mean_geek_rating"), descending=True, nulls_last=True
+                ),
+                models.F("id"),
+                name="ix_designer_mean_geek_rating",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="designer",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("mean_trend"), descending=True, nulls_last=True
+                ),
+                models.F("id"),
+                name="ix_designer_mean_trend",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="family",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("game_count"), descending=True, nulls_last=True
+                ),
+                models.F("id"),
+                name="ix_family_game_count",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="family",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("mean_geek_rating"), descending=True, nulls_last=True
+                ),
+                models.F("id"),
+                name="ix_family_mean_geek_rating",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="family",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("mean_trend"), descending=True, nulls_last=True
+                ),
+                models.F("id"),
+                name="ix_family_mean_trend",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mechanic",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("game_count"), descending=True, nulls_last=True
+                ),
+                models.F("id"),
+                name="ix_mechanic_game_count",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mechanic",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("mean_geek_rating"), descending=True, nulls_last=True
+                ),
+                models.F("id"),
+                name="ix_mechanic_mean_geek_rating",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mechanic",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("mean_trend"), descending=True, nulls_last=True
+                ),
+                models.F("id"),
+                name="ix_mechanic_mean_trend",
+            ),
+        ),
+    ]
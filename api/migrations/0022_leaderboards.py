@@ -0,0 +1,44 @@
+# Generated by Django 6.0.9 on 2026-10-19 03:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0021_taxonomy_ordering"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Leaderboard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("direction", models.CharField(max_length=16)),
+                ("days", models.PositiveSmallIntegerField()),
+                ("scope", models.CharField(max_length=16)),
+                ("scope_id", models.IntegerField()),
+                ("compare_to", models.DateField()),
+                ("boardgames", models.BinaryField()),
+                ("scores", models.BinaryField()),
+            ],
+            options={
+                "db_table": "leaderboards",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("direction", "days", "scope", "scope_id"),
+                        name="uq_leaderboard_board",
+                    )
+                ],
+            },
+        ),
+    ]
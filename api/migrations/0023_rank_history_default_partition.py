@@ -0,0 +1,54 @@
+"""Add a DEFAULT partition to rank_history.
+
+Without it, rows of a month that has no partition yet, e.g. seeded or
+backfilled history or the first ingest after a long gap, fail to insert.
+``api.partitions.ensure_partitions`` moves such rows into monthly partitions.
+"""
+
+import datetime
+
+from django.db import migrations
+
+TABLE = "rank_history"
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def _next_month(month: datetime.date) -> datetime.date:
+    return (month + datetime.timedelta(days=32)).replace(day=1)
+
+
+def add_default_partition(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"
+        )
+
+
+def remove_default_partition(apps, schema_editor):
+    """Give the rows of the default partition monthly partitions, then drop it."""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+        cursor.execute(
+            "SELECT DISTINCT date_trunc('month', date)::date "
+            f"FROM {DEFAULT_PARTITION} ORDER BY 1"
+        )
+        for (month,) in cursor.fetchall():
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {TABLE}_{month:%Y_%m} "
+                f"PARTITION OF {TABLE} "
+                f"FOR VALUES FROM ('{month}') TO ('{_next_month(month)}')"
+            )
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {DEFAULT_PARTITION}")
+        cursor.execute(f"DROP TABLE {DEFAULT_PARTITION}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0022_leaderboards"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            add_default_partition, remove_default_partition, elidable=False
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 6.0.9 on 2026-10-19 04:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0023_rank_history_default_partition"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                models.OrderBy(models.F("game_count"), nulls_last=True),
+                models.F("id"),
+                name="ix_category_games_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                models.OrderBy(models.F("mean_geek_rating"), nulls_last=True),
+                models.F("id"),
+                name="ix_category_geek_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                models.OrderBy(models.F("mean_trend"), nulls_last=True),
+                models.F("id"),
+                name="ix_category_trend_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="designer",
+            index=models.Index(
+                models.OrderBy(models.F("game_count"), nulls_last=True),
+                models.F("id"),
+                name="ix_designer_games_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="designer",
+            index=models.Index(
+                models.OrderBy(models.F("mean_geek_rating"), nulls_last=True),
+                models.F("id"),
+                name="ix_designer_geek_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="designer",
+            index=models.Index(
+                models.OrderBy(models.F("mean_trend"), nulls_last=True),
+                models.F("id"),
+                name="ix_designer_trend_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="family",
+            index=models.Index(
+                models.OrderBy(models.F("game_count"), nulls_last=True),
+                models.F("id"),
+                name="ix_family_games_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="family",
+            index=models.Index(
+                models.OrderBy(models.F("mean_geek_rating"), nulls_last=True),
+                models.F("id"),
+                name="ix_family_geek_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="family",
+            index=models.Index(
+                models.OrderBy(models.F("mean_trend"), nulls_last=True),
+                models.F("id"),
+                name="ix_family_trend_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mechanic",
+            index=models.Index(
+                models.OrderBy(models.F("game_count"), nulls_last=True),
+                models.F("id"),
+                name="ix_mechanic_games_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mechanic",
+            index=models.Index(
+                models.OrderBy(models.F("mean_geek_rating"), nulls_last=True),
+                models.F("id"),
+                name="ix_mechanic_geek_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mechanic",
+            index=models.Index(
+                models.OrderBy(models.F("mean_trend"), nulls_last=True),
+                models.F("id"),
+                name="ix_mechanic_trend_asc",
+            ),
+        ),
+    ]
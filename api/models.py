@@ -1,6 +1,48 @@
+import uuid
 from typing import ClassVar
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.db import models
+from django.db.models import F
+
+
+def name_search_indexes(prefix: str) -> list[models.Index]:
+    """Trigram and full-text GIN indexes on ``name`` used by the search view."""
+    return [
+        GinIndex(
+            fields=["name"], name=f"ix_{prefix}_name_trgm", opclasses=["gin_trgm_ops"]
+        ),
+        GinIndex(SearchVector("name", config="simple"), name=f"ix_{prefix}_name_tsv"),
+    ]
+
+
+def change_feed_index(prefix: str) -> models.Index:
+    """Index on ``(updated_at, id)`` walked by the ``/changes/`` feed."""
+    return models.Index(fields=["updated_at", "id"], name=f"ix_{prefix}_updated")
+
+
+def taxonomy_ordering_indexes(prefix: str) -> list[models.Index]:
+    """Indexes on the aggregates taxonomy lists are sorted by, in both orders.
+
+    Nulls sort last either way, matching ``TaxonomyViewSet.list``.
+    """
+    # Short names keep the ascending index names within 30 characters.
+    fields = {"game_count": "games", "mean_geek_rating": "geek", "mean_trend": "trend"}
+    return [
+        *(
+            models.Index(
+                F(field).desc(nulls_last=True), F("id"), name=f"ix_{prefix}_{field}"
+            )
+            for field in fields
+        ),
+        *(
+            models.Index(
+                F(field).asc(nulls_last=True), F("id"), name=f"ix_{prefix}_{short}_asc"
+            )
+            for field, short in fields.items()
+        ),
+    ]
 
 
 class BaseModel(models.Model):
@@ -11,49 +53,86 @@ class BaseModel(models.Model):
         abstract = True
 
 
-class Category(BaseModel):
+class Taxonomy(BaseModel):
+    """Category, designer, family or mechanic grouping boardgames.
+
+    The aggregates of its games are refreshed after every ingest by
+    :func:`api.taxonomies.refresh_taxonomy_stats`.
+    """
+
+    game_count = models.PositiveIntegerField(default=0)
+    best_rank = models.IntegerField(null=True, blank=True)
+    mean_geek_rating = models.FloatField(null=True, blank=True)
+    mean_average_rating = models.FloatField(null=True, blank=True)
+    mean_trend = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
+
+
+class Category(Taxonomy):
     name = models.CharField(max_length=255)
     bgg_id = models.IntegerField(unique=True, db_index=True)
     type = models.CharField(max_length=50, default="category")
 
     class Meta:
         db_table = "categories"
+        indexes: ClassVar[list[models.Index]] = [
+            *name_search_indexes("category"),
+            change_feed_index("category"),
+            *taxonomy_ordering_indexes("category"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover - simple repr
         return self.name
 
 
-class Designer(BaseModel):
+class Designer(Taxonomy):
     name = models.CharField(max_length=255)
     bgg_id = models.IntegerField(unique=True, db_index=True)
     type = models.CharField(max_length=50, default="designer")
 
     class Meta:
         db_table = "designers"
+        indexes: ClassVar[list[models.Index]] = [
+            *name_search_indexes("designer"),
+            change_feed_index("designer"),
+            *taxonomy_ordering_indexes("designer"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return self.name
 
 
-class Family(BaseModel):
+class Family(Taxonomy):
     name = models.CharField(max_length=255)
     bgg_id = models.IntegerField(unique=True, db_index=True)
     type = models.CharField(max_length=50, default="family")
 
     class Meta:
         db_table = "families"
+        indexes: ClassVar[list[models.Index]] = [
+            *name_search_indexes("family"),
+            change_feed_index("family"),
+            *taxonomy_ordering_indexes("family"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return self.name
 
 
-class Mechanic(BaseModel):
+class Mechanic(Taxonomy):
     name = models.CharField(max_length=255)
     bgg_id = models.IntegerField(unique=True, db_index=True)
     type = models.CharField(max_length=50, default="mechanic")
 
     class Meta:
         db_table = "mechanics"
+        indexes: ClassVar[list[models.Index]] = [
+            *name_search_indexes("mechanic"),
+            change_feed_index("mechanic"),
+            *taxonomy_ordering_indexes("mechanic"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return self.name
@@ -94,12 +173,21 @@ class Boardgame(BaseModel):
 
     class Meta:
         db_table = "boardgames"
+        indexes: ClassVar[list[models.Index]] = [
+            *name_search_indexes("boardgame"),
+            change_feed_index("boardgame"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return self.name
 
 
 class RankHistory(BaseModel):
+    """Daily rank and ratings of a boardgame.
+
+    The table is partitioned by month on ``date``, see :mod:`api.partitions`.
+    """
+
     date = models.DateField(db_index=True)
     boardgame = models.ForeignKey(
         Boardgame, on_delete=models.CASCADE, related_name="bgg_rank_history"
@@ -113,13 +201,298 @@ class RankHistory(BaseModel):
         indexes: ClassVar[list[models.Index]] = [
             models.Index(
                 fields=["boardgame", "date"], name="ix_rankhistory_boardgame_date"
-            )
+            ),
+            # Covers the join of one comparison day onto the whole catalog
+            models.Index(
+                fields=["date", "boardgame"],
+                include=["bgg_rank", "bgg_geek_rating", "bgg_average_rating"],
+                name="ix_rankhistory_date_boardgame",
+            ),
+            # One day's ranking in rank order, for point-in-time snapshots
+            models.Index(fields=["date", "bgg_rank"], name="ix_rankhistory_date_rank"),
+            change_feed_index("rankhistory"),
         ]
 
     def __str__(self) -> str:
         return f"{self.boardgame} on {self.date}"
 
 
+class RankHistoryArchive(BaseModel):
+    """Cold rank history of one boardgame and year, packed into arrays.
+
+    The arrays hold one little-endian value per day with history, see
+    :mod:`api.archive` for the encoding.
+    """
+
+    boardgame = models.ForeignKey(
+        Boardgame, on_delete=models.CASCADE, related_name="rank_history_archive"
+    )
+    year = models.PositiveSmallIntegerField()
+    # uint16 day of the year, starting at 0
+    days = models.BinaryField()
+    # int32, 0 for no rank
+    ranks = models.BinaryField()
+    # float32, NaN for no rating
+    geek_ratings = models.BinaryField()
+    average_ratings = models.BinaryField()
+
+    class Meta:
+        db_table = "rank_history_archive"
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=["boardgame", "year"], name="uq_rankhistoryarchive_year"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.boardgame} in {self.year}"
+
+
+class RankHistoryRollup(BaseModel):
+    """Aggregates of a boardgame's rank history over one calendar period."""
+
+    boardgame = models.ForeignKey(Boardgame, on_delete=models.CASCADE, related_name="+")
+    # First day of the period
+    period = models.DateField()
+    # Latest day in the period with rank history
+    last_date = models.DateField()
+    entries = models.PositiveIntegerField()
+    bgg_rank_min = models.IntegerField(null=True, blank=True)
+    bgg_rank_max = models.IntegerField(null=True, blank=True)
+    bgg_rank_mean = models.FloatField(null=True, blank=True)
+    bgg_rank_last = models.IntegerField(null=True, blank=True)
+    bgg_geek_rating_min = models.FloatField(null=True, blank=True)
+    bgg_geek_rating_max = models.FloatField(null=True, blank=True)
+    bgg_geek_rating_mean = models.FloatField(null=True, blank=True)
+    bgg_geek_rating_last = models.FloatField(null=True, blank=True)
+    bgg_average_rating_min = models.FloatField(null=True, blank=True)
+    bgg_average_rating_max = models.FloatField(null=True, blank=True)
+    bgg_average_rating_mean = models.FloatField(null=True, blank=True)
+    bgg_average_rating_last = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self) -> str:
+        return f"{self.boardgame} in {self.period}"
+
+
+class RankHistoryWeekly(RankHistoryRollup):
+    class Meta:
+        db_table = "rank_history_weekly"
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=["boardgame", "period"], name="uq_rankhistoryweekly_period"
+            )
+        ]
+
+
+class RankHistoryMonthly(RankHistoryRollup):
+    class Meta:
+        db_table = "rank_history_monthly"
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=["boardgame", "period"], name="uq_rankhistorymonthly_period"
+            )
+        ]
+
+
+class Mover(BaseModel):
+    """Change of a boardgame's rank and ratings over one of :attr:`PERIODS`.
+
+    Rebuilt after every ingest, so sorting the catalog by change is an index
+    scan instead of a comparison against the rank history.
+    """
+
+    PERIODS: ClassVar[tuple[int, ...]] = (1, 7, 30)
+
+    boardgame = models.ForeignKey(
+        Boardgame, on_delete=models.CASCADE, related_name="movers"
+    )
+    days = models.PositiveSmallIntegerField()
+    compare_to = models.DateField()
+    past_rank = models.IntegerField(null=True, blank=True)
+    past_geek_rating = models.FloatField(null=True, blank=True)
+    past_avg_rating = models.FloatField(null=True, blank=True)
+    bgg_rank_change = models.IntegerField(null=True, blank=True)
+    bgg_geek_rating_change = models.FloatField(null=True, blank=True)
+    bgg_average_rating_change = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        db_table = "movers"
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=["days", "boardgame"], name="uq_mover_days_boardgame"
+            )
+        ]
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["days", "bgg_rank_change"], name="ix_mover_days_rank"),
+            models.Index(
+                fields=["days", "bgg_geek_rating_change"], name="ix_mover_days_geek"
+            ),
+            models.Index(
+                fields=["days", "bgg_average_rating_change"],
+                name="ix_mover_days_average",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.boardgame} over {self.days} days"
+
+
+class Sparkline(BaseModel):
+    """Packed daily ranks of a boardgame over the last days before an ingest.
+
+    Rebuilt after every ingest, see :mod:`api.sparklines` for the encoding.
+    """
+
+    boardgame = models.OneToOneField(
+        Boardgame, on_delete=models.CASCADE, related_name="sparkline"
+    )
+    # Last day of the sparkline, the latest day with rank history
+    end_date = models.DateField()
+    # int16 rank deltas, one per day
+    ranks = models.BinaryField()
+
+    class Meta:
+        db_table = "sparklines"
+
+    def __str__(self) -> str:
+        return f"Sparkline of {self.boardgame} until {self.end_date}"
+
+
+class Leaderboard(BaseModel):
+    """Games rising or falling the most in rank over one window and scope.
+
+    Rebuilt after every ingest, see :mod:`api.leaderboards` for how boards
+    are ranked and encoded.
+    """
+
+    DIRECTIONS: ClassVar[tuple[str, ...]] = ("trending", "declining")
+    WINDOWS: ClassVar[tuple[int, ...]] = (7, 30, 90)
+    SCOPES: ClassVar[tuple[str, ...]] = ("overall", "category", "mechanic", "designer")
+
+    direction = models.CharField(max_length=16)
+    days = models.PositiveSmallIntegerField()
+    scope = models.CharField(max_length=16)
+    # bgg_id of the category, mechanic or designer, 0 for the overall boards
+    scope_id = models.IntegerField()
+    compare_to = models.DateField()
+    # int32 boardgame ids, best first
+    boardgames = models.BinaryField()
+    # float32 rank changes in percent of the past rank, one per game
+    scores = models.BinaryField()
+
+    class Meta:
+        db_table = "leaderboards"
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=["direction", "days", "scope", "scope_id"],
+                name="uq_leaderboard_board",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.direction} {self.scope} {self.scope_id} over {self.days} days"
+
+
+class Forecast(BaseModel):
+    """One day of a stored rank and rating forecast for a boardgame."""
+
+    boardgame = models.ForeignKey(
+        Boardgame, on_delete=models.CASCADE, related_name="forecasts"
+    )
+    model = models.CharField(max_length=32, default="auto_arima")
+    date = models.DateField()
+    # Last day of rank history the forecast was fitted on
+    history_date = models.DateField()
+    bgg_rank = models.IntegerField()
+    bgg_rank_lower = models.FloatField()
+    bgg_rank_upper = models.FloatField()
+    bgg_average_rating = models.FloatField()
+    bgg_average_rating_lower = models.FloatField()
+    bgg_average_rating_upper = models.FloatField()
+    bgg_geek_rating = models.FloatField()
+    bgg_geek_rating_lower = models.FloatField()
+    bgg_geek_rating_upper = models.FloatField()
+
+    class Meta:
+        db_table = "forecasts"
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=["boardgame", "model", "date"],
+                name="uq_forecast_boardgame_model_date",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"Forecast for {self.boardgame} on {self.date}"
+
+
+class ForecastJob(BaseModel):
+    """Forecast fit requested through the API and run outside the web worker.
+
+    Requests for the same game, model and history share one job.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    boardgame = models.ForeignKey(
+        Boardgame, on_delete=models.CASCADE, related_name="forecast_jobs"
+    )
+    model = models.CharField(max_length=32)
+    # Last day of rank history the job fits on
+    history_date = models.DateField()
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.PENDING, db_index=True
+    )
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        db_table = "forecast_jobs"
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=["boardgame", "model", "history_date"],
+                name="uq_forecastjob_boardgame_model_history",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.model} forecast job for {self.boardgame} ({self.status})"
+
+
+class Tombstone(BaseModel):
+    """Record of a deleted boardgame or taxonomy entry for the change feed."""
+
+    kind = models.CharField(max_length=16)
+    object_id = models.BigIntegerField()
+    bgg_id = models.IntegerField()
+
+    class Meta:
+        db_table = "tombstones"
+        indexes: ClassVar[list[models.Index]] = [change_feed_index("tombstone")]
+
+    def __str__(self) -> str:
+        return f"Deleted {self.kind} {self.object_id}"
+
+
+class DataVersion(BaseModel):
+    """Single row counting the ingests, used to key cached responses."""
+
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        db_table = "data_version"
+
+    def __str__(self) -> str:
+        return f"Data version {self.version}"
+
+
 # JSON network and graph storage
 class BoardgameNetwork(BaseModel):
     nodes = models.JSONField()
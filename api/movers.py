@@ -0,0 +1,55 @@
+"""Rank and rating changes of every boardgame over fixed periods.
+
+:func:`refresh_movers` rebuilds the ``movers`` table after every ingest by
+comparing the current values of each game with its rank history
+``Mover.PERIODS`` days before the latest ingest.
+"""
+
+import datetime
+import logging
+
+from django.db import connection, transaction
+from django.db.models import Max
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+_MOVER_TABLE = models.Mover._meta.db_table  # noqa: SLF001
+_BOARDGAME_TABLE = models.Boardgame._meta.db_table  # noqa: SLF001
+_HISTORY_TABLE = models.RankHistory._meta.db_table  # noqa: SLF001
+
+_INSERT_SQL = f"""
+    INSERT INTO {_MOVER_TABLE} (
+        created_at, updated_at, boardgame_id, days, compare_to,
+        past_rank, past_geek_rating, past_avg_rating,
+        bgg_rank_change, bgg_geek_rating_change, bgg_average_rating_change
+    )
+    SELECT
+        now(), now(), b.id, %s, h.date,
+        h.bgg_rank, h.bgg_geek_rating, h.bgg_average_rating,
+        h.bgg_rank - b.bgg_rank,
+        b.bgg_geek_rating - h.bgg_geek_rating,
+        b.bgg_average_rating - h.bgg_average_rating
+    FROM {_BOARDGAME_TABLE} b
+    JOIN {_HISTORY_TABLE} h
+        ON h.boardgame_id = b.id AND h.date = %s
+"""
+
+
+def latest_history_date() -> datetime.date | None:
+    return models.RankHistory.objects.aggregate(latest=Max("date"))["latest"]
+
+
+def refresh_movers() -> None:
+    """Recompute the changes of all boardgames for every period."""
+    latest = latest_history_date()
+    if latest is None:
+        return
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        models.Mover.objects.all().delete()
+        for days in models.Mover.PERIODS:
+            compare_to = latest - datetime.timedelta(days=days)
+            cursor.execute(_INSERT_SQL, [days, compare_to])
+            logger.info("Stored %s movers over %s days.", cursor.rowcount, days)
@@ -0,0 +1,37 @@
+from django.core.paginator import Paginator
+from drf_link_header_pagination import (
+    LinkHeaderCursorPagination,
+    LinkHeaderPagination,
+)
+
+
+class AsOfRankPagination(LinkHeaderCursorPagination):
+    """Keyset pagination over the ranking of one day.
+
+    Each page continues after the last rank of the previous one instead of
+    skipping rows with OFFSET, so every page costs only its own rows.
+    """
+
+    ordering = "as_of_rank"
+
+
+class CountedPaginator(Paginator):
+    """Paginator that takes the number of rows instead of counting them."""
+
+    def __init__(self, object_list, per_page, count: int | None = None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.count = count
+
+
+class KnownCountPagination(LinkHeaderPagination):
+    """Page number pagination that skips COUNT(*) when the count is known.
+
+    Views set ``count`` before paginating, e.g. to a precomputed aggregate.
+    Left at None, the queryset is counted as usual.
+    """
+
+    count: int | None = None
+
+    def django_paginator_class(self, object_list, per_page):
+        return CountedPaginator(object_list, per_page, count=self.count)
@@ -0,0 +1,154 @@
+"""Monthly partitions of the ``rank_history`` table.
+
+The table is range partitioned on ``date`` (see migration 0016), one
+partition per month named ``rank_history_YYYY_MM``. Rows of months without
+a partition, e.g. from backfills or after a long ingest gap, land in the
+``rank_history_default`` partition. :func:`ensure_partitions` runs after
+every ingest, keeps ``MONTHS_AHEAD`` months in reserve and moves the rows of
+the default partition into partitions of their own. Old months can be
+detached into standalone tables or dropped once archived, see
+:mod:`api.archive`.
+"""
+
+import datetime
+import logging
+
+from django.db import connection, transaction
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+TABLE = models.RankHistory._meta.db_table  # noqa: SLF001
+DEFAULT_PARTITION = f"{TABLE}_default"
+MONTHS_AHEAD = 3
+
+
+def next_month(month: datetime.date) -> datetime.date:
+    return (month + datetime.timedelta(days=32)).replace(day=1)
+
+
+def partition_name(month: datetime.date) -> str:
+    return f"{TABLE}_{month:%Y_%m}"
+
+
+def list_partitions() -> list[datetime.date]:
+    """Return the first days of the months attached as partitions."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass AND c.relname <> %s
+            """,
+            [TABLE, DEFAULT_PARTITION],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    return sorted(
+        datetime.datetime.strptime(name, f"{TABLE}_%Y_%m").date() for name in names
+    )
+
+
+def create_partition(month: datetime.date) -> None:
+    """Create the partition of ``month``, moving its rows out of the default."""
+    month = month.replace(day=1)
+    name = partition_name(month)
+    bounds = [month, next_month(month)]
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Postgres refuses a partition whose rows sit in the default one.
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {name}_moved ON COMMIT DROP AS "
+            f"SELECT * FROM {DEFAULT_PARTITION} WHERE date >= %s AND date < %s",
+            bounds,
+        )
+        cursor.execute(
+            f"DELETE FROM {DEFAULT_PARTITION} WHERE date >= %s AND date < %s",
+            bounds,
+        )
+        moved = cursor.rowcount
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {name} "
+            f"PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{bounds[0]}') TO ('{bounds[1]}')"
+        )
+        cursor.execute(f"INSERT INTO {name} SELECT * FROM {name}_moved")
+    if moved:
+        logger.info("Moved %s rows of %s out of the default partition.", moved, month)
+
+
+def default_months() -> list[datetime.date]:
+    """Return the months with rows in the default partition."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT DISTINCT date_trunc('month', date)::date "
+            f"FROM {DEFAULT_PARTITION} ORDER BY 1"
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def ensure_partitions(
+    ahead: int = MONTHS_AHEAD,
+    today: datetime.date | None = None,
+    since: datetime.date | None = None,
+) -> list[datetime.date]:
+    """Create the partitions from the current month to ``ahead`` months after.
+
+    Months with rows in the default partition get their own partitions as
+    well.
+
+    Args:
+        ahead (int): Months after the current one to create.
+        today (date | None): Day whose month is the current one.
+        since (date | None): Also create the partitions of every month from
+            this day's on, e.g. before rows of past days are inserted.
+
+    Returns:
+        list[date]: Months whose partitions were created.
+
+    """
+    existing = set(list_partitions())
+    month = (today or datetime.date.today()).replace(day=1)
+    last = month
+    for _ in range(ahead):
+        last = next_month(last)
+    if since is not None:
+        month = min(month, since.replace(day=1))
+
+    months = set(default_months())
+    while month <= last:
+        months.add(month)
+        month = next_month(month)
+
+    created = []
+    for month in sorted(months - existing):
+        create_partition(month)
+        created.append(month)
+    if created:
+        logger.info("Created rank history partitions for %s.", created)
+    return created
+
+
+def detach_partitions(before: datetime.date, drop: bool = False) -> list[str]:
+    """Detach the partitions of all months before the month of ``before``.
+
+    The detached tables keep their rows but are no longer read through
+    ``rank_history``, unless ``drop`` removes them as well.
+
+    Returns:
+        list[str]: Names of the detached tables.
+
+    """
+    cutoff = before.replace(day=1)
+    detached = []
+    with connection.cursor() as cursor:
+        for month in list_partitions():
+            if month >= cutoff:
+                break
+            name = partition_name(month)
+            cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+            if drop:
+                cursor.execute(f"DROP TABLE {name}")
+            detached.append(name)
+    if detached:
+        logger.info("Detached rank history partitions %s.", detached)
+    return detached
@@ -0,0 +1,98 @@
+"""Fast JSON and MessagePack renderers and parsers.
+
+:class:`ORJSONRenderer` encodes with orjson. Clients pick the MessagePack
+classes with ``Accept: application/msgpack`` or ``?format=msgpack``. The
+:class:`ExportRenderer` classes only declare the formats of the bulk
+exports, which are streamed by the view itself.
+
+Values neither library encodes natively (lazy strings, decimals, durations)
+go through DRF's ``JSONEncoder.default``. NaN floats are encoded as null in
+JSON, which DRF's strict encoder rejects, and kept as NaN in MessagePack.
+"""
+
+import msgpack
+import orjson
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+_default = JSONEncoder().default
+
+
+def _orjson_options(indent: int | None) -> int:
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+    if indent:
+        # orjson only indents by two spaces.
+        options |= orjson.OPT_INDENT_2
+    return options
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type or "", renderer_context or {})
+        return orjson.dumps(data, default=_default, option=_orjson_options(indent))
+
+
+class ORJSONParser(parsers.JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as e:
+            raise ParseError(f"JSON parse error - {e}") from e
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # Dates are sent as ISO 8601 strings, as in JSON.
+        return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+class MessagePackParser(parsers.BaseParser):
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.ExtraData) as e:
+            raise ParseError(f"MessagePack parse error - {e}") from e
+
+
+class ExportRenderer(renderers.BaseRenderer):
+    """Media type of a bulk export, so content negotiation accepts it.
+
+    Exports are streamed by :class:`api.views.ExportView` and never go
+    through a renderer; ``format`` matches the keys of
+    :data:`api.export.FORMATS`.
+    """
+
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        raise NotImplementedError("Exports are streamed by the view.")
+
+
+class NDJSONExportRenderer(ExportRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+class CSVExportRenderer(ExportRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+class ParquetExportRenderer(ExportRenderer):
+    media_type = "application/vnd.apache.parquet"
+    format = "parquet"
@@ -0,0 +1,76 @@
+"""Weekly and monthly rollups of the daily rank history.
+
+Long-range charts and analytics read these instead of aggregating
+``rank_history`` on every request. The ingest pipeline keeps them current
+with :func:`refresh_rollups`, which only re-aggregates the periods that can
+have received new rows.
+"""
+
+import datetime
+import logging
+
+from django.db import connection, transaction
+from django.db.models import Max
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("bgg_rank", "bgg_geek_rating", "bgg_average_rating")
+ROLLUPS = {
+    "week": models.RankHistoryWeekly,
+    "month": models.RankHistoryMonthly,
+}
+
+_AGGREGATES = {
+    "min": "min({metric})",
+    "max": "max({metric})",
+    "mean": "avg({metric})",
+    "last": "(array_agg({metric} ORDER BY date DESC))[1]",
+}
+_HISTORY_TABLE = models.RankHistory._meta.db_table  # noqa: SLF001
+
+
+def _upsert_sql(period: str, table: str) -> str:
+    columns = [f"{metric}_{name}" for metric in METRICS for name in _AGGREGATES]
+    aggregates = [
+        template.format(metric=metric)
+        for metric in METRICS
+        for template in _AGGREGATES.values()
+    ]
+    updates = [
+        f"{column} = EXCLUDED.{column}"
+        for column in ["updated_at", "last_date", "entries", *columns]
+    ]
+    return f"""
+        INSERT INTO {table} (
+            created_at, updated_at, boardgame_id, period, last_date, entries,
+            {", ".join(columns)}
+        )
+        SELECT
+            now(), now(), boardgame_id, date_trunc('{period}', date)::date,
+            max(date), count(*), {", ".join(aggregates)}
+        FROM {_HISTORY_TABLE}
+        WHERE date >= %s
+        GROUP BY boardgame_id, date_trunc('{period}', date)
+        ON CONFLICT (boardgame_id, period) DO UPDATE SET {", ".join(updates)}
+    """
+
+
+def refresh_rollups(full: bool = False) -> None:
+    """Re-aggregate the rollup periods that can have changed.
+
+    Args:
+        full (bool): Rebuild every period, e.g. after history was backfilled.
+            By default only the periods from the latest rolled up one on are
+            aggregated again.
+
+    """
+    for period, model in ROLLUPS.items():
+        since = datetime.date.min
+        if not full:
+            since = model.objects.aggregate(latest=Max("period"))["latest"] or since
+        logger.info("Refreshing %s rollups since %s.", period, since)
+        with transaction.atomic(), connection.cursor() as cursor:
+            table = model._meta.db_table  # noqa: SLF001
+            cursor.execute(_upsert_sql(period, table), [since])
@@ -1,29 +1,32 @@
 from typing import ClassVar
 
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
-from . import models
+from . import models, sparklines
+from .fieldsets import SparseFieldsSerializerMixin
+from .forecasts import get_stored_forecast
 
 
-class CategoryListSerializer(serializers.ModelSerializer):
+class CategoryListSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = models.Category
         fields: ClassVar[list[str]] = ["id", "name", "bgg_id", "type"]
 
 
-class DesignerListSerializer(serializers.ModelSerializer):
+class DesignerListSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = models.Category
         fields: ClassVar[list[str]] = ["id", "name", "bgg_id", "type"]
 
 
-class FamilyListSerializer(serializers.ModelSerializer):
+class FamilyListSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = models.Family
         fields: ClassVar[list[str]] = ["id", "name", "bgg_id", "type"]
 
 
-class MechanicListSerializer(serializers.ModelSerializer):
+class MechanicListSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = models.Mechanic
         fields: ClassVar[list[str]] = ["id", "name", "bgg_id", "type"]
@@ -47,11 +50,14 @@ class BoardgameSimpleSerializer(serializers.ModelSerializer):
         fields: ClassVar[list[str]] = ["id", "name", "bgg_id", "bgg_rank"]
 
 
-class BoardgameListSerializer(serializers.ModelSerializer):
+class BoardgameListSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     categories = CategoryListSerializer(many=True, read_only=True)
     designers = DesignerListSerializer(many=True, read_only=True)
     families = FamilyListSerializer(many=True, read_only=True)
     mechanics = MechanicListSerializer(many=True, read_only=True)
+    # Only serialized with ``?include=sparkline``, the view joins the
+    # precomputed sparklines then.
+    sparkline = serializers.SerializerMethodField()
 
     class Meta:
         model = models.Boardgame
@@ -70,8 +76,107 @@ class BoardgameListSerializer(serializers.ModelSerializer):
             "mechanics",
             "thumbnail",
             "year_published",
+            "sparkline",
         ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if "sparkline" not in self.context.get("include", ()):
+            self.fields.pop("sparkline", None)
+
+    @extend_schema_field(
+        serializers.ListField(
+            child=serializers.IntegerField(allow_null=True), allow_null=True
+        )
+    )
+    def get_sparkline(self, obj):
+        """Ranks of the last days as deltas, see :mod:`api.sparklines`."""
+        try:
+            return sparklines.decode(obj.sparkline.ranks)
+        except models.Sparkline.DoesNotExist:
+            return None
+
+
+class BoardgameChangeSerializer(serializers.ModelSerializer):
+    """Boardgame in the change feed, referencing taxonomy entries by id."""
+
+    categories = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    designers = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    families = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    mechanics = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+    class Meta:
+        model = models.Boardgame
+        fields: ClassVar[list[str]] = [
+            "id",
+            "bgg_id",
+            "bgg_rank",
+            "name",
+            "bgg_geek_rating",
+            "bgg_average_rating",
+            "bgg_rank_trend",
+            "mean_trend",
+            "description",
+            "image",
+            "thumbnail",
+            "year_published",
+            "minplayers",
+            "maxplayers",
+            "playingtime",
+            "minplaytime",
+            "maxplaytime",
+            "categories",
+            "designers",
+            "families",
+            "mechanics",
+        ]
+
+
+class RankHistoryChangeSerializer(RankHistorySerializer):
+    bgg_id = serializers.IntegerField(source="boardgame.bgg_id", read_only=True)
+
+    class Meta(RankHistorySerializer.Meta):
+        fields: ClassVar[list[str]] = [
+            *RankHistorySerializer.Meta.fields,
+            "bgg_id",
+        ]
+
+
+class TombstoneSerializer(serializers.ModelSerializer):
+    deleted_at = serializers.DateTimeField(source="created_at", read_only=True)
+
+    class Meta:
+        model = models.Tombstone
+        fields: ClassVar[list[str]] = ["kind", "object_id", "bgg_id", "deleted_at"]
+
+
+class ChangesSerializer(serializers.Serializer):
+    categories = CategoryListSerializer(many=True)
+    designers = DesignerListSerializer(many=True)
+    families = FamilyListSerializer(many=True)
+    mechanics = MechanicListSerializer(many=True)
+    boardgames = BoardgameChangeSerializer(many=True)
+    rank_history = RankHistoryChangeSerializer(many=True)
+    deleted = TombstoneSerializer(many=True)
+
+
+class ChangesPageSerializer(serializers.Serializer):
+    """One page of the change feed, see ``changes.changes_since``."""
+
+    changes = ChangesSerializer()
+    next = serializers.CharField()
+    has_more = serializers.BooleanField()
+
+
+class ComparisonSerializer(serializers.Serializer):
+    """Metric of several games aligned on date, see ``history.aligned_history``."""
+
+    dates = serializers.ListField(child=serializers.DateField())
+    series = serializers.DictField(
+        child=serializers.ListField(child=serializers.FloatField(allow_null=True)),
+        help_text="Values of each bgg_id, aligned on dates.",
+    )
+
 
 class BoardgameRankHistorySerializer(BoardgameListSerializer):
     """Inherits from the List serializer but adds the annotated
@@ -101,8 +206,45 @@ class BoardgameRankHistorySerializer(BoardgameListSerializer):
         ]
 
 
+class BoardgameAsOfSerializer(BoardgameListSerializer):
+    """List entry with the rank and ratings a game had on an earlier day."""
+
+    bgg_rank = serializers.IntegerField(source="as_of_rank", read_only=True)
+    bgg_geek_rating = serializers.FloatField(source="as_of_geek_rating", read_only=True)
+    bgg_average_rating = serializers.FloatField(
+        source="as_of_average_rating", read_only=True
+    )
+
+
+class BoardgameLeaderboardSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
+    """Leaderboard entry, without the taxonomy relations of list entries."""
+
+    # Set on every game by the view from the stored leaderboard
+    bgg_rank_change_percent = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = models.Boardgame
+        fields: ClassVar[list[str]] = [
+            "id",
+            "bgg_id",
+            "bgg_rank",
+            "name",
+            "bgg_geek_rating",
+            "bgg_average_rating",
+            "bgg_rank_trend",
+            "mean_trend",
+            "thumbnail",
+            "year_published",
+            "bgg_rank_change_percent",
+        ]
+
+
 class BoardgameDetailSerializer(BoardgameListSerializer):
-    bgg_rank_history = RankHistorySerializer(many=True, read_only=True)
+    # Downsampled by the view and passed in the ``rank_history`` context, the
+    # relation itself is never serialized.
+    bgg_rank_history = serializers.SerializerMethodField()
 
     class Meta(BoardgameListSerializer.Meta):
         model = models.Boardgame
@@ -119,6 +261,22 @@ class BoardgameDetailSerializer(BoardgameListSerializer):
             "bgg_rank_history",
         ]
 
+    @extend_schema_field(RankHistorySerializer(many=True))
+    def get_bgg_rank_history(self, obj):
+        return RankHistorySerializer(
+            self.context.get("rank_history", []), many=True
+        ).data
+
+
+class BoardgameBatchSerializer(BoardgameDetailSerializer):
+    # Rank history of every game in the batch, by boardgame id, in the
+    # ``rank_histories`` context.
+    @extend_schema_field(RankHistorySerializer(many=True))
+    def get_bgg_rank_history(self, obj):
+        return RankHistorySerializer(
+            self.context.get("rank_histories", {}).get(obj.pk, []), many=True
+        ).data
+
 
 class NetworkSerializer(serializers.ModelSerializer):
     class Meta:
@@ -164,56 +322,124 @@ class LatestRankHistoryTimestampSerializer(serializers.Serializer):
     latest_rank_history_timestamp = serializers.FloatField()
 
 
-class CategoryDetailSerializer(CategoryListSerializer):
-    boardgames = BoardgameSimpleSerializer(many=True, read_only=True)
+TAXONOMY_STATS_FIELDS = (
+    "game_count",
+    "best_rank",
+    "mean_geek_rating",
+    "mean_average_rating",
+    "mean_trend",
+)
+
+
+@extend_schema_field(BoardgameSimpleSerializer(many=True))
+def _get_taxonomy_boardgames(self, obj):
+    # One page of the games, ordered by rank and paginated by the view
+    return BoardgameSimpleSerializer(self.context.get("boardgames", []), many=True).data
+
+
+class CategoryStatsSerializer(CategoryListSerializer):
+    """Category with the aggregates of its games, precomputed at ingest."""
 
     class Meta(CategoryListSerializer.Meta):
         model = models.Category
         fields: ClassVar[list[str]] = [
             *CategoryListSerializer.Meta.fields,
+            *TAXONOMY_STATS_FIELDS,
+        ]
+
+
+class CategoryDetailSerializer(CategoryStatsSerializer):
+    boardgames = serializers.SerializerMethodField()
+
+    class Meta(CategoryStatsSerializer.Meta):
+        fields: ClassVar[list[str]] = [
+            *CategoryStatsSerializer.Meta.fields,
             "boardgames",
         ]
 
+    get_boardgames = _get_taxonomy_boardgames
 
-class DesignerDetailSerializer(DesignerListSerializer):
-    boardgames = BoardgameSimpleSerializer(many=True, read_only=True)
+
+class DesignerStatsSerializer(DesignerListSerializer):
+    """Designer with the aggregates of its games, precomputed at ingest."""
 
     class Meta(DesignerListSerializer.Meta):
         model = models.Designer
         fields: ClassVar[list[str]] = [
             *DesignerListSerializer.Meta.fields,
+            *TAXONOMY_STATS_FIELDS,
+        ]
+
+
+class DesignerDetailSerializer(DesignerStatsSerializer):
+    boardgames = serializers.SerializerMethodField()
+
+    class Meta(DesignerStatsSerializer.Meta):
+        fields: ClassVar[list[str]] = [
+            *DesignerStatsSerializer.Meta.fields,
             "boardgames",
         ]
 
+    get_boardgames = _get_taxonomy_boardgames
+
 
-class FamilyDetailSerializer(FamilyListSerializer):
-    boardgames = BoardgameSimpleSerializer(many=True, read_only=True)
+class FamilyStatsSerializer(FamilyListSerializer):
+    """Family with the aggregates of its games, precomputed at ingest."""
 
     class Meta(FamilyListSerializer.Meta):
         model = models.Family
         fields: ClassVar[list[str]] = [
             *FamilyListSerializer.Meta.fields,
-            "boardgames",
+            *TAXONOMY_STATS_FIELDS,
         ]
 
 
-class MechanicDetailSerializer(MechanicListSerializer):
-    boardgames = BoardgameSimpleSerializer(many=True, read_only=True)
+class FamilyDetailSerializer(FamilyStatsSerializer):
+    boardgames = serializers.SerializerMethodField()
+
+    class Meta(FamilyStatsSerializer.Meta):
+        fields: ClassVar[list[str]] = [*FamilyStatsSerializer.Meta.fields, "boardgames"]
+
+    get_boardgames = _get_taxonomy_boardgames
+
+
+class MechanicStatsSerializer(MechanicListSerializer):
+    """Mechanic with the aggregates of its games, precomputed at ingest."""
 
     class Meta(MechanicListSerializer.Meta):
         model = models.Mechanic
         fields: ClassVar[list[str]] = [
             *MechanicListSerializer.Meta.fields,
+            *TAXONOMY_STATS_FIELDS,
+        ]
+
+
+class MechanicDetailSerializer(MechanicStatsSerializer):
+    boardgames = serializers.SerializerMethodField()
+
+    class Meta(MechanicStatsSerializer.Meta):
+        fields: ClassVar[list[str]] = [
+            *MechanicStatsSerializer.Meta.fields,
             "boardgames",
         ]
 
+    get_boardgames = _get_taxonomy_boardgames
+
 
 class SearchResultSerializer(serializers.Serializer):
     type = serializers.CharField()
+    score = serializers.FloatField()
     # Use a generic field or point to specific serializers
     data = serializers.JSONField()
 
 
+class AutocompleteResultSerializer(serializers.Serializer):
+    type = serializers.CharField()
+    bgg_id = serializers.IntegerField()
+    name = serializers.CharField()
+    bgg_rank = serializers.IntegerField(allow_null=True)
+
+
 class PredictionSerializer(serializers.Serializer):
     date = serializers.DateTimeField()
     bgg_rank = serializers.IntegerField()
@@ -228,3 +454,37 @@ class PredictionSerializer(serializers.Serializer):
     bgg_geek_rating_confidence_interval = serializers.ListField(
         child=serializers.FloatField(), min_length=2, max_length=2
     )
+
+
+class ForecastSerializer(serializers.Serializer):
+    model = serializers.CharField()
+    generated_at = serializers.DateTimeField()
+    history_date = serializers.DateField()
+    stale = serializers.BooleanField()
+    predictions = PredictionSerializer(many=True)
+
+
+class ForecastJobSerializer(serializers.ModelSerializer):
+    bgg_id = serializers.IntegerField(source="boardgame.bgg_id", read_only=True)
+    forecast = serializers.SerializerMethodField()
+
+    class Meta:
+        model = models.ForecastJob
+        fields: ClassVar[list[str]] = [
+            "id",
+            "bgg_id",
+            "model",
+            "history_date",
+            "status",
+            "error",
+            "created_at",
+            "updated_at",
+            "forecast",
+        ]
+
+    @extend_schema_field(ForecastSerializer(allow_null=True))
+    def get_forecast(self, obj):
+        if obj.status != models.ForecastJob.Status.DONE:
+            return None
+        forecast = get_stored_forecast(obj.boardgame, obj.model)
+        return ForecastSerializer(forecast).data if forecast else None
@@ -0,0 +1,27 @@
+"""Tombstones for deleted rows, so the change feed can report deletions."""
+
+from django.db.models.signals import post_delete
+
+from . import models
+
+# Tombstone kind of every model whose deletions are recorded
+TRACKED_MODELS = {
+    models.Boardgame: "boardgames",
+    models.Category: "categories",
+    models.Designer: "designers",
+    models.Family: "families",
+    models.Mechanic: "mechanics",
+}
+
+
+def record_deletion(sender, instance, **kwargs) -> None:
+    models.Tombstone.objects.create(
+        kind=TRACKED_MODELS[sender], object_id=instance.pk, bgg_id=instance.bgg_id
+    )
+
+
+def connect() -> None:
+    for model in TRACKED_MODELS:
+        post_delete.connect(
+            record_deletion, sender=model, dispatch_uid=f"tombstone_{model.__name__}"
+        )
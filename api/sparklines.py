@@ -0,0 +1,87 @@
+"""Precomputed rank sparklines shown next to every game in lists.
+
+:func:`refresh_sparklines` stores the ranks of the last ``SPARKLINE_DAYS``
+days before the latest ingest as one :class:`api.models.Sparkline` row per
+game, so list responses attach them with a join instead of a history query
+per row. The ranks are delta encoded as little-endian int16: the first day
+with a rank holds the rank itself, every later one the change from the
+previous rank, and days without rank hold ``MISSING``.
+"""
+
+import datetime
+import itertools
+import logging
+
+import numpy as np
+from django.db import transaction
+
+from . import models, movers
+
+logger = logging.getLogger(__name__)
+
+SPARKLINE_DAYS = 30
+MISSING = -(2**15)
+# Sparklines written per INSERT
+CHUNK_SIZE = 1000
+
+_RANKS = np.dtype("<i2")
+_MAX_RANK = 2**15 - 1
+
+
+def encode(ranks: list[int | None]) -> bytes:
+    """Delta encode daily ranks, None for days without a rank."""
+    values = []
+    previous = 0
+    for rank in ranks:
+        if rank is None:
+            values.append(MISSING)
+            continue
+        rank = min(rank, _MAX_RANK)
+        values.append(rank - previous)
+        previous = rank
+    return np.array(values, _RANKS).tobytes()
+
+
+def decode(blob: bytes) -> list[int | None]:
+    """Return the delta encoded ranks of a blob, None for days without rank."""
+    return [
+        None if value == MISSING else value
+        for value in np.frombuffer(bytes(blob), _RANKS).tolist()
+    ]
+
+
+def refresh_sparklines() -> None:
+    """Rebuild the sparklines of all games ending on the latest ingest."""
+    end_date = movers.latest_history_date()
+    if end_date is None:
+        return
+    start_date = end_date - datetime.timedelta(days=SPARKLINE_DAYS - 1)
+
+    rows = (
+        models.RankHistory.objects.filter(date__range=(start_date, end_date))
+        .order_by("boardgame_id", "date")
+        .values_list("boardgame_id", "date", "bgg_rank")
+    )
+    with transaction.atomic():
+        models.Sparkline.objects.all().delete()
+        sparklines = []
+        count = 0
+        for boardgame_id, entries in itertools.groupby(
+            rows.iterator(chunk_size=CHUNK_SIZE * SPARKLINE_DAYS),
+            key=lambda row: row[0],
+        ):
+            ranks = [None] * SPARKLINE_DAYS
+            for _, date, rank in entries:
+                ranks[(date - start_date).days] = rank
+            sparklines.append(
+                models.Sparkline(
+                    boardgame_id=boardgame_id, end_date=end_date, ranks=encode(ranks)
+                )
+            )
+            if len(sparklines) == CHUNK_SIZE:
+                models.Sparkline.objects.bulk_create(sparklines)
+                count += len(sparklines)
+                sparklines = []
+        models.Sparkline.objects.bulk_create(sparklines)
+        count += len(sparklines)
+    logger.info("Stored %s sparklines until %s.", count, end_date)
@@ -2,6 +2,22 @@
 
 from .trending import calculate_trends
 from .volatility import calculate_volatility
-from .predict import forecast_game_ranking
+from .downsample import lttb
+from .predict import (
+    DEFAULT_MODEL,
+    FORECAST_MODELS,
+    choose_model,
+    forecast_catalog_rankings,
+    forecast_game_ranking,
+)
 
-__all__ = ["calculate_trends", "calculate_volatility", "forecast_game_ranking"]
+__all__ = [
+    "DEFAULT_MODEL",
+    "FORECAST_MODELS",
+    "calculate_trends",
+    "calculate_volatility",
+    "choose_model",
+    "forecast_catalog_rankings",
+    "forecast_game_ranking",
+    "lttb",
+]
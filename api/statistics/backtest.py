@@ -0,0 +1,123 @@
+"""Rolling-origin backtests of the forecast models."""
+
+import statistics
+import time
+import tracemalloc
+
+from .predict import HORIZON, METRICS, forecast_game_ranking
+
+
+def rolling_origins(
+    history: list[dict], origins: int, step: int, horizon: int = HORIZON
+) -> list[int]:
+    """Return the indices of the last history entry before each forecast origin.
+
+    Origins are ``step`` entries apart, the latest one leaves ``horizon``
+    entries to score its forecast against.
+    """
+    last = len(history) - horizon - 1
+    return [last - i * step for i in reversed(range(origins)) if last - i * step >= 0]
+
+
+def backtest_game(
+    history: list[dict],
+    model: str,
+    window: int,
+    origins: int = 4,
+    step: int = HORIZON,
+    horizon: int = HORIZON,
+) -> dict:
+    """Replay forecasts of one game from several origins in its history.
+
+    Args:
+        history (list[dict]): Full rank history of the game ordered by date,
+            entries as accepted by :func:`forecast_game_ranking`.
+        model (str): Key of :data:`FORECAST_MODELS`.
+        window (int): Number of entries before each origin the model is
+            fitted on.
+        origins (int): Number of forecast origins.
+        step (int): Entries between two origins.
+        horizon (int): Entries after each origin the forecast is scored on.
+
+    Returns:
+        dict: Absolute errors and interval hits per metric, latency of every
+            forecast in milliseconds and the peak memory of one forecast in
+            KiB.
+
+    """
+    result = {
+        "errors": {metric: [] for metric in METRICS},
+        "covered": {metric: [] for metric in METRICS},
+        "latency_ms": [],
+        "peak_kib": None,
+    }
+
+    for origin in rolling_origins(history, origins, step, horizon):
+        train = history[max(0, origin + 1 - window) : origin + 1]
+        actual = {
+            entry["date"]: entry for entry in history[origin + 1 : origin + 1 + horizon]
+        }
+
+        if result["peak_kib"] is None:
+            # Tracing slows allocations down, so it gets a run of its own.
+            tracemalloc.start()
+            forecast_game_ranking(train, model=model)
+            result["peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+
+        start = time.perf_counter()
+        predictions = forecast_game_ranking(train, model=model)
+        result["latency_ms"].append((time.perf_counter() - start) * 1000)
+
+        for prediction in predictions:
+            entry = actual.get(prediction["date"].date())
+            if entry is None:
+                continue
+            for metric in METRICS:
+                if entry[metric] is None:
+                    continue
+                lower, upper = prediction[f"{metric}_confidence_interval"]
+                result["errors"][metric].append(abs(prediction[metric] - entry[metric]))
+                result["covered"][metric].append(lower <= entry[metric] <= upper)
+
+    return result
+
+
+def summarize_backtests(results: list[dict]) -> dict:
+    """Aggregate the backtests of many games into one comparable record.
+
+    Returns:
+        dict: Mean absolute error and 95% interval coverage per metric,
+            latency percentiles and peak memory.
+
+    """
+    latencies = sorted(ms for result in results for ms in result["latency_ms"])
+    peaks = [r["peak_kib"] for r in results if r["peak_kib"] is not None]
+
+    def percentile(q: float) -> float | None:
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    summary: dict = {
+        "games": len(peaks),
+        "forecasts": len(latencies),
+        "mae": {},
+        "coverage": {},
+        "latency_ms": {
+            "mean": statistics.fmean(latencies) if latencies else None,
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "max": latencies[-1] if latencies else None,
+        },
+        "peak_kib": {
+            "mean": statistics.fmean(peaks) if peaks else None,
+            "max": max(peaks, default=None),
+        },
+    }
+    for metric in METRICS:
+        errors = [e for result in results for e in result["errors"][metric]]
+        covered = [c for result in results for c in result["covered"][metric]]
+        summary["mae"][metric] = statistics.fmean(errors) if errors else None
+        summary["coverage"][metric] = sum(covered) / len(covered) if covered else None
+    return summary
@@ -0,0 +1,55 @@
+"""Downsample time series for charts."""
+
+
+def lttb(points: list[dict], max_points: int, y: str = "bgg_rank") -> list[dict]:
+    """Reduce ``points`` with Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept; every bucket in between contributes
+    the point spanning the largest triangle with its neighbours, so peaks
+    and dips survive the reduction.
+
+    Args:
+        points (list[dict]): Entries ordered by ``date``.
+        max_points (int): Number of points to keep, at least 3.
+        y (str): Key of the value the shape is preserved for. Missing values
+            carry the previous value forward.
+
+    Returns:
+        list[dict]: At most ``max_points`` of the original entries.
+
+    """
+    if max_points < 3 or len(points) <= max_points:
+        return points
+
+    xs = [point["date"].toordinal() for point in points]
+    ys = []
+    last = 0.0
+    for point in points:
+        if point[y] is not None:
+            last = float(point[y])
+        ys.append(last)
+
+    sampled = [points[0]]
+    selected = 0
+    bucket_size = (len(points) - 2) / (max_points - 2)
+    for bucket in range(max_points - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # The average of the next bucket stands in for the third corner.
+        next_end = min(int((bucket + 2) * bucket_size) + 1, len(points))
+        count = next_end - end
+        avg_x = sum(xs[end:next_end]) / count
+        avg_y = sum(ys[end:next_end]) / count
+
+        ax, ay = xs[selected], ys[selected]
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs((ax - avg_x) * (ys[i] - ay) - (ax - xs[i]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = i, area
+        sampled.append(points[best])
+        selected = best
+
+    sampled.append(points[-1])
+    return sampled
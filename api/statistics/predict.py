@@ -1,22 +1,235 @@
-"""Forecast function."""
+"""Forecast functions."""
 
-from typing import cast
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple
 
-from django.forms import model_to_dict
-import numpy as np
 import pandas as pd
-from sktime.forecasting.statsforecast import StatsForecastAutoARIMA
+from statsforecast import StatsForecast
+from statsforecast.models import (
+    AutoARIMA,
+    AutoETS,
+    Naive,
+    RandomWalkWithDrift,
+    SeasonalNaive,
+    Theta,
+)
 
 from ..logger import configure_logger
 
 logger = configure_logger()
 
+METRICS = ("bgg_rank", "bgg_average_rating", "bgg_geek_rating")
+PANEL_COLUMNS = ["boardgame_id", "date", *METRICS]
+HORIZON = 30
+INTERVAL = 95
+
+
+class ForecastModel(NamedTuple):
+    build: Callable[[], Any]
+    # Typical time to fit the three series of one game with a year of daily
+    # history on a single core
+    fit_ms: float
+    # Shortest history the model gives sensible forecasts for
+    min_history: int
+    description: str
+
+
+# Available models, from the most accurate and most expensive to the cheapest.
+FORECAST_MODELS: dict[str, ForecastModel] = {
+    "auto_arima": ForecastModel(
+        build=AutoARIMA,
+        fit_ms=500,
+        min_history=30,
+        description=(
+            "Searches ARIMA orders per series. Most accurate on ranks with "
+            "changing momentum, by far the most expensive."
+        ),
+    ),
+    "ets": ForecastModel(
+        build=lambda: AutoETS(season_length=1),
+        fit_ms=80,
+        min_history=10,
+        description=(
+            "Exponential smoothing with automatic trend selection. Close to "
+            "AutoARIMA on steady trends, slightly wider intervals."
+        ),
+    ),
+    "theta": ForecastModel(
+        build=lambda: Theta(season_length=7),
+        fit_ms=15,
+        min_history=14,
+        description=(
+            "Exponential smoothing plus half the linear trend. Robust on short "
+            "horizons, tends to overshoot after sudden jumps."
+        ),
+    ),
+    "naive_drift": ForecastModel(
+        build=RandomWalkWithDrift,
+        fit_ms=3,
+        min_history=2,
+        description=(
+            "Extends the line between the first and last value. Good baseline "
+            "for slowly drifting ranks, ignores recent changes in momentum."
+        ),
+    ),
+    "seasonal_naive": ForecastModel(
+        build=lambda: SeasonalNaive(season_length=7),
+        fit_ms=3,
+        min_history=7,
+        description=(
+            "Repeats the last week. Only useful for games with weekly "
+            "patterns, no trend."
+        ),
+    ),
+}
+DEFAULT_MODEL = "auto_arima"
+
+
+def choose_model(history_length: int, max_ms: float | None = None) -> str:
+    """Return the most accurate model suited to the history and time budget.
 
-def forecast_game_ranking(rank_history):
+    Args:
+        history_length (int): Number of history entries to fit on.
+        max_ms (float | None): Time budget for fitting in milliseconds.
+
+    Returns:
+        str: Key of :data:`FORECAST_MODELS`.
+
+    """
+    for name, model in FORECAST_MODELS.items():
+        if history_length < model.min_history:
+            continue
+        if max_ms is not None and model.fit_ms > max_ms:
+            continue
+        return name
+    return "naive_drift"
+
+
+def build_history_panel(rows: Iterable[tuple]) -> pd.DataFrame:
+    """Build a long-format panel of rank history for statsforecast.
+
+    Every metric of every game becomes one series. Its ``unique_id`` encodes
+    the boardgame and the metric, see :func:`forecast_panel`.
+
+    Args:
+        rows (Iterable[tuple]): Tuples of ``boardgame_id``, ``date``,
+            ``bgg_rank``, ``bgg_average_rating`` and ``bgg_geek_rating``.
+
+    Returns:
+        pd.DataFrame: Panel with columns ``unique_id``, ``ds`` and ``y``.
+
+    """
+    df = pd.DataFrame(rows, columns=PANEL_COLUMNS).dropna()
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.groupby(["boardgame_id", "date"], as_index=False).last()
+
+    panel = df.melt(
+        id_vars=["boardgame_id", "date"],
+        value_vars=list(METRICS),
+        var_name="metric",
+        value_name="y",
+    )
+    panel["unique_id"] = panel["boardgame_id"] * len(METRICS) + panel["metric"].map(
+        {metric: i for i, metric in enumerate(METRICS)}
+    )
+    panel = panel.rename(columns={"date": "ds"})[["unique_id", "ds", "y"]]
+    return panel.sort_values(["unique_id", "ds"], ignore_index=True)
+
+
+def forecast_panel(
+    panel: pd.DataFrame, n_jobs: int = 1, model: str = DEFAULT_MODEL
+) -> dict[int, list[dict]]:
+    """Forecast all series of a history panel at once.
+
+    Args:
+        panel (pd.DataFrame): Panel as returned by :func:`build_history_panel`.
+        n_jobs (int): Number of processes statsforecast fits the series in,
+            ``-1`` uses all cores.
+        model (str): Key of :data:`FORECAST_MODELS`.
+
+    Returns:
+        dict[int, list[dict]]: Predictions in the format of
+            :func:`forecast_game_ranking`, keyed by boardgame id.
+
+    """
+    if panel.empty:
+        return {}
+
+    forecaster = StatsForecast(
+        models=[FORECAST_MODELS[model].build()],
+        freq="D",
+        n_jobs=n_jobs,
+        fallback_model=Naive(),
+    )
+    logger.info("Fitting %s on %s series.", model, panel["unique_id"].nunique())
+    forecast = forecaster.forecast(df=panel, h=HORIZON, level=[INTERVAL])
+    forecast.columns = ["unique_id", "ds", "mean", "lower", "upper"]
+
+    forecast["boardgame_id"], metric_index = divmod(forecast["unique_id"], len(METRICS))
+    forecast["metric"] = metric_index.map(dict(enumerate(METRICS)))
+    wide = forecast.pivot_table(
+        index=["boardgame_id", "ds"],
+        columns="metric",
+        values=["mean", "lower", "upper"],
+    ).dropna()
+
+    predictions: dict[int, list[dict]] = {}
+    for (boardgame_id, date), row in zip(
+        wide.index, wide.itertuples(index=False), strict=True
+    ):
+        values = dict(zip(wide.columns, row, strict=True))
+        predictions.setdefault(int(boardgame_id), []).append(
+            {
+                "date": date,
+                "bgg_rank": int(round(values["mean", "bgg_rank"], 0)),
+                "bgg_rank_confidence_interval": (
+                    values["lower", "bgg_rank"],
+                    values["upper", "bgg_rank"],
+                ),
+                "bgg_average_rating": values["mean", "bgg_average_rating"],
+                "bgg_average_rating_confidence_interval": (
+                    values["lower", "bgg_average_rating"],
+                    values["upper", "bgg_average_rating"],
+                ),
+                "bgg_geek_rating": values["mean", "bgg_geek_rating"],
+                "bgg_geek_rating_confidence_interval": (
+                    values["lower", "bgg_geek_rating"],
+                    values["upper", "bgg_geek_rating"],
+                ),
+            }
+        )
+    return predictions
+
+
+def forecast_catalog_rankings(
+    chunks: Iterable[Iterable[tuple]], n_jobs: int = -1, model: str = DEFAULT_MODEL
+) -> Iterable[dict[int, list[dict]]]:
+    """Forecast the rankings of many games, one chunk of games at a time.
+
+    Only one chunk's panel is held in memory, so the whole catalog can be
+    processed in bounded memory.
+
+    Args:
+        chunks (Iterable[Iterable[tuple]]): History rows as accepted by
+            :func:`build_history_panel`, grouped into chunks of whole games.
+        n_jobs (int): Number of processes used to fit each chunk.
+        model (str): Key of :data:`FORECAST_MODELS`.
+
+    Yields:
+        dict[int, list[dict]]: Predictions per boardgame id of each chunk.
+
+    """
+    for chunk in chunks:
+        yield forecast_panel(build_history_panel(chunk), n_jobs=n_jobs, model=model)
+
+
+def forecast_game_ranking(rank_history: list[dict], model: str = DEFAULT_MODEL):
     """Forecast game ranking.
 
     Args:
-        rank_history (list[RankHistory]): Data points.
+        rank_history (list[dict]): List of entries with keys ``date``,
+            ``bgg_rank``, ``bgg_geek_rating`` and ``bgg_average_rating``.
+        model (str): Key of :data:`FORECAST_MODELS`.
 
     Returns:
         list[Prediction]: List with predictions.
@@ -28,68 +241,11 @@ def forecast_game_ranking(rank_history):
         logger.warning("No rank history data provided.")
         return []
 
-    df = pd.DataFrame([model_to_dict(entry) for entry in rank_history])
-
-    df = df.dropna()
-    df = df.set_index("date", drop=True)
-    df.index = pd.to_datetime(df.index)
-    df = df.groupby(df.index).last()
-    df = df.sort_index()
-    df.index = cast("pd.DatetimeIndex", df.index).to_period("D")
-
-    fh = np.arange(1, 31)
-
-    forecaster = StatsForecastAutoARIMA()
-    logger.info("Fitting StatsForecastAutoARIMA model.")
-    forecaster.fit(df)
-
-    logger.info("Generating point forecasts.")
-    y_pred = forecaster.predict(fh=fh)
-    interval = 0.95
-    conf_int = forecaster.predict_interval(fh=fh, coverage=interval)
-    conf_int.columns = [
-        "_".join(map(str, col)) if isinstance(col, tuple) else col
-        for col in conf_int.columns
-    ]
-
-    merged_df = y_pred.merge(conf_int, left_index=True, right_index=True)
-
-    cols = [
-        "bgg_rank",
-        f"bgg_rank_{interval}_lower",
-        f"bgg_rank_{interval}_upper",
-        "bgg_average_rating",
-        f"bgg_average_rating_{interval}_lower",
-        f"bgg_average_rating_{interval}_upper",
-        "bgg_geek_rating",
-        f"bgg_geek_rating_{interval}_lower",
-        f"bgg_geek_rating_{interval}_upper",
-    ]
-    zipped = zip(merged_df.index, *(merged_df[c] for c in cols), strict=False)
-
-    predictions = [
-        {
-            "date": date.to_timestamp(),
-            "bgg_rank": int(round(rank, 0)),
-            "bgg_rank_confidence_interval": (rank_lower, rank_upper),
-            "bgg_average_rating": avg_rating,
-            "bgg_average_rating_confidence_interval": (avg_low, avg_up),
-            "bgg_geek_rating": geek_rating,
-            "bgg_geek_rating_confidence_interval": (geek_low, geek_up),
-        }
-        for (
-            date,
-            rank,
-            rank_lower,
-            rank_upper,
-            avg_rating,
-            avg_low,
-            avg_up,
-            geek_rating,
-            geek_low,
-            geek_up,
-        ) in zipped
-    ]
+    panel = build_history_panel(
+        (0, entry["date"], *(entry[metric] for metric in METRICS))
+        for entry in rank_history
+    )
+    predictions = forecast_panel(panel, model=model).get(0, [])
 
     logger.info("Generated %s forecast predictions.", len(predictions))
     return predictions
@@ -0,0 +1,72 @@
+"""Aggregates of the boardgames in every category, designer, family and mechanic.
+
+:func:`refresh_taxonomy_stats` recomputes the columns of
+:class:`api.models.Taxonomy` after every ingest, so taxonomy endpoints read
+them instead of aggregating over the link tables per request, and taxonomy
+lists sort by them over :func:`api.models.taxonomy_ordering_indexes`.
+"""
+
+import logging
+
+from django.db import connection, transaction
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+# Taxonomy models by the name of their relation on Boardgame
+TAXONOMY_MODELS = {
+    "categories": models.Category,
+    "designers": models.Designer,
+    "families": models.Family,
+    "mechanics": models.Mechanic,
+}
+
+_UPDATE_SQL = """
+    UPDATE {table} AS t SET
+        game_count = s.game_count,
+        best_rank = s.best_rank,
+        mean_geek_rating = s.mean_geek_rating,
+        mean_average_rating = s.mean_average_rating,
+        mean_trend = s.mean_trend
+    FROM (
+        SELECT
+            x.id,
+            count(b.id) AS game_count,
+            min(b.bgg_rank) AS best_rank,
+            avg(b.bgg_geek_rating) AS mean_geek_rating,
+            avg(b.bgg_average_rating) AS mean_average_rating,
+            avg(b.mean_trend) AS mean_trend
+        FROM {table} x
+        LEFT JOIN {link} l ON l.{taxonomy_column} = x.id
+        LEFT JOIN {boardgames} b ON b.id = l.{boardgame_column}
+        GROUP BY x.id
+    ) s
+    WHERE s.id = t.id
+"""
+
+
+def _update_sql(relation: str) -> str:
+    boardgame_meta = models.Boardgame._meta  # noqa: SLF001
+    through = boardgame_meta.get_field(relation).remote_field.through
+    through_meta = through._meta  # noqa: SLF001
+    model_meta = TAXONOMY_MODELS[relation]._meta  # noqa: SLF001
+    return _UPDATE_SQL.format(
+        table=model_meta.db_table,
+        link=through_meta.db_table,
+        taxonomy_column=through_meta.get_field(model_meta.model_name).column,
+        boardgame_column=through_meta.get_field("boardgame").column,
+        boardgames=boardgame_meta.db_table,
+    )
+
+
+def refresh_taxonomy_stats() -> None:
+    """Recompute the aggregates of all taxonomy entries.
+
+    ``updated_at`` is left alone, the change feed only reports edits of the
+    entries themselves.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        for relation in TAXONOMY_MODELS:
+            cursor.execute(_update_sql(relation))
+            logger.info("Refreshed the stats of %s %s.", cursor.rowcount, relation)
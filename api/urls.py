@@ -2,10 +2,14 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 from .views import (
+    AutocompleteView,
     BoardgameViewSet,
     CategoryViewSet,
+    ChangesView,
     DesignerViewSet,
+    ExportView,
     FamilyViewSet,
+    ForecastJobViewSet,
     MechanicViewSet,
     SearchView,
 )
@@ -15,9 +19,18 @@ router.register("boardgames", BoardgameViewSet, basename="boardgame")
 router.register("categories", CategoryViewSet, basename="category")
 router.register("designers", DesignerViewSet, basename="designer")
 router.register("families", FamilyViewSet, basename="family")
+router.register("forecast-jobs", ForecastJobViewSet, basename="forecast-job")
 router.register("mechanics", MechanicViewSet, basename="mechanic")
 
 urlpatterns = [
     path("", include(router.urls)),
     path("search/", SearchView.as_view(), name="global-search"),
+    path("autocomplete/", AutocompleteView.as_view(), name="autocomplete"),
+    path("changes/", ChangesView.as_view(), name="changes"),
+    path(
+        "export/<slug:dataset>.<slug:file_format>",
+        ExportView.as_view(),
+        name="export",
+    ),
+    path("export/<slug:dataset>", ExportView.as_view(), name="export-negotiated"),
 ]
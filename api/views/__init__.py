@@ -1,15 +1,23 @@
+from .autocomplete import AutocompleteView
 from .category import CategoryViewSet
+from .changes import ChangesView
 from .boardgame import BoardgameViewSet
 from .designer import DesignerViewSet
+from .export import ExportView
 from .family import FamilyViewSet
+from .forecast_job import ForecastJobViewSet
 from .mechanic import MechanicViewSet
 from .search import SearchView
 
 __all__ = [
+    "AutocompleteView",
     "BoardgameViewSet",
     "CategoryViewSet",
+    "ChangesView",
     "DesignerViewSet",
+    "ExportView",
     "FamilyViewSet",
+    "ForecastJobViewSet",
     "GraphViewSet",
     "MechanicViewSet",
     "SearchView",
@@ -0,0 +1,37 @@
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .. import autocomplete, serializers
+
+
+class AutocompleteView(APIView):
+    """Search-as-you-type suggestions served from the in-process index."""
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "query",
+                str,
+                description="Words typed so far, the last one may be a prefix.",
+            ),
+            OpenApiParameter(
+                "limit",
+                int,
+                description="Number of suggestions, 10 by default, at most "
+                f"{autocomplete.MAX_RESULTS}.",
+            ),
+        ],
+        responses=serializers.AutocompleteResultSerializer(many=True),
+    )
+    def get(self, request):
+        query = request.query_params.get("query", "")
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            return Response({"detail": "limit must be an integer."}, status=400)
+        limit = max(1, min(limit, autocomplete.MAX_RESULTS))
+
+        results = autocomplete.get_index().search(query, limit=limit)
+        serializer = serializers.AutocompleteResultSerializer(results, many=True)
+        return Response(serializer.data)
@@ -1,25 +1,163 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 
-from django.db.models import OuterRef, Subquery, F
+from django.db.models import F, FilteredRelation, FloatField, Q, Value
 import datetime
+from .. import archive
+from .. import forecast_jobs
+from .. import forecasts
+from .. import history
+from .. import leaderboards
+from .. import movers
 from .. import models
 from .. import serializers
-from ..statistics import forecast_game_ranking
+from ..cache import DataVersionCacheMixin
+from ..fieldsets import SparseFieldsViewMixin
+from ..pagination import AsOfRankPagination
+from ..statistics import DEFAULT_MODEL, FORECAST_MODELS, choose_model
 
 from datetime import timedelta
 
+# Most games looked up by one batch request
+BATCH_SIZE = 300
+# Most games in one comparison
+COMPARE_SIZE = 50
 
-class BoardgameViewSet(viewsets.ReadOnlyModelViewSet):
+RANK_HISTORY_ORDERINGS = (
+    "bgg_rank",
+    "bgg_rank_change",
+    "bgg_geek_rating_change",
+    "bgg_average_rating_change",
+)
+
+
+def _parse_bgg_ids(query_params, limit: int) -> list[int]:
+    """Return the distinct ids of the comma separated ``bgg_ids`` parameter.
+
+    Raises:
+        ValueError: If an id is not an integer or not 1 to ``limit`` ids are
+            given.
+
+    """
+    try:
+        bgg_ids = [
+            int(bgg_id)
+            for bgg_id in query_params.get("bgg_ids", "").split(",")
+            if bgg_id.strip()
+        ]
+    except ValueError as e:
+        raise ValueError("bgg_ids must be a comma separated list of integers.") from e
+    bgg_ids = list(dict.fromkeys(bgg_ids))
+    if not bgg_ids or len(bgg_ids) > limit:
+        raise ValueError(f"Pass between 1 and {limit} bgg_ids.")
+    return bgg_ids
+
+
+def _parse_date_range(query_params) -> tuple[datetime.date, datetime.date]:
+    """Return ``start_date`` and ``end_date``, the last 30 days by default.
+
+    Raises:
+        ValueError: If a date is not formatted YYYY-MM-DD.
+
+    """
+    start_date_str = query_params.get("start_date")
+    end_date_str = query_params.get("end_date")
+    try:
+        end_date = (
+            datetime.datetime.strptime(end_date_str, "%Y-%m-%d").date()
+            if end_date_str
+            else datetime.datetime.now().date()
+        )
+        start_date = (
+            datetime.datetime.strptime(start_date_str, "%Y-%m-%d").date()
+            if start_date_str
+            else end_date - timedelta(days=30)
+        )
+    except ValueError as e:
+        raise ValueError("Invalid date format. Use YYYY-MM-DD.") from e
+    return start_date, end_date
+
+
+def _bgg_ids_parameter(limit: int) -> OpenApiParameter:
+    return OpenApiParameter(
+        "bgg_ids",
+        str,
+        required=True,
+        description=f"Comma separated bgg_ids, at most {limit}.",
+    )
+
+
+DATE_RANGE_PARAMETERS = [
+    OpenApiParameter(
+        "start_date",
+        OpenApiTypes.DATE,
+        description="First day of the history, 30 days before end_date by default.",
+    ),
+    OpenApiParameter(
+        "end_date",
+        OpenApiTypes.DATE,
+        description="Last day of the history, today by default.",
+    ),
+]
+
+
+LEADERBOARD_SCHEMA = extend_schema(
+    parameters=[
+        OpenApiParameter(
+            "days",
+            int,
+            enum=models.Leaderboard.WINDOWS,
+            default=leaderboards.DEFAULT_DAYS,
+            description="Window before the latest ingest.",
+        ),
+        OpenApiParameter(
+            "size",
+            int,
+            default=leaderboards.DEFAULT_SIZE,
+            description=f"Number of games, at most {leaderboards.MAX_SIZE}.",
+        ),
+        *(
+            OpenApiParameter(
+                scope,
+                int,
+                description=f"Only games of the {scope} with this bgg_id. "
+                "Pass at most one of category, mechanic or designer.",
+            )
+            for scope in leaderboards.SCOPE_RELATIONS
+        ),
+    ],
+    responses=serializers.BoardgameLeaderboardSerializer(many=True),
+)
+
+
+class BoardgameViewSet(
+    DataVersionCacheMixin, SparseFieldsViewMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = models.Boardgame.objects.all().order_by("-bgg_rank")
     lookup_field = "bgg_id"
 
+    def get_select_related(self):
+        if "sparkline" in self.get_serializer_context()["include"]:
+            return ["sparkline"]
+        return []
+
+    def get_serializer_context(self):
+        include = self.request.query_params.get("include", "")
+        return {
+            **super().get_serializer_context(),
+            "include": {part.strip() for part in include.split(",") if part.strip()},
+        }
+
     def get_serializer_class(self):
         if self.action == "retrieve":
             return serializers.BoardgameDetailSerializer
-        if self.action == "rank_history":
-            return serializers.BoardgameRankHistorySerializer
+        # Set by the ``serializer_class`` of the extra actions
+        if self.serializer_class is not None:
+            return self.serializer_class
         return serializers.BoardgameListSerializer
 
     def retrieve(self, request, *args, **kwargs):
@@ -45,64 +183,206 @@ class BoardgameViewSet(viewsets.ReadOnlyModelViewSet):
                 {"error": "Invalid date format. Use YYYY-MM-DD."}, status=400
             )
 
-        date_diff = (end_date - start_date).days
+        max_points = request.query_params.get("max_points")
+        if max_points is not None:
+            try:
+                max_points = int(max_points)
+            except ValueError:
+                max_points = 0
+            if max_points < 3:
+                return Response(
+                    {"detail": "max_points must be an integer of at least 3."},
+                    status=400,
+                )
+
         if mode == "auto":
-            if date_diff <= 30:
+            date_diff = (end_date - start_date).days
+            if date_diff <= 30 or max_points is not None:
                 mode = "daily"
             elif date_diff <= 180:
                 mode = "weekly"
             else:
                 mode = "yearly"
 
-        history_qs = models.RankHistory.objects.filter(
-            boardgame=instance, date__range=[start_date, end_date]
-        ).order_by("date")
+        rank_history = []
+        if "bgg_rank_history" in self.get_serializer().fields:
+            rank_history = history.chart_history(
+                instance, start_date, end_date, mode=mode, max_points=max_points
+            )
+        serializer = self.get_serializer(
+            instance,
+            context={**self.get_serializer_context(), "rank_history": rank_history},
+        )
+        return Response(serializer.data)
 
-        history = list(history_qs)
+    @extend_schema(
+        parameters=[_bgg_ids_parameter(BATCH_SIZE), *DATE_RANGE_PARAMETERS],
+        responses=serializers.BoardgameBatchSerializer(many=True),
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        serializer_class=serializers.BoardgameBatchSerializer,
+        pagination_class=None,
+    )
+    def batch(self, request):
+        """Details of many games at once, in the order of ``bgg_ids``.
 
-        if mode == "weekly":
-            history = history[::7]
-        elif mode == "yearly":
-            seen_years = set()
-            yearly_history = []
-            for rh in reversed(history):
-                if rh.date.year not in seen_years:
-                    yearly_history.append(rh)
-                    seen_years.add(rh.date.year)
-            history = sorted(yearly_history, key=lambda x: x.date)
+        ``bgg_ids`` is a comma separated list of at most ``BATCH_SIZE`` ids.
+        The daily rank history between ``start_date`` and ``end_date`` is
+        included when either is given. Unknown ids are left out.
+        """
+        try:
+            bgg_ids = _parse_bgg_ids(request.query_params, BATCH_SIZE)
+            start_date, end_date = _parse_date_range(request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        games = {
+            game.bgg_id: game
+            for game in self.sparse_queryset(
+                models.Boardgame.objects.filter(bgg_id__in=bgg_ids)
+            )
+        }
+        objs = [games[bgg_id] for bgg_id in bgg_ids if bgg_id in games]
 
-        serializer = self.get_serializer(instance)
-        data = serializer.data
+        rank_histories = {}
+        if (
+            objs
+            and "bgg_rank_history" in self.get_serializer().fields
+            and (
+                "start_date" in request.query_params
+                or "end_date" in request.query_params
+            )
+        ):
+            rank_histories = history.daily_histories(
+                [game.pk for game in objs], start_date, end_date
+            )
+        serializer = self.get_serializer(
+            objs,
+            many=True,
+            context={
+                **self.get_serializer_context(),
+                "rank_histories": rank_histories,
+            },
+        )
+        return Response(serializer.data)
 
-        data["bgg_rank_history"] = serializers.RankHistorySerializer(
-            history, many=True
-        ).data
+    @extend_schema(
+        parameters=[
+            _bgg_ids_parameter(COMPARE_SIZE),
+            OpenApiParameter(
+                "metric",
+                str,
+                enum=history.METRICS,
+                default="bgg_rank",
+            ),
+            *DATE_RANGE_PARAMETERS,
+        ],
+        responses=serializers.ComparisonSerializer,
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def compare(self, request):
+        """One metric of several games, aligned on date for a comparison chart.
 
-        return Response(data)
+        Takes at most ``COMPARE_SIZE`` comma separated ``bgg_ids``, a
+        ``metric`` of ``history.METRICS`` (``bgg_rank`` by default) and the
+        ``start_date`` to ``end_date`` range, the last 30 days by default.
+        Unknown ids are left out of ``series``.
+        """
+        metric = request.query_params.get("metric", "bgg_rank")
+        if metric not in history.METRICS:
+            return Response(
+                {"detail": f"metric must be one of {', '.join(history.METRICS)}."},
+                status=400,
+            )
+        try:
+            bgg_ids = _parse_bgg_ids(request.query_params, COMPARE_SIZE)
+            start_date, end_date = _parse_date_range(request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        games = {
+            game.bgg_id: game
+            for game in models.Boardgame.objects.filter(bgg_id__in=bgg_ids).only(
+                "bgg_id"
+            )
+        }
+        objs = [games[bgg_id] for bgg_id in bgg_ids if bgg_id in games]
+        return Response(history.aligned_history(objs, metric, start_date, end_date))
 
     @action(
         detail=True,
         methods=["get"],
         url_path="forecast",
-        serializer_class=serializers.PredictionSerializer,
+        serializer_class=serializers.ForecastSerializer,
     )
     def forecast(self, request, bgg_id=None):
-        game = self.get_object()
+        """Forecast rank and ratings of a game for the next 30 days.
 
-        rank_history = list(game.bgg_rank_history.all().order_by("date"))
+        ``model`` picks one of the forecast models. Without it the stored
+        AutoARIMA forecast is returned, otherwise the stored forecast of the
+        best model that suits the history length and the optional ``max_ms``
+        time budget. Games without a stored forecast get a forecast job and a
+        202 response pointing at it. Stale forecasts the batch after ingest
+        does not refit, of other models or unranked games, are returned as
+        they are while a forecast job refits them.
+        """
+        game = self.get_object()
 
-        if not rank_history:
+        model = request.query_params.get("model")
+        if model is not None and model not in FORECAST_MODELS:
             return Response(
-                {"detail": "No history data available for forecasting."}, status=404
+                {"detail": f"Unknown model. Use one of {', '.join(FORECAST_MODELS)}."},
+                status=400,
             )
-
+        max_ms = request.query_params.get("max_ms")
         try:
-            predictions = forecast_game_ranking(rank_history)
-            serializer = serializers.PredictionSerializer(predictions, many=True)
-            return Response(serializer.data)
+            max_ms = float(max_ms) if max_ms is not None else None
+        except ValueError:
+            return Response({"detail": "max_ms must be a number."}, status=400)
 
-        except Exception as e:
-            return Response({"detail": f"Forecasting failed: {e!s}"}, status=500)
+        forecast = forecasts.get_stored_forecast(game, model or DEFAULT_MODEL)
+        if forecast is None:
+            # Only games added since the last batch run are fitted on request.
+            history = forecasts.load_history(game)
+            if not history:
+                return Response(
+                    {"detail": "No history data available for forecasting."},
+                    status=404,
+                )
+            if model is None:
+                # Fall back to the best model the history and budget allow.
+                model = choose_model(len(history), max_ms)
+                forecast = forecasts.get_stored_forecast(game, model)
+            if forecast is None:
+                # Fitting happens in a worker; the client polls the job.
+                job = forecast_jobs.enqueue_forecast(game, model, history)
+                if job.status == models.ForecastJob.Status.DONE:
+                    # The job's forecast has been replaced or removed since.
+                    return Response(
+                        {"detail": "No forecast is stored for this model."},
+                        status=404,
+                    )
+                location = reverse(
+                    "forecast-job-detail", kwargs={"pk": job.pk}, request=request
+                )
+                return Response(
+                    serializers.ForecastJobSerializer(job).data,
+                    status=202,
+                    headers={"Location": location},
+                )
+
+        serializer = serializers.ForecastSerializer(forecast)
+        if forecast["stale"] and not forecasts.refreshed_after_ingest(
+            game, forecast["model"]
+        ):
+            forecast_jobs.enqueue_forecast(
+                game, forecast["model"], forecasts.load_history(game)
+            )
+            # Not cached, so the refit forecast is served once it is stored.
+            return Response(serializer.data, headers={"Cache-Control": "no-store"})
+        return Response(serializer.data)
 
     @action(
         detail=False,
@@ -110,12 +390,30 @@ class BoardgameViewSet(viewsets.ReadOnlyModelViewSet):
         url_path="rank-history",
         serializer_class=serializers.BoardgameRankHistorySerializer,
     )
-    def rank_history(self, request):  #
-        compare_to = request.query_params.get("compare_to")
+    def rank_history(self, request):
+        """Rank and rating changes of all games since an earlier day.
 
-        if compare_to is None:
-            compare_to = (datetime.datetime.now() - datetime.timedelta(days=7)).date()
-        else:
+        ``days`` (1, 7 or 30, the default is 7) compares with the rank history
+        that many days before the latest ingest, using the changes stored at
+        ingest. Any other ``compare_to`` date, or a period without stored
+        changes yet, is joined from the rank history; archived dates are
+        rejected.
+        ``ordering`` is ``bgg_rank`` or one of the change fields, ``-`` sorts
+        descending; sorting by a change leaves out games without one.
+        """
+        ordering = request.query_params.get("ordering", "bgg_rank")
+        if ordering.removeprefix("-") not in RANK_HISTORY_ORDERINGS:
+            return Response(
+                {
+                    "detail": "Invalid ordering. Use one of "
+                    f"{', '.join(RANK_HISTORY_ORDERINGS)}."
+                },
+                status=400,
+            )
+
+        compare_to = request.query_params.get("compare_to")
+        days = None
+        if compare_to is not None:
             try:
                 compare_to = datetime.datetime.strptime(compare_to, "%Y-%m-%d").date()
             except ValueError:
@@ -123,20 +421,66 @@ class BoardgameViewSet(viewsets.ReadOnlyModelViewSet):
                     {"detail": "Invalid date format. Use YYYY-MM-DD."},
                     status=400,
                 )
+            hot_start = archive.hot_history_start()
+            if hot_start is not None and compare_to < hot_start:
+                return Response(
+                    {
+                        "detail": f"Rank history before {hot_start} is archived. "
+                        f"Use a date from {hot_start} on."
+                    },
+                    status=400,
+                )
+            latest = movers.latest_history_date()
+            if (
+                latest is not None
+                and (latest - compare_to).days in models.Mover.PERIODS
+            ):
+                days = (latest - compare_to).days
+        else:
+            days = request.query_params.get("days", "7")
+            if not days.isdigit() or int(days) not in models.Mover.PERIODS:
+                return Response(
+                    {"detail": "days must be one of 1, 7 or 30."}, status=400
+                )
+            days = int(days)
 
-        history_subquery = models.RankHistory.objects.filter(
-            boardgame=OuterRef("pk"),
-            date=compare_to,
-        )
+        if days is not None and not models.Mover.objects.filter(days=days).exists():
+            # Movers are computed at ingest, until then join the rank history.
+            latest = movers.latest_history_date()
+            if latest is not None:
+                compare_to = latest - datetime.timedelta(days=days)
+                days = None
+
+        if days is not None:
+            objs = models.Boardgame.objects.annotate(
+                mover=FilteredRelation("movers", condition=Q(movers__days=days)),
+                past_rank=F("mover__past_rank"),
+                past_geek_rating=F("mover__past_geek_rating"),
+                past_avg_rating=F("mover__past_avg_rating"),
+                bgg_rank_change=F("mover__bgg_rank_change"),
+                bgg_geek_rating_change=F("mover__bgg_geek_rating_change"),
+                bgg_average_rating_change=F("mover__bgg_average_rating_change"),
+            )
+        else:
+            objs = models.Boardgame.objects.annotate(
+                past=FilteredRelation(
+                    "bgg_rank_history",
+                    condition=Q(bgg_rank_history__date=compare_to),
+                ),
+                past_rank=F("past__bgg_rank"),
+                past_geek_rating=F("past__bgg_geek_rating"),
+                past_avg_rating=F("past__bgg_average_rating"),
+                bgg_rank_change=F("past_rank") - F("bgg_rank"),
+                bgg_geek_rating_change=F("bgg_geek_rating") - F("past_geek_rating"),
+                bgg_average_rating_change=(
+                    F("bgg_average_rating") - F("past_avg_rating")
+                ),
+            )
 
-        objs = models.Boardgame.objects.annotate(
-            past_rank=Subquery(history_subquery.values("bgg_rank")[:1]),
-            past_geek_rating=Subquery(history_subquery.values("bgg_geek_rating")[:1]),
-            past_avg_rating=Subquery(history_subquery.values("bgg_average_rating")[:1]),
-            bgg_rank_change=F("past_rank") - F("bgg_rank"),
-            bgg_geek_rating_change=F("bgg_geek_rating") - F("past_geek_rating"),
-            bgg_average_rating_change=F("bgg_average_rating") - F("past_avg_rating"),
-        ).order_by("bgg_rank")
+        field = ordering.removeprefix("-")
+        if field != "bgg_rank":
+            objs = objs.filter(**{f"{field}__isnull": False})
+        objs = self.sparse_queryset(objs.order_by(ordering, "pk"))
 
         page = self.paginate_queryset(objs)
 
@@ -147,14 +491,146 @@ class BoardgameViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = self.get_serializer(objs, many=True)
         return Response(serializer.data)
 
-    @action(detail=False, methods=["get"])
-    def trending(self, request):
-        objs = models.Boardgame.objects.order_by("-bgg_rank_trend")[:5]
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="as-of",
+        serializer_class=serializers.BoardgameAsOfSerializer,
+        pagination_class=AsOfRankPagination,
+    )
+    def as_of(self, request):
+        """Ranked list of all games as it was on ``date``.
+
+        Dates whose rank history was archived are rejected, see
+        :mod:`api.archive`.
+        """
+        date = request.query_params.get("date")
+        try:
+            date = datetime.datetime.strptime(date or "", "%Y-%m-%d").date()
+        except ValueError:
+            return Response(
+                {"detail": "date is required. Use YYYY-MM-DD."},
+                status=400,
+            )
+        hot_start = archive.hot_history_start()
+        if hot_start is not None and date < hot_start:
+            return Response(
+                {
+                    "detail": f"Rank history before {hot_start} is archived. "
+                    f"Use a date from {hot_start} on."
+                },
+                status=400,
+            )
+
+        objs = self.sparse_queryset(
+            models.Boardgame.objects.annotate(
+                snapshot=FilteredRelation(
+                    "bgg_rank_history", condition=Q(bgg_rank_history__date=date)
+                ),
+                as_of_rank=F("snapshot__bgg_rank"),
+                as_of_geek_rating=F("snapshot__bgg_geek_rating"),
+                as_of_average_rating=F("snapshot__bgg_average_rating"),
+            ).filter(as_of_rank__isnull=False)
+        )
+
+        page = self.paginate_queryset(objs)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def _leaderboard(self, request, direction: str):
+        """Serve one precomputed leaderboard, see :mod:`api.leaderboards`.
+
+        Until the first leaderboards are computed, games are ordered by
+        ``bgg_rank_trend`` and ``bgg_rank_change_percent`` is null.
+        """
+        try:
+            days = int(request.query_params.get("days", leaderboards.DEFAULT_DAYS))
+            size = int(request.query_params.get("size", leaderboards.DEFAULT_SIZE))
+        except ValueError:
+            return Response({"detail": "days and size must be integers."}, status=400)
+        if days not in models.Leaderboard.WINDOWS:
+            return Response({"detail": "days must be one of 7, 30 or 90."}, status=400)
+        if not 1 <= size <= leaderboards.MAX_SIZE:
+            return Response(
+                {"detail": f"size must be between 1 and {leaderboards.MAX_SIZE}."},
+                status=400,
+            )
+
+        scopes = [
+            scope
+            for scope in leaderboards.SCOPE_RELATIONS
+            if scope in request.query_params
+        ]
+        if len(scopes) > 1:
+            return Response(
+                {"detail": "Pass at most one of category, mechanic or designer."},
+                status=400,
+            )
+        scope, scope_id = "overall", 0
+        if scopes:
+            scope = scopes[0]
+            try:
+                scope_id = int(request.query_params[scope])
+            except ValueError:
+                return Response(
+                    {"detail": f"{scope} must be an integer bgg_id."}, status=400
+                )
+
+        ranking = leaderboards.get_leaderboard(direction, days, scope, scope_id)
+        if ranking is None:
+            # No board computed yet, order by the stored trend instead.
+            trend = F("bgg_rank_trend")
+            queryset = models.Boardgame.objects.filter(bgg_rank_trend__isnull=False)
+            if scope != "overall":
+                relation = leaderboards.SCOPE_RELATIONS[scope]
+                queryset = queryset.filter(**{f"{relation}__bgg_id": scope_id})
+            objs = self.sparse_queryset(
+                queryset.annotate(
+                    bgg_rank_change_percent=Value(None, output_field=FloatField())
+                ).order_by(
+                    trend.desc() if direction == "trending" else trend.asc(), "pk"
+                )
+            )[:size]
+            serializer = self.get_serializer(objs, many=True)
+            return Response(serializer.data)
+
+        ranking = ranking[:size]
+        games = self.sparse_queryset(models.Boardgame.objects.all()).in_bulk(
+            [pk for pk, _ in ranking]
+        )
+        objs = []
+        for pk, score in ranking:
+            # Games deleted since the ingest are left out.
+            if (game := games.get(pk)) is not None:
+                game.bgg_rank_change_percent = score
+                objs.append(game)
         serializer = self.get_serializer(objs, many=True)
         return Response(serializer.data)
 
-    @action(detail=False, methods=["get"])
+    @LEADERBOARD_SCHEMA
+    @action(
+        detail=False,
+        methods=["get"],
+        serializer_class=serializers.BoardgameLeaderboardSerializer,
+        pagination_class=None,
+    )
+    def trending(self, request):
+        """Games whose rank improved the most, relative to their past rank.
+
+        ``days`` (7, 30 or 90, the default is 30) is the window before the
+        latest ingest, ``size`` the number of games (5 by default, at most
+        100). ``category``, ``mechanic`` or ``designer`` restrict the board
+        to the games of one entry by its bgg_id.
+        """
+        return self._leaderboard(request, "trending")
+
+    @LEADERBOARD_SCHEMA
+    @action(
+        detail=False,
+        methods=["get"],
+        serializer_class=serializers.BoardgameLeaderboardSerializer,
+        pagination_class=None,
+    )
     def declining(self, request):
-        objs = models.Boardgame.objects.order_by("bgg_rank_trend")[:5]
-        serializer = self.get_serializer(objs, many=True)
-        return Response(serializer.data)
+        """Games whose rank worsened the most, with the parameters of trending."""
+        return self._leaderboard(request, "declining")
@@ -0,0 +1,44 @@
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .. import changes, serializers
+
+DEFAULT_LIMIT = 500
+
+
+class ChangesView(APIView):
+    """Rows created, modified or deleted since the ``since`` token.
+
+    Start without ``since`` to receive everything, then pass the ``next``
+    token of the last page. Keep requesting while ``has_more`` is true.
+    """
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "since",
+                str,
+                description="The next token of the previous page.",
+            ),
+            OpenApiParameter(
+                "limit",
+                int,
+                description=f"Rows per feed, {DEFAULT_LIMIT} by default, at most "
+                f"{changes.MAX_LIMIT}.",
+            ),
+        ],
+        responses=serializers.ChangesPageSerializer,
+    )
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            return Response({"detail": "limit must be an integer."}, status=400)
+        limit = max(1, min(limit, changes.MAX_LIMIT))
+
+        try:
+            page = changes.changes_since(request.query_params.get("since"), limit)
+        except changes.InvalidTokenError as e:
+            return Response({"detail": str(e)}, status=400)
+        return Response(page)
@@ -0,0 +1,112 @@
+import datetime
+from typing import ClassVar
+
+from django.http import Http404, StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from .. import export, renderers
+
+EXPORT_RENDERERS = (
+    renderers.NDJSONExportRenderer,
+    renderers.CSVExportRenderer,
+    renderers.ParquetExportRenderer,
+)
+
+
+class ExportView(APIView):
+    """Bulk download of a whole dataset as NDJSON, CSV or Parquet.
+
+    The format is the extension of the path. Without one, it is negotiated
+    from ``Accept`` or ``?format=``. ``rank-history`` exports cover
+    ``start_date`` to ``end_date``, the last 30 days by default.
+    """
+
+    renderer_classes: ClassVar[list] = [
+        *api_settings.DEFAULT_RENDERER_CLASSES,
+        *EXPORT_RENDERERS,
+    ]
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if isinstance(
+            getattr(request, "accepted_renderer", None), renderers.ExportRenderer
+        ):
+            # Errors are sent as JSON, whichever export format was accepted.
+            request.accepted_renderer = renderers.ORJSONRenderer()
+            request.accepted_media_type = renderers.ORJSONRenderer.media_type
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "dataset",
+                str,
+                OpenApiParameter.PATH,
+                enum=export.DATASETS,
+            ),
+            OpenApiParameter(
+                "start_date",
+                OpenApiTypes.DATE,
+                description="First day of a rank-history export, 30 days "
+                "before end_date by default.",
+            ),
+            OpenApiParameter(
+                "end_date",
+                OpenApiTypes.DATE,
+                description="Last day of a rank-history export, today by default.",
+            ),
+        ],
+        responses={
+            (200, renderer.media_type): OpenApiTypes.BINARY
+            for renderer in EXPORT_RENDERERS
+        },
+    )
+    def get(self, request, dataset, file_format=None):
+        if file_format is None:
+            if not isinstance(request.accepted_renderer, renderers.ExportRenderer):
+                media_types = ", ".join(r.media_type for r in EXPORT_RENDERERS)
+                return Response(
+                    {
+                        "detail": f"Accept one of {media_types}, or add the "
+                        "format to the path."
+                    },
+                    status=406,
+                )
+            file_format = request.accepted_renderer.format
+        if dataset not in export.DATASETS or file_format not in export.FORMATS:
+            raise Http404
+
+        start_date = end_date = None
+        if dataset == "rank-history":
+            start_date_str = request.query_params.get("start_date")
+            end_date_str = request.query_params.get("end_date")
+            try:
+                end_date = (
+                    datetime.datetime.strptime(end_date_str, "%Y-%m-%d").date()
+                    if end_date_str
+                    else datetime.datetime.now().date()
+                )
+                start_date = (
+                    datetime.datetime.strptime(start_date_str, "%Y-%m-%d").date()
+                    if start_date_str
+                    else end_date - datetime.timedelta(days=30)
+                )
+            except ValueError:
+                return Response(
+                    {"detail": "Invalid date format. Use YYYY-MM-DD."}, status=400
+                )
+
+        try:
+            chunks = export.stream_export(dataset, file_format, start_date, end_date)
+        except export.ExportError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        response = StreamingHttpResponse(
+            chunks, content_type=export.FORMATS[file_format]
+        )
+        filename = export.export_name(dataset, file_format, start_date, end_date)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
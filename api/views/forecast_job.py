@@ -0,0 +1,11 @@
+from rest_framework import mixins, viewsets
+
+from .. import models
+from .. import serializers
+
+
+class ForecastJobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """Status of forecast jobs queued by the boardgame forecast endpoint."""
+
+    queryset = models.ForecastJob.objects.select_related("boardgame")
+    serializer_class = serializers.ForecastJobSerializer
@@ -1,24 +1,100 @@
-from rest_framework.views import APIView
+import math
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Coalesce, Ln
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework.response import Response
-from .. import models, serializers
+from rest_framework.views import APIView
+
+from .. import fieldsets, models, serializers
+from ..cache import DataVersionCacheMixin
+
+SEARCH_LIMIT = 10
+
+# Entity types in the order they are searched, with their list serializers.
+SEARCH_TARGETS = [
+    ("boardgame", models.Boardgame, serializers.BoardgameListSerializer),
+    ("category", models.Category, serializers.CategoryListSerializer),
+    ("designer", models.Designer, serializers.DesignerListSerializer),
+    ("family", models.Family, serializers.FamilyListSerializer),
+    ("mechanic", models.Mechanic, serializers.MechanicListSerializer),
+]
+
+
+def _search(queryset, query: str):
+    """Filter ``queryset`` by ``query`` and annotate a relevance ``score``.
+
+    Matches either the full-text vector or the trigram word similarity of the
+    name, so both whole words and misspelt fragments are found. Both filters
+    are served by the GIN indexes on ``name``.
+    """
+    vector = SearchVector("name", config="simple")
+    search_query = SearchQuery(query, config="simple", search_type="websearch")
+    return (
+        queryset.alias(search=vector, similarity=TrigramWordSimilarity(query, "name"))
+        .annotate(score=F("similarity") + SearchRank(vector, search_query))
+        .filter(Q(search=search_query) | Q(name__trigram_word_similar=query))
+        .order_by("-score")
+    )
+
+
+def _boost_by_rank(queryset):
+    """Favour well-ranked boardgames among equally similar names."""
+    return queryset.annotate(
+        score=F("score")
+        * (
+            Value(1.0)
+            + Value(1.0)
+            / Ln(
+                Coalesce("bgg_rank", Value(100_000), output_field=FloatField())
+                + Value(math.e)
+            )
+        )
+    ).order_by("-score", "bgg_rank")
 
 
-class SearchView(APIView):
+class SearchView(DataVersionCacheMixin, APIView):
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "query",
+                str,
+                description=f"Words to search for. Up to {SEARCH_LIMIT} matches "
+                "of each entity type are ranked together.",
+            ),
+            *fieldsets.PARAMETERS,
+        ],
+        responses=serializers.SearchResultSerializer(many=True),
+    )
     def get(self, request):
         query = request.query_params.get("query", "")
         if not query:
             return Response({"boardgames": [], "categories": []})
 
-        boardgames = models.Boardgame.objects.filter(name__icontains=query)[:10]
-        categories = models.Category.objects.filter(name__icontains=query)[:10]
+        # ``fields`` and ``exclude`` apply to the ``data`` of every result.
+        context = fieldsets.requested_fields(request.query_params)
+        results = []
+        for type_, model, serializer_class in SEARCH_TARGETS:
+            queryset = _search(model.objects.all(), query)
+            if model is models.Boardgame:
+                queryset = _boost_by_rank(queryset)
+            queryset = fieldsets.sparse_queryset(
+                queryset, serializer_class(context=context)
+            )
+            hits = list(queryset[:SEARCH_LIMIT])
+            data = serializer_class(hits, many=True, context=context).data
+            results.extend(
+                {"type": type_, "score": hit.score, "data": item}
+                for hit, item in zip(hits, data, strict=True)
+            )
 
-        results = [
-            {"type": "boardgame", "data": serializers.BoardgameListSerializer(bg).data}
-            for bg in boardgames
-        ] + [
-            {"type": "category", "data": serializers.CategoryListSerializer(cat).data}
-            for cat in categories
-        ]
+        results.sort(key=lambda result: result["score"], reverse=True)
 
         serializer = serializers.SearchResultSerializer(results, many=True)
         return Response(serializer.data)
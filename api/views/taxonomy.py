@@ -0,0 +1,82 @@
+from django.db.models import F
+from rest_framework import viewsets
+from rest_framework.response import Response
+
+from ..cache import DataVersionCacheMixin
+from ..fieldsets import SparseFieldsViewMixin
+from ..pagination import KnownCountPagination
+
+TAXONOMY_ORDERINGS = ("name", "game_count", "mean_geek_rating", "mean_trend")
+
+
+class TaxonomyViewSet(
+    DataVersionCacheMixin, SparseFieldsViewMixin, viewsets.ReadOnlyModelViewSet
+):
+    """Categories, designers, families or mechanics and their games.
+
+    Subclasses set ``queryset``, ``serializer_class`` and
+    ``detail_serializer_class``.
+    """
+
+    lookup_field = "bgg_id"
+    detail_serializer_class = None
+    pagination_class = KnownCountPagination
+
+    def get_serializer_class(self):
+        if self.action == "retrieve":
+            return self.detail_serializer_class
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        """All entries with the aggregates of their games.
+
+        ``ordering`` is ``name`` (the default) or one of ``game_count``,
+        ``mean_geek_rating`` and ``mean_trend``, ``-`` sorts descending.
+        Entries without a value sort last either way.
+        """
+        ordering = request.query_params.get("ordering", "name")
+        field = ordering.removeprefix("-")
+        if field not in TAXONOMY_ORDERINGS:
+            return Response(
+                {
+                    "detail": "Invalid ordering. Use one of "
+                    f"{', '.join(TAXONOMY_ORDERINGS)}."
+                },
+                status=400,
+            )
+        if ordering.startswith("-"):
+            order = F(field).desc(nulls_last=True)
+        else:
+            order = F(field).asc(nulls_last=True)
+        queryset = self.get_queryset().order_by(order, "pk")
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        """One entry with its aggregates and a page of its games by rank.
+
+        The games are paginated like lists, with ``page`` and Link headers,
+        counted by the precomputed ``game_count`` once it is set.
+        """
+        instance = self.get_object()
+        if "boardgames" not in self.get_serializer().fields:
+            return Response(self.get_serializer(instance).data)
+
+        # 0 until the first stats refresh, the games are counted then.
+        self.paginator.count = instance.game_count or None
+        games = self.paginate_queryset(
+            instance.boardgames.order_by(F("bgg_rank").asc(nulls_last=True), "pk").only(
+                "id", "name", "bgg_id", "bgg_rank"
+            )
+        )
+        serializer = self.get_serializer(
+            instance,
+            context={**self.get_serializer_context(), "boardgames": games},
+        )
+        return self.get_paginated_response(serializer.data)
@@ -20,5 +20,10 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "saboga_project.settings")
 # create the standard Django ASGI application first
 application = get_asgi_application()
 
+# Build the in-process autocomplete index before the first request arrives.
+from api import autocomplete  # noqa: E402
+
+autocomplete.warm_up()
+
 # django_prometheus middleware configured in settings will expose
 # `/metrics` automatically; no further wrapping is necessary.
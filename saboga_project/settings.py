@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "django_extensions",
     "rest_framework",
     "drf_spectacular",
@@ -51,6 +52,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django_prometheus.middleware.PrometheusBeforeMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "api.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -139,6 +141,36 @@ MEDIA_ROOT = BASE_DIR / "img"
 STATIC_URL = "/api/static/"
 MEDIA_URL = "/api/img/"
 
+# Data derived from the boardgame tables, rewritten after every ingest
+CACHE_ROOT = BASE_DIR / "cache"
+AUTOCOMPLETE_SNAPSHOT = CACHE_ROOT / "autocomplete.json.gz"
+
+# Caching
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Rendered API responses, keyed on the data version bumped by every ingest
+    "responses": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": CACHE_ROOT / "responses",
+        "TIMEOUT": 60 * 60 * 48,
+        "OPTIONS": {"MAX_ENTRIES": 50_000},
+    },
+}
+
+
+# Forecast jobs requested through the API: "local" fits them in a process
+# pool of the web server, "database" leaves them to `manage.py run_forecast_jobs`
+FORECAST_JOB_BACKEND = os.getenv("FORECAST_JOB_BACKEND", "local")
+FORECAST_WORKERS = int(os.getenv("FORECAST_WORKERS", "2"))
+
+# Rank history older than this many days is moved to the packed yearly
+# archive by `manage.py archive_history`
+RANK_HISTORY_HOT_DAYS = int(os.getenv("RANK_HISTORY_HOT_DAYS", "730"))
+
 
 # BGG credentials (for scraping)
 BGG_USERNAME = os.getenv("BGG_USERNAME", "")
@@ -147,6 +179,17 @@ BGG_API_KEY = os.getenv("BGG_API_KEY", "")
 
 
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.ORJSONRenderer",
+        "api.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.renderers.ORJSONParser",
+        "api.renderers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_PAGINATION_CLASS": "drf_link_header_pagination.LinkHeaderPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
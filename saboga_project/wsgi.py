@@ -13,3 +13,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "saboga_project.settings")
 
 application = get_wsgi_application()
+
+# Build the in-process autocomplete index before the first request arrives.
+from api import autocomplete  # noqa: E402
+
+autocomplete.warm_up()
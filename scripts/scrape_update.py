@@ -17,6 +17,7 @@ from django.utils import timezone
 
 from api import models
 from django.conf import settings as django_settings
+from api.ingest import after_ingest
 from api.logger import configure_logger
 from api.statistics.trending import calculate_trends
 from api.statistics.volatility import calculate_volatility
@@ -202,4 +203,6 @@ def insert_games(games_df: pd.DataFrame) -> tuple[list[models.Boardgame], int]:
 def run() -> tuple[list[models.Boardgame], int]:
     """Run the full update cycle (download + insert)."""
     df = download_zip()
-    return insert_games(df)
+    result = insert_games(df)
+    after_ingest()
+    return result
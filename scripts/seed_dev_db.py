@@ -22,7 +22,7 @@ from faker import Faker
 from PIL import Image, ImageDraw, ImageFont
 from django.core.files import File
 
-from api import models
+from api import models, partitions
 from api.statistics import calculate_trends, calculate_volatility
 
 # set up Django environment
@@ -199,6 +199,10 @@ def generate_data():
     models.Designer.objects.all().delete()
     models.Family.objects.all().delete()
     models.Mechanic.objects.all().delete()
+    # The history reaches back into months the migrations made no partition for.
+    partitions.ensure_partitions(
+        since=datetime.date.today() - datetime.timedelta(days=HISTORY_DAYS)
+    )
 
     # create static lookup tables
     designers = [
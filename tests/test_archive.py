@@ -0,0 +1,56 @@
+import datetime
+
+import pytest
+
+from api import archive, models
+
+
+def _entry(date, rank, geek, average):
+    return {
+        "date": date,
+        "bgg_rank": rank,
+        "bgg_geek_rating": geek,
+        "bgg_average_rating": average,
+    }
+
+
+def _unpack(year: int, entries: list[dict]) -> list[dict]:
+    return archive.unpack(models.RankHistoryArchive(year=year, **archive.pack(entries)))
+
+
+def test_round_trip():
+    entries = [
+        _entry(datetime.date(2024, 1, 1), 12, 7.5, 8.25),
+        _entry(datetime.date(2024, 2, 29), 11, 7.625, 8.5),
+        _entry(datetime.date(2024, 12, 31), 9, 7.75, 8.0),
+    ]
+    assert _unpack(2024, entries) == [{"id": None, **entry} for entry in entries]
+
+
+def test_missing_values():
+    entries = [_entry(datetime.date(2023, 6, 1), None, None, None)]
+    assert _unpack(2023, entries) == [{"id": None, **entries[0]}]
+
+
+def test_ratings_are_float32():
+    [entry] = _unpack(2023, [_entry(datetime.date(2023, 6, 1), 1, 7.1, 8.3)])
+    assert entry["bgg_geek_rating"] == pytest.approx(7.1, abs=1e-6)
+    assert entry["bgg_average_rating"] == pytest.approx(8.3, abs=1e-6)
+
+
+def test_packed_sizes():
+    entries = [
+        _entry(datetime.date(2023, 1, 1) + datetime.timedelta(days=day), 1, 7, 8)
+        for day in range(365)
+    ]
+    packed = archive.pack(entries)
+    assert {name: len(blob) for name, blob in packed.items()} == {
+        "days": 2 * 365,
+        "ranks": 4 * 365,
+        "geek_ratings": 4 * 365,
+        "average_ratings": 4 * 365,
+    }
+
+
+def test_empty():
+    assert _unpack(2023, []) == []
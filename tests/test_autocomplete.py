@@ -0,0 +1,82 @@
+import gzip
+import json
+
+from api import autocomplete
+from api.autocomplete import MAX_RESULTS, UNRANKED_WEIGHT, AutocompleteIndex
+
+BOARDGAME = autocomplete.ENTITY_TYPES.index("boardgame")
+MECHANIC = autocomplete.ENTITY_TYPES.index("mechanic")
+
+
+def _index(entries: list[tuple[int, str, int]], type_: int = BOARDGAME):
+    return AutocompleteIndex(
+        [type_] * len(entries),
+        [bgg_id for bgg_id, _, _ in entries],
+        [name for _, name, _ in entries],
+        [weight for _, _, weight in entries],
+    )
+
+
+def _names(results: list[dict]) -> list[str]:
+    return [result["name"] for result in results]
+
+
+def test_prefix_of_any_word():
+    index = _index([(1, "Twilight Struggle", 10), (2, "Struggle of Empires", 20)])
+    assert _names(index.search("strug")) == ["Twilight Struggle", "Struggle of Empires"]
+
+
+def test_best_rank_first():
+    index = _index([(1, "Catan", 300), (2, "Carcassonne", 200), (3, "Cascadia", 100)])
+    assert _names(index.search("ca")) == ["Cascadia", "Carcassonne", "Catan"]
+    assert _names(index.search("ca", limit=1)) == ["Cascadia"]
+
+
+def test_every_word_must_match():
+    index = _index([(1, "Magic Maze", 10), (2, "Magic Realm", 20)])
+    assert _names(index.search("mag maz")) == ["Magic Maze"]
+    assert index.search("mag xyz") == []
+
+
+def test_short_terms_beyond_the_precomputed_lists():
+    # More than MAX_RESULTS better ranked entries start with "ca", so the
+    # precomputed list of "ca" does not contain the only match of "ca ma".
+    entries = [(i, f"Card {i}", i) for i in range(1, MAX_RESULTS + 10)]
+    entries.append((1000, "Catan Magic", 1000))
+    index = _index(entries)
+    assert _names(index.search("ca ma")) == ["Catan Magic"]
+    assert _names(index.search("ma ca")) == ["Catan Magic"]
+
+
+def test_diacritics_and_case():
+    index = _index([(1, "Café International", 10)])
+    assert _names(index.search("CAFE")) == ["Café International"]
+    assert _names(index.search("café int")) == ["Café International"]
+
+
+def test_result_fields():
+    index = _index([(7, "Deck Building", UNRANKED_WEIGHT)], type_=MECHANIC)
+    assert index.search("deck") == [
+        {"type": "mechanic", "bgg_id": 7, "name": "Deck Building", "bgg_rank": None}
+    ]
+
+
+def test_empty_query():
+    index = _index([(1, "Catan", 1)])
+    assert index.search("") == []
+    assert index.search(" - ") == []
+
+
+def test_load_snapshot(tmp_path):
+    path = tmp_path / "autocomplete.json.gz"
+    snapshot = {
+        "types": [BOARDGAME],
+        "bgg_ids": [13],
+        "names": ["Catan"],
+        "weights": [400],
+    }
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    index = autocomplete.load_snapshot(path)
+    assert len(index) == 1
+    assert index.search("cat")[0]["bgg_rank"] == 400
@@ -0,0 +1,90 @@
+from typing import ClassVar
+
+import pytest
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from api import cache
+
+
+class CountingView(cache.DataVersionCacheMixin, APIView):
+    # The cache only looks for credentials, they are never checked.
+    authentication_classes: ClassVar[list] = []
+    renders = 0
+
+    def get(self, request):
+        CountingView.renders += 1
+        return Response({"renders": CountingView.renders})
+
+
+@pytest.fixture(autouse=True)
+def responses_cache():
+    settings = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        cache.RESPONSE_CACHE: {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "test-responses",
+        },
+    }
+    with override_settings(CACHES=settings):
+        caches[cache.RESPONSE_CACHE].clear()
+        yield
+    CountingView.renders = 0
+
+
+@pytest.fixture
+def version(monkeypatch):
+    """Data version read by the cache, bumped by incrementing ``[0]``."""
+    current = [1]
+    monkeypatch.setattr(
+        cache, "get_data_version", lambda: (current[0], 1_700_000_000.0)
+    )
+    return current
+
+
+def _get(accept="application/json", **headers):
+    request = APIRequestFactory().get("/counting/", HTTP_ACCEPT=accept, **headers)
+    return CountingView.as_view()(request)
+
+
+def test_cached_until_bump(version):
+    first = _get()
+    assert first.status_code == 200
+    assert _get().content == first.content
+    assert CountingView.renders == 1
+
+    version[0] += 1
+    second = _get()
+    assert CountingView.renders == 2
+    assert second["ETag"] != first["ETag"]
+
+
+def test_conditional_get(version):
+    etag = _get()["ETag"]
+    response = _get(HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    assert CountingView.renders == 1
+
+    version[0] += 1
+    assert _get(HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_public_cache_control(version):
+    assert _get()["Cache-Control"] == "public, no-cache"
+
+
+def test_authenticated_responses_are_private(version):
+    response = _get(HTTP_AUTHORIZATION="Basic dXNlcjpwYXNz")
+    assert response["Cache-Control"] == "private, no-cache"
+
+
+def test_browsable_api_is_not_cached(version):
+    first = _get(accept="text/html")
+    assert first["Content-Type"].startswith("text/html")
+    _get(accept="text/html")
+    assert CountingView.renders == 2
+    assert "ETag" not in first
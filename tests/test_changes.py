@@ -0,0 +1,52 @@
+import base64
+import datetime
+
+import pytest
+
+from api import changes, serializers
+
+
+def test_round_trip():
+    cursor = {
+        "boardgames": (
+            datetime.datetime(2026, 10, 19, 8, 30, 1, 250, datetime.UTC),
+            42,
+        ),
+        "deleted": (datetime.datetime(2026, 10, 18, tzinfo=datetime.UTC), 0),
+    }
+    assert changes.decode_token(changes.encode_token(cursor)) == cursor
+
+
+def test_token_is_url_safe():
+    cursor = {"rank_history": (datetime.datetime(2026, 1, 1, tzinfo=datetime.UTC), 7)}
+    token = changes.encode_token(cursor)
+    assert "=" not in token
+    assert "+" not in token
+    assert "/" not in token
+
+
+def test_empty_cursor():
+    assert changes.decode_token(changes.encode_token({})) == {}
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not a token!",
+        base64.urlsafe_b64encode(b"not json").decode(),
+        base64.urlsafe_b64encode(b"[1, 2]").decode(),
+        base64.urlsafe_b64encode(b'{"boardgames": "x"}').decode(),
+        base64.urlsafe_b64encode(b'{"boardgames": ["yesterday", 1]}').decode(),
+        base64.urlsafe_b64encode(b'{"boardgames": ["2026-01-01", "x"]}').decode(),
+    ],
+)
+def test_invalid_token(token):
+    with pytest.raises(changes.InvalidTokenError):
+        changes.decode_token(token)
+
+
+def test_schema_lists_every_feed():
+    fields = serializers.ChangesSerializer().fields
+    assert list(fields) == [name for name, _, _ in changes.FEEDS]
+    for name, _, serializer_class in changes.FEEDS:
+        assert type(fields[name].child) is serializer_class
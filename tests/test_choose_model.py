@@ -0,0 +1,42 @@
+import pytest
+
+from api.statistics import DEFAULT_MODEL, FORECAST_MODELS, choose_model
+
+
+def test_long_history_gets_the_default_model():
+    assert choose_model(365) == DEFAULT_MODEL
+
+
+@pytest.mark.parametrize(
+    ("history_length", "expected"),
+    [(30, "auto_arima"), (29, "ets"), (10, "ets"), (9, "naive_drift")],
+)
+def test_min_history(history_length, expected):
+    assert choose_model(history_length) == expected
+
+
+@pytest.mark.parametrize(
+    ("max_ms", "expected"),
+    [(1000, "auto_arima"), (500, "auto_arima"), (499, "ets"), (20, "theta")],
+)
+def test_budget(max_ms, expected):
+    assert choose_model(365, max_ms) == expected
+
+
+def test_budget_and_history_combined():
+    # ets is too slow and theta needs 14 entries
+    assert choose_model(12, max_ms=50) == "naive_drift"
+    assert choose_model(14, max_ms=50) == "theta"
+
+
+def test_nothing_fits_falls_back_to_naive_drift():
+    assert choose_model(1) == "naive_drift"
+    assert choose_model(365, max_ms=0) == "naive_drift"
+
+
+@pytest.mark.parametrize("history_length", [2, 7, 14, 30, 365])
+@pytest.mark.parametrize("max_ms", [None, 3, 15, 80, 500])
+def test_choice_respects_its_constraints(history_length, max_ms):
+    model = FORECAST_MODELS[choose_model(history_length, max_ms)]
+    assert model.min_history <= history_length
+    assert max_ms is None or model.fit_ms <= max_ms
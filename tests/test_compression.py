@@ -0,0 +1,51 @@
+import zlib
+
+import brotli
+import pytest
+import zstandard
+
+from api import compression
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, deflate, br, zstd", "br"),
+        ("gzip, zstd", "zstd"),
+        ("GZIP", "gzip"),
+        ("br;q=0.5, gzip;q=0.8", "gzip"),
+        ("br;q=0.8, zstd;q=0.8, gzip;q=0.8", "br"),
+        ("br;q=0, gzip", "gzip"),
+        ("br ; q=0.9, zstd ; q=1.0", "zstd"),
+        ("*", "br"),
+        ("*;q=0.5, br;q=0", "zstd"),
+        ("gzip;q=0", None),
+        ("br;q=invalid, gzip;q=0.1", "gzip"),
+        ("deflate, compress", None),
+    ],
+)
+def test_negotiate(accept_encoding, expected):
+    assert compression.negotiate(accept_encoding) == expected
+
+
+@pytest.mark.parametrize(
+    ("encoding", "decompress"),
+    [
+        ("br", brotli.decompress),
+        # Streamed frames do not store their content size
+        (
+            "zstd",
+            lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+        ),
+        ("gzip", lambda data: zlib.decompress(data, wbits=31)),
+    ],
+)
+def test_compress_round_trip(encoding, decompress):
+    content = b'{"bgg_rank": 1}' * 1000
+    assert decompress(compression.compress(content, encoding)) == content
+    chunks = [content[:100], b"", content[100:]]
+    stream = b"".join(compression.compress_stream(chunks, encoding))
+    assert decompress(stream) == content
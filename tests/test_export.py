@@ -0,0 +1,83 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from api import export
+from api.views import ExportView
+
+
+@pytest.fixture(autouse=True)
+def stream_export(monkeypatch):
+    """Record the requested exports instead of reading the database."""
+    calls = []
+
+    def fake_stream_export(dataset, file_format, start_date=None, end_date=None):
+        calls.append((dataset, file_format))
+        return iter([b"rows"])
+
+    monkeypatch.setattr(export, "stream_export", fake_stream_export)
+    return calls
+
+
+def _media_type(file_format):
+    return export.FORMATS[file_format].split(";")[0]
+
+
+def _get(path, accept=None, **kwargs):
+    headers = {} if accept is None else {"HTTP_ACCEPT": accept}
+    request = APIRequestFactory().get(f"/export/{path}", **headers)
+    return ExportView.as_view()(request, **kwargs)
+
+
+@pytest.mark.parametrize("file_format", export.FORMATS)
+def test_accept_header(stream_export, file_format):
+    response = _get("boardgames", _media_type(file_format), dataset="boardgames")
+    assert response.status_code == 200
+    assert response["Content-Type"] == export.FORMATS[file_format]
+    assert b"".join(response.streaming_content) == b"rows"
+    assert stream_export == [("boardgames", file_format)]
+
+
+@pytest.mark.parametrize("file_format", export.FORMATS)
+def test_accept_header_with_extension(stream_export, file_format):
+    response = _get(
+        f"boardgames.{file_format}",
+        _media_type(file_format),
+        dataset="boardgames",
+        file_format=file_format,
+    )
+    assert response.status_code == 200
+    assert stream_export == [("boardgames", file_format)]
+
+
+def test_extension_wins_over_accept(stream_export):
+    response = _get(
+        "boardgames.csv",
+        "application/x-ndjson",
+        dataset="boardgames",
+        file_format="csv",
+    )
+    assert response.status_code == 200
+    assert stream_export == [("boardgames", "csv")]
+
+
+def test_format_query_parameter(stream_export):
+    request = APIRequestFactory().get("/export/boardgames", {"format": "parquet"})
+    response = ExportView.as_view()(request, dataset="boardgames")
+    assert response.status_code == 200
+    assert stream_export == [("boardgames", "parquet")]
+
+
+def test_no_export_format_accepted(stream_export):
+    response = _get("boardgames", "application/json", dataset="boardgames")
+    assert response.status_code == 406
+    assert stream_export == []
+
+
+def test_errors_are_json():
+    request = APIRequestFactory().get(
+        "/export/rank-history", {"start_date": "yesterday"}, HTTP_ACCEPT="text/csv"
+    )
+    response = ExportView.as_view()(request, dataset="rank-history").render()
+    assert response.status_code == 400
+    assert response["Content-Type"] == "application/json"
+    assert b"YYYY-MM-DD" in response.content
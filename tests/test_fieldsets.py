@@ -0,0 +1,76 @@
+from django.http import QueryDict
+
+from api import fieldsets, models, serializers
+
+
+def _context(query: str) -> dict:
+    return fieldsets.requested_fields(QueryDict(query))
+
+
+def _loaded(queryset) -> tuple[set[str], tuple[str, ...]]:
+    names, defer = queryset.query.deferred_loading
+    assert not defer
+    return set(names), queryset._prefetch_related_lookups  # noqa: SLF001
+
+
+def test_requested_fields():
+    assert _context("fields=name, bgg_id,,&exclude=id") == {
+        "fields": {"name", "bgg_id"},
+        "exclude": {"id"},
+    }
+    assert _context("") == {"fields": None, "exclude": set()}
+
+
+def test_serializer_drops_unrequested_fields():
+    serializer = serializers.CategoryListSerializer(
+        context=_context("fields=name,bgg_id,unknown&exclude=bgg_id")
+    )
+    assert list(serializer.fields) == ["name"]
+
+
+def test_serializer_keeps_every_field_by_default():
+    serializer = serializers.CategoryListSerializer(context=_context(""))
+    assert list(serializer.fields) == ["id", "name", "bgg_id", "type"]
+
+
+def test_columns_of_requested_fields():
+    serializer = serializers.BoardgameListSerializer(
+        context=_context("fields=bgg_id,name")
+    )
+    queryset = fieldsets.sparse_queryset(models.Boardgame.objects.all(), serializer)
+    assert _loaded(queryset) == ({"bgg_id", "name"}, ())
+
+
+def test_prefetches_requested_relations():
+    serializer = serializers.BoardgameListSerializer(
+        context=_context("fields=name,mechanics")
+    )
+    queryset = fieldsets.sparse_queryset(models.Boardgame.objects.all(), serializer)
+    assert _loaded(queryset) == ({"name"}, ("mechanics",))
+
+
+def test_excluded_relations_are_not_prefetched():
+    serializer = serializers.BoardgameListSerializer(
+        context=_context("exclude=categories,designers,families")
+    )
+    columns, prefetches = _loaded(
+        fieldsets.sparse_queryset(models.Boardgame.objects.all(), serializer)
+    )
+    assert prefetches == ("mechanics",)
+    assert {"bgg_rank", "thumbnail"} <= columns
+    assert "description" not in columns
+
+
+def test_select_related_columns_are_kept():
+    serializer = serializers.BoardgameListSerializer(context=_context("fields=name"))
+    queryset = fieldsets.sparse_queryset(
+        models.Boardgame.objects.all(), serializer, select_related=["sparkline"]
+    )
+    assert _loaded(queryset) == ({"name", "sparkline"}, ())
+    assert queryset.query.select_related == {"sparkline": {}}
+
+
+def test_other_models_are_unchanged():
+    queryset = models.Category.objects.all()
+    serializer = serializers.BoardgameListSerializer(context=_context("fields=name"))
+    assert fieldsets.sparse_queryset(queryset, serializer) is queryset
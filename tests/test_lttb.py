@@ -0,0 +1,57 @@
+import datetime
+
+import pytest
+
+from api.statistics import lttb
+
+START = datetime.date(2026, 1, 1)
+
+
+def _points(ranks: list[int | None]) -> list[dict]:
+    return [
+        {"date": START + datetime.timedelta(days=day), "bgg_rank": rank}
+        for day, rank in enumerate(ranks)
+    ]
+
+
+@pytest.mark.parametrize("max_points", [3, 10, 99])
+def test_keeps_endpoints_and_size(max_points):
+    points = _points([100 + day % 7 for day in range(365)])
+    sampled = lttb(points, max_points)
+    assert len(sampled) == max_points
+    assert sampled[0] is points[0]
+    assert sampled[-1] is points[-1]
+    dates = [point["date"] for point in sampled]
+    assert dates == sorted(set(dates))
+
+
+@pytest.mark.parametrize("max_points", [2, 5, 6])
+def test_short_series_pass_through(max_points):
+    points = _points([5, 4, 3, 2, 1])
+    assert lttb(points, max_points) is points
+
+
+def test_keeps_peaks():
+    ranks = [100] * 200
+    ranks[60] = 10
+    ranks[140] = 400
+    sampled = lttb(_points(ranks), 20)
+    assert {point["bgg_rank"] for point in sampled} == {10, 100, 400}
+
+
+def test_missing_values_carry_forward():
+    ranks = [100] * 100
+    ranks[30:40] = [None] * 10
+    ranks[70] = 1
+    sampled = lttb(_points(ranks), 10)
+    assert len(sampled) == 10
+    assert any(point["bgg_rank"] == 1 for point in sampled)
+
+
+def test_other_metric():
+    points = [
+        {**point, "bgg_geek_rating": 7.0 + (day == 50)}
+        for day, point in enumerate(_points([1] * 100))
+    ]
+    sampled = lttb(points, 10, y="bgg_geek_rating")
+    assert any(point["bgg_geek_rating"] == 8.0 for point in sampled)
@@ -0,0 +1,51 @@
+import itertools
+
+from api import sparklines
+
+
+def _ranks(deltas: list[int | None]) -> list[int | None]:
+    """Undo the delta encoding of decoded values."""
+    ranks = []
+    previous = 0
+    for delta in deltas:
+        if delta is None:
+            ranks.append(None)
+            continue
+        previous += delta
+        ranks.append(previous)
+    return ranks
+
+
+def test_round_trip():
+    ranks = [120, 118, None, 125, 1, None, None, 30000]
+    assert _ranks(sparklines.decode(sparklines.encode(ranks))) == ranks
+
+
+def test_encode_deltas():
+    assert sparklines.decode(sparklines.encode([10, 12, 7])) == [10, 2, -5]
+
+
+def test_missing_days():
+    blob = sparklines.encode([None, 5, None])
+    assert sparklines.decode(blob) == [None, 5, None]
+    assert blob[:2] == sparklines.MISSING.to_bytes(2, "little", signed=True)
+
+
+def test_ranks_are_clipped():
+    ranks = [40000, 32767, 100, 100000]
+    assert _ranks(sparklines.decode(sparklines.encode(ranks))) == [
+        32767,
+        32767,
+        100,
+        32767,
+    ]
+
+
+def test_empty():
+    assert sparklines.encode([]) == b""
+    assert sparklines.decode(b"") == []
+
+
+def test_two_bytes_per_day():
+    ranks = list(itertools.islice(itertools.cycle([1, None, 2]), 30))
+    assert len(sparklines.encode(ranks)) == 2 * 30